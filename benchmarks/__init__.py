@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 18:40:02 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 18:40:02 +0200
+
+# do nothing :)
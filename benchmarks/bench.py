@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 18:58:21 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 18:58:21 +0200
+"""
+Benchmarks of the field exercise tools on synthetic data (see generators.py).
+Every pipeline is split into stages (load, compute, plot, export, or run for tools
+which only offer a main function), each stage is timed on several data sizes and
+the results are written as json into benchmarks/results/, named by date and commit.
+
+    python -m benchmarks.bench                          all pipelines, sizes small and medium
+    python -m benchmarks.bench --sizes large --pipelines hobo_single hobo_multi
+    python -m benchmarks.bench compare OLD.json NEW.json
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from python import hobo_io
+from python import plotting_routines as plotrout
+from python import raso_to_kml as rasokml
+from python import syn_sheets
+from python import theo_double_cut as thdou
+from python import theo_single_cut as thsin
+from python import theo_to_kml as theokml
+from python import thermodynamics
+from python import verification
+from python import wind
+from . import generators
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# data sizes: hobo rows (5 min), hobo stations, theodolite rows (10 s), sounding levels, synoptic sheet rows (1 h)
+SIZES = {'small':   {'hobo_rows': 2000, 'stations': 3, 'theo_rows': 50, 'levels': 100, 'syn_rows': 15},
+         'medium':  {'hobo_rows': 20000, 'stations': 5, 'theo_rows': 500, 'levels': 1000, 'syn_rows': 150},
+         'large':   {'hobo_rows': 100000, 'stations': 5, 'theo_rows': 5000, 'levels': 10000, 'syn_rows': 1500}}
+
+# ratio new/old above which compare reports a stage as slower
+REGRESSION_THRESHOLD = 1.2
+
+def clear_cache():
+    shutil.rmtree(hobo_io.cache_dir, ignore_errors=True)
+
+HOBO_VARS = {'wind_spd': 1, 'wind_gusts': 1, 'wind_dir': 1, 'temp': 1, 'rel_hum': 1, 'pres': 1, 'radiation': 1}
+
+def hobo_single(base_dir, size):
+    """ Stages (name, function, setup) of hobo_single, plot includes rendering and savefig. """
+    excel = generators.write_hobo_excel(base_dir, 'bench_hobo.xlsx', size['hobo_rows'])
+    csv = generators.write_hobo_csv(base_dir, 'bench_hobo.csv', size['hobo_rows'])
+    state = {}
+    def load():
+        state['df'] = hobo_io.read_hobo_excel(excel)
+    def compute():
+        state['frame'] = thermodynamics.add_derived_columns(hobo_io.hobo_frame(state['df']), station_height=791)
+    def export():
+        hobo_io.write_columns(state['frame'], os.path.join(hobo_io.cache_dir, 'bench'))
+    def plot():
+        plotrout.main(plotroutine='hobo_single', excel_filename=excel, var_dict=HOBO_VARS, figurename='bench_hobo.png')
+    return [('load', load, None),
+            ('load_csv', lambda: hobo_io.hobo_frame(hobo_io.read_hobo_csv(csv)), None),
+            ('compute', compute, None),
+            ('export', export, None),
+            ('load_cached', lambda: hobo_io.load_hobo(excel), None),
+            ('plot', plot, None)]
+
+def hobo_multi(base_dir, size):
+    """
+    Stages of hobo_multi, load builds the caches of all stations, plot uses them. wind_rose
+    evaluates a time window of the network frame (unsorted index, stations one after another).
+    """
+    excel_filenames = generators.write_hobo_network(base_dir, size['hobo_rows'], n_stations=size['stations'])
+    flag = {'wind_gusts': 1, 'pressure': 1}
+    state = {}
+    def load_network():
+        state['network'] = hobo_io.load_hobo_network(excel_filenames, n_workers=1)
+    def wind_rose():
+        network = state['network']
+        timebegin = network.index[len(network)//(2*size['stations'])] + pd.Timedelta('1min')
+        rose = wind.wind_rose(network, timebegin=timebegin, timeend=network.index.max())
+        if len(rose) != 16*size['stations']:
+            raise ValueError('Wind rose of the network has %d rows instead of %d!!!' % (len(rose), 16*size['stations']))
+    def plot():
+        plotrout.main(plotroutine='hobo_multi', excel_filename=excel_filenames, figurename='bench_compare_', flag=flag, n_workers=1)
+    return [('load', load_network, clear_cache),
+            ('load_parallel', lambda: hobo_io.load_hobo_network(excel_filenames), clear_cache),
+            ('wind_rose', wind_rose, load_network),
+            ('plot', plot, None)]
+
+def theo_single_cut(base_dir, size):
+    excel = generators.write_theodolite(base_dir, 'bench_theo.xlsx', size['theo_rows'])
+    return [('load', lambda: pd.read_excel(os.path.join('data', 'excel', excel), usecols=[3, 4], sheet_name='Data'), None),
+            ('run', lambda: thsin.main(excel_file=excel), None)]
+
+def theo_double_cut(base_dir, size):
+    excel1, excel2 = generators.write_theodolite_pair(base_dir, ('bench_theo1.xlsx', 'bench_theo2.xlsx'), size['theo_rows'])
+    return [('load', lambda: [pd.read_excel(os.path.join('data', 'excel', fn), usecols=[3, 4], sheet_name='Data') for fn in (excel1, excel2)], None),
+            ('run', lambda: thdou.main(B=111.7, phi=97.54, excel_file1=excel1, excel_file2=excel2), None)]
+
+def theo_to_kml(base_dir, size):
+    excel = generators.write_theodolite(base_dir, 'bench_theo.xlsx', size['theo_rows'])
+    return [('load', lambda: pd.read_excel(os.path.join('data', 'excel', excel), skiprows=4, sheet_name='Data'), None),
+            ('run', lambda: theokml.main(stat_height=785, stat_lon=15.3175, stat_lat=47.5553, excel_file=excel), None)]
+
+def raso_to_kml(base_dir, size):
+    """ The sounding text file exists, so run covers parsing, computation and the kml export. """
+    generators.write_sounding(base_dir, n_levels=size['levels'])
+    return [('run', lambda: rasokml.main(station_name='wien', hour='00', date='20170606'), None)]
+
+def syn_observation(base_dir, size):
+    excel = generators.write_syn_observation(base_dir, 'bench_syn_obs.xlsx', size['syn_rows'])
+    return [('load', lambda: syn_sheets.load_sheet(excel, 'syn_observation'), None),
+            ('plot', lambda: plotrout.main(plotroutine='syn_observation', excel_filename=excel, figurename='bench_syn_obs', titlestr='bench'), None)]
+
+def syn_forecast(base_dir, size):
+    excel = generators.write_syn_forecast(base_dir, 'bench_syn_fcst.xlsx', size['syn_rows'])
+    return [('load', lambda: syn_sheets.load_sheet(excel, 'syn_forecast'), None),
+            ('compute', lambda: verification.verify([excel]), None),
+            ('plot', lambda: plotrout.main(plotroutine='syn_forecast', excel_filename=excel, figurename='bench_syn_fcst', titlestr='bench'), None)]
+
+PIPELINES = {'hobo_single': hobo_single,
+             'hobo_multi': hobo_multi,
+             'theo_single_cut': theo_single_cut,
+             'theo_double_cut': theo_double_cut,
+             'theo_to_kml': theo_to_kml,
+             'raso_to_kml': raso_to_kml,
+             'syn_observation': syn_observation,
+             'syn_forecast': syn_forecast}
+
+def time_stage(function, setup=None, repeat=3):
+    """ Returns the wall times of repeat runs in s, and the error message if the stage failed. """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        try:
+            function()
+        except Exception as e:
+            return times, "".join([type(e).__name__, ': ', str(e)])
+        finally:
+            plt.close('all')
+        times.append(time.perf_counter() - start)
+    return times, None
+
+def commit():
+    """ Current git commit of the repository, None outside of git. """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(RESULTS_DIR),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(pipelines=PIPELINES, sizes=('small', 'medium'), repeat=3, output=None):
+    """ Runs the benchmarks in a temporary directory, writes and returns the results. """
+    results = []
+    cwd = os.getcwd()
+    for size_name in sizes:
+        for pipeline in pipelines:
+            base_dir = tempfile.mkdtemp(prefix='feldprakt_bench_')
+            try:
+                os.chdir(base_dir)
+                stages = PIPELINES[pipeline](base_dir, SIZES[size_name])
+                for stage, function, setup in stages:
+                    times, error = time_stage(function, setup=setup, repeat=repeat)
+                    results.append({'pipeline': pipeline, 'size': size_name, 'stage': stage,
+                                    'times': times, 'min': min(times) if times else None, 'error': error})
+                    if error is None:
+                        print('%-16s %-7s %-12s %8.3f s' % (pipeline, size_name, stage, min(times)))
+                    else:
+                        print('%-16s %-7s %-12s failed: %s' % (pipeline, size_name, stage, error))
+            finally:
+                os.chdir(cwd)
+                shutil.rmtree(base_dir, ignore_errors=True)
+
+    report = {'commit': commit(), 'date': datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(), 'pandas': pd.__version__,
+              'matplotlib': matplotlib.__version__, 'sizes': {name: SIZES[name] for name in sizes},
+              'repeat': repeat, 'results': results}
+    if output is None:
+        generators.makedirs(RESULTS_DIR)
+        output = os.path.join(RESULTS_DIR, '%s_%s.json' % (datetime.now().strftime('%Y%m%d-%H%M%S'), report['commit'] or 'nogit'))
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print('Results written to %s' % (output))
+    return report
+
+def compare(old_file, new_file, threshold=REGRESSION_THRESHOLD):
+    """ Prints the ratio new/old of the minimum time of all stages found in both result files. """
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+    old_times = {(r['pipeline'], r['size'], r['stage']): r['min'] for r in old['results']}
+    print('%s (%s) -> %s (%s)' % (old['commit'], old['date'], new['commit'], new['date']))
+    slower = []
+    for r in new['results']:
+        key = (r['pipeline'], r['size'], r['stage'])
+        if old_times.get(key) is None or r['min'] is None:
+            continue
+        ratio = r['min']/old_times[key]
+        mark = ''
+        if ratio > threshold:
+            mark = 'slower'
+            slower.append(key)
+        elif ratio < 1./threshold:
+            mark = 'faster'
+        print('%-16s %-7s %-12s %8.3f s -> %8.3f s  x%.2f %s' % (key + (old_times[key], r['min'], ratio, mark)))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of the field exercise tools on synthetic data')
+    subparsers = parser.add_subparsers(dest='command')
+    compare_parser = subparsers.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    parser.add_argument('--pipelines', nargs='+', default=list(PIPELINES), choices=list(PIPELINES))
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'], choices=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='result file (default benchmarks/results/DATE_COMMIT.json)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        compare(args.old, args.new)
+    else:
+        run(pipelines=args.pipelines, sizes=args.sizes, repeat=args.repeat, output=args.output)
+    return None
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 18:40:02 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 18:40:02 +0200
+"""
+Generators for synthetic input data in the formats of the field exercise instruments,
+written below a base directory (data/excel, data/raso_text), so the tools can be run
+on data of any size:
+
+    hobo workbook/csv       HOBOware export (title row, header with logger serial numbers)
+    theodolite export       'Data' sheet of the theodolite software (single and double cut)
+    sounding text           University of Wyoming TEXT:LIST sounding
+    synoptic sheets         observation and forecast/validation sheets
+"""
+import errno
+import numpy as np
+import os
+import pandas as pd
+
+from python import hobo_io
+from python import syn_sheets
+
+# header of the HOBOware export, short name -> column title without serial numbers
+HOBO_HEADER = {'temp':          'Temp., °C',
+               'rel_hum':       'RH, %',
+               'wind_spd':      'Windgeschwindigkeit, m/s',
+               'wind_gusts':    'Böengeschwindigkeit, m/s',
+               'wind_dir':      'Windrichtung, ø',
+               'pres':          'Druck, mbar',
+               'radiation':     'Sonnenstrahlung, W/m²'}
+
+def makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+def excel_dir(base_dir):
+    path = os.path.join(base_dir, 'data', 'excel')
+    makedirs(path)
+    return path
+
+def hobo_frame(n_rows, station=0, start='2019-05-18 00:00', freq='5min', seed=0):
+    """ Synthetic HOBO measurements (diurnal cycle plus noise) with the HOBOware column titles. """
+    rng = np.random.RandomState(seed + station)
+    time = pd.date_range(start, periods=n_rows, freq=freq)
+    hour = (time.hour + time.minute/60.).values
+    diurnal = np.sin((hour - 9)*np.pi/12)
+    wind = np.abs(2 + diurnal + rng.normal(0, 0.8, n_rows))
+    serial = 'LGR S/N: %d, SEN S/N: %d' % (1149550 + station, 1128770 + station)
+    columns = {'Anz.': np.arange(1, n_rows+1),
+               'Datum Zeit, GMT+00:00': time}
+    values = {'temp':       12 + 5*diurnal + rng.normal(0, 0.3, n_rows),
+              'rel_hum':    np.clip(70 - 20*diurnal + rng.normal(0, 2, n_rows), 5, 100),
+              'wind_spd':   wind,
+              'wind_gusts': wind*(1.5 + rng.uniform(0, 0.5, n_rows)),
+              'wind_dir':   (200 + np.cumsum(rng.normal(0, 5, n_rows))) % 360,
+              'pres':       920 + np.cumsum(rng.normal(0, 0.02, n_rows)),
+              'radiation':  np.clip(800*diurnal, 0, None)}
+    for name, title in HOBO_HEADER.items():
+        columns['%s (%s)' % (title, serial)] = np.round(values[name], 3)
+    return pd.DataFrame(columns)
+
+def write_hobo_excel(base_dir, filename, n_rows, station=0, seed=0):
+    """ Writes a HOBOware workbook into data/excel, returns the filename. """
+    df = hobo_frame(n_rows, station=station, seed=seed)
+    with pd.ExcelWriter(os.path.join(excel_dir(base_dir), filename)) as writer:
+        df.to_excel(writer, index=False, startrow=1)
+        writer.sheets['Sheet1'].cell(row=1, column=1, value='Plot-Titel: %s' % (os.path.splitext(filename)[0]))
+    return filename
+
+def write_hobo_csv(base_dir, filename, n_rows, station=0, seed=0):
+    """ Writes a HOBOware csv export into data/excel (same layout as the workbook), returns the filename. """
+    df = hobo_frame(n_rows, station=station, seed=seed)
+    df['Datum Zeit, GMT+00:00'] = df['Datum Zeit, GMT+00:00'].dt.strftime('%d.%m.%y %H:%M:%S')
+    with open(os.path.join(excel_dir(base_dir), filename), 'w', encoding='utf-8') as f:
+        f.write('"Plot-Titel: %s"\n' % (os.path.splitext(filename)[0]))
+        df.to_csv(f, index=False)
+    return filename
+
+def write_hobo_network(base_dir, n_rows, n_stations=5, seed=0):
+    """ Writes one workbook per station, returns the dict station -> filename (as used by hobo_multi). """
+    stations = list(hobo_io.STATION_HEIGHTS)
+    if n_stations > len(stations):
+        raise ValueError('Only %d stations with known height available!!!' % (len(stations)))
+    return {station: write_hobo_excel(base_dir, 'bench_hobo_%d.xlsx' % (i), n_rows, station=i, seed=seed)
+            for i, station in enumerate(stations[:n_stations])}
+
+def balloon_track(n_rows, dt=10, vert_velo=2.4, seed=0):
+    """ Positions x, y, z in m of a balloon rising with vert_velo in a randomly varying wind. """
+    rng = np.random.RandomState(seed)
+    z = np.arange(n_rows)*dt*vert_velo
+    u = 3 + np.cumsum(rng.normal(0, 0.3, n_rows))
+    v = 1 + np.cumsum(rng.normal(0, 0.3, n_rows))
+    x = 40 + np.r_[0, np.cumsum(u[:-1]*dt)]
+    y = 20 + np.r_[0, np.cumsum(v[:-1]*dt)]
+    return x, y, z
+
+def theodolite_frame(x, y, z, dt=10):
+    """ 'Data' sheet of the theodolite software for a track seen from the theodolite at (0, 0). """
+    n_rows = len(z)
+    horizontal = np.maximum(np.sqrt(x**2 + y**2), 1e-3)
+    elevation = np.degrees(np.arctan2(z, horizontal))
+    elevation[0] = 3.75
+    azimuth = np.degrees(np.arctan2(x, y)) % 360
+    u = np.r_[np.nan, np.diff(x)/dt]
+    v = np.r_[np.nan, np.diff(y)/dt]
+    wd = (np.degrees(np.arctan2(u, v)) + 180) % 360
+    ws = np.sqrt(u**2 + v**2)
+
+    sheet = np.full((5 + n_rows, 24), np.nan, dtype=object)
+    sheet[0, 6:8] = ['Measure No.', '170527164732']
+    sheet[1, 6:8] = ['Date', '17/05/27']
+    sheet[2, :2] = ['Header', 'Error']
+    sheet[2, 6:8] = ['Time', '16:47:32']
+    sheet[3, 0] = 'H'
+    sheet[4, :4] = ['S', np.nan, '17/05/27', '16:47:32']
+    sheet[4, 6:16] = ['Height(m)', 'EL(deg)', 'AZ(deg)', 'X(m)', 'Y(m)', 'dX', 'dY', 'A', 'WD(deg)', 'WS(m/s)']
+    sheet[4, 18:24] = ['Y(m) for graph', 'X(m) for graph', 'WD(deg) for graph', 'Height(m) for graph', 'WS(m/s) for graph', 'Height(m) for graph']
+    data = sheet[5:]
+    data[:, 0] = 'D'
+    data[:, 1] = ' '
+    data[:, 2] = np.arange(n_rows)*dt
+    data[:, 3] = elevation
+    data[:, 4] = azimuth
+    data[:, 6] = z
+    data[:, 7] = elevation
+    data[:, 8] = azimuth
+    data[:, 9] = x
+    data[:, 10] = y
+    data[:, 14] = wd
+    data[:, 15] = ws
+    data[:, 18] = np.round(y)
+    data[:, 19] = np.round(x)
+    data[:, 20] = np.nan_to_num(wd)
+    data[:, 21] = z
+    data[:, 22] = np.nan_to_num(ws)
+    data[:, 23] = z
+    return pd.DataFrame(sheet)
+
+def write_theodolite(base_dir, filename, n_rows, seed=0):
+    """ Writes a theodolite export (single cut) into data/excel, returns the filename. """
+    x, y, z = balloon_track(n_rows, seed=seed)
+    theodolite_frame(x, y, z).to_excel(os.path.join(excel_dir(base_dir), filename), sheet_name='Data', index=False, header=False)
+    return filename
+
+def write_theodolite_pair(base_dir, filenames, n_rows, B=111.7, phi=97.54, seed=0):
+    """
+    Writes the exports of two theodolites observing the same balloon (double cut), the second
+    theodolite is at distance B in direction phi (deg from north). Returns the filenames.
+    """
+    x, y, z = balloon_track(n_rows, seed=seed)
+    x2 = x - B*np.sin(np.radians(phi))
+    y2 = y - B*np.cos(np.radians(phi))
+    theodolite_frame(x, y, z).to_excel(os.path.join(excel_dir(base_dir), filenames[0]), sheet_name='Data', index=False, header=False)
+    theodolite_frame(x2, y2, z).to_excel(os.path.join(excel_dir(base_dir), filenames[1]), sheet_name='Data', index=False, header=False)
+    return filenames
+
+def write_sounding(base_dir, station_name='wien', stat_num='11035', date='20170606', hour='00', n_levels=100, seed=0):
+    """
+    Writes a sounding in the University of Wyoming TEXT:LIST format into data/raso_text
+    (file name as used by raso_to_kml, so no download is started). Returns the path.
+    """
+    rng = np.random.RandomState(seed)
+    height = 200 + np.arange(n_levels)*30000./n_levels
+    pres = 990*np.exp(-(height - 200)/8000.)
+    temp = 18 - 0.0065*(height - 200)
+    dwpt = temp - 5 - rng.uniform(0, 10, n_levels)
+    drct = (250 + np.cumsum(rng.normal(0, 3, n_levels))) % 360
+    sknt = np.abs(5 + height/1000.*4 + rng.normal(0, 2, n_levels))
+
+    lines = ['<HTML>', '<TITLE>University of Wyoming - Radiosonde Data</TITLE>',
+             '<H2>%s Observations at %sZ %s</H2>' % (stat_num, hour, date), '<PRE>',
+             '-'*77,
+             '   PRES   HGHT   TEMP   DWPT   RELH   MIXR   DRCT   SKNT   THTA   THTE   THTV',
+             '    hPa     m      C      C      %    g/kg    deg   knot     K      K      K ',
+             '-'*77]
+    for i in range(n_levels):
+        lines.append('%7.1f %6d %6.1f %6.1f %6d %6.2f %6d %6d %6.1f %6.1f %6.1f'
+                     % (pres[i], height[i], temp[i], dwpt[i], 70, 5., drct[i], sknt[i], 290., 310., 291.))
+    lines += ['</PRE><H3>Station information and sounding indices</H3><PRE>',
+              '                             Station number: %s' % (stat_num),
+              '                           Observation time: %s/%s00' % (date[2:], hour),
+              '                           Station latitude: 48.25',
+              '                          Station longitude: 16.36',
+              '                          Station elevation: 200.0',
+              '</PRE>', '</HTML>']
+
+    raso_dir = os.path.join(base_dir, 'data', 'raso_text')
+    makedirs(raso_dir)
+    path = os.path.join(raso_dir, "".join(["_".join(['raso', station_name, stat_num, "".join([date, '-', hour])]), '.txt']))
+    with open(path, 'w') as f:
+        f.write("\n".join(lines))
+    return path
+
+def write_syn_observation(base_dir, filename, n_rows, seed=0):
+    """ Writes a synoptic observation sheet (hourly from 03 UTC) into data/excel, returns the filename. """
+    rng = np.random.RandomState(seed)
+    utc = pd.date_range('2019-05-19 03:00', periods=n_rows, freq='1h')
+    df = pd.DataFrame({'MESZ': (utc + pd.Timedelta('2h')).strftime('%H:%M:%S'), 'UTC': utc.strftime('%H:%M:%S')})
+    temp = 12 + rng.normal(0, 3, n_rows)
+    for col in syn_sheets.OBSERVATION_COLUMNS:
+        if col.startswith(('T_', 'Tf_')):
+            df[col] = np.round(temp + rng.normal(0, 0.3, n_rows), 1)
+        elif col.startswith('Td_'):
+            df[col] = np.round(temp - 4 + rng.normal(0, 0.5, n_rows), 1)
+        elif col.startswith('RH_'):
+            df[col] = np.round(np.clip(70 + rng.normal(0, 5, n_rows), 5, 100))
+        elif col.startswith('p_'):
+            df[col] = np.round(920 + rng.normal(0, 0.5, n_rows), 1)
+        elif col in ('cloud_base', 'visibility'):
+            df[col] = np.round(rng.uniform(300, 3000, n_rows), -1)
+        else:
+            # cloud types and cloudiness in octas
+            df[col] = rng.randint(0, 9, n_rows)
+    df.to_excel(os.path.join(excel_dir(base_dir), filename), index=False)
+    return filename
+
+def write_syn_forecast(base_dir, filename, n_rows, seed=0):
+    """ Writes a synoptic forecast/validation sheet (hourly) into data/excel, returns the filename. """
+    rng = np.random.RandomState(seed)
+    time = pd.date_range('2019-05-19 08:00', periods=n_rows, freq='1h')
+    df = pd.DataFrame({'UTC': time.strftime('%Y-%m-%dT%H:%M:%S')})
+    scales = {'T': (12, 3), 'Td': (6, 2), 'wind_speed': (3, 1), 'wind_direction': (180, 90),
+              'cloudiness': (4, 2), 'cloud_base': (1500, 500), 'rain_amount': (0.5, 0.5), 'rain_probability': (30, 20)}
+    for var in syn_sheets.FORECAST_VARIABLES:
+        mean, std = scales[var]
+        truth = np.abs(mean + rng.normal(0, std, n_rows))
+        df["_".join([var, 'forecast'])] = np.round(truth + rng.normal(0, std/3., n_rows), 1)
+        df["_".join([var, 'validation'])] = np.round(truth, 1)
+    df.to_excel(os.path.join(excel_dir(base_dir), filename), index=False)
+    return filename
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 17:31:12 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 17:31:12 +0200
+"""
+Command line interface for the field exercise data tools, one subcommand per tool:
+
+    python feldprakt.py pressure 1000.15 15 10 200 48
+    python feldprakt.py single-cut theo_testfile_single.xlsx
+    python feldprakt.py plot hobo_single hobo_lanzenkreuz.xlsx hobo_exampleplot.png
+    python feldprakt.py plot hobo_multi Campingplatz=hobo_campingplatz.xlsx Seetal=hobo_seetal.xlsx hobo_compare_
+    python feldprakt.py run jobs.toml
+    python feldprakt.py watch jobs.toml
+    python feldprakt.py ingest hobo hobo_seetal.xlsx --station Seetal
+    python feldprakt.py serve --jobs jobs.toml
+    python feldprakt.py submit hobo_single_station
+    python feldprakt.py live --csv relay.csv
+    python feldprakt.py view hobo_seetal.xlsx
+    python feldprakt.py query --variables temp T_assmann --start 2019052000 --end 2019052200
+
+The modules of a subcommand (and with them pandas and matplotlib) are only imported
+when it is run; --timing prints the time needed for the import and for the command,
+--trace trace.json records the stages of the command (see python/instrument.py).
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+from python import instrument
+
+HOBO_VARIABLES = ('wind_spd', 'wind_gusts', 'wind_dir', 'temp', 'rel_hum', 'pres', 'radiation')
+
+def pressure(module, args):
+    module.main(p=args.p, T=args.T, Td=args.Td, station_height=args.station_height, lat=args.lat)
+
+def single_cut(module, args):
+    module.main(excel_file=args.excel_file, titlestr=args.title)
+
+def double_cut(module, args):
+    module.main(B=float(args.B), phi=float(args.phi), excel_file1=args.excel_file1, excel_file2=args.excel_file2, titlestr=args.title)
+
+def raso_kml(module, args):
+    module.main(station_name=args.station, hour=args.hour, date=args.date, from_store=args.store)
+
+def theo_kml(module, args):
+    if args.excel_file is None and (args.station is None or args.launch is None):
+        raise ValueError('Give an excel file or --station and --launch of an ascent in the campaign store!!!')
+    module.main(stat_height=float(args.height), stat_lon=float(args.lon), stat_lat=float(args.lat), excel_file=args.excel_file,
+                station=args.station, launch=args.launch)
+
+def named_files(values):
+    """ ['NAME=FILE', ...] -> dict NAME -> FILE, filenames without names are returned as list. """
+    if not any('=' in value for value in values):
+        return list(values)
+    files = {}
+    for value in values:
+        if '=' not in value:
+            raise ValueError('Give several files as NAME=FILE, got %s!!!' % (value))
+        name, filename = value.split('=', 1)
+        files[name] = filename
+    return files
+
+def plot(module, args):
+    var_dict = {var: int(var in args.vars) for var in HOBO_VARIABLES}
+    flag = {'wind_gusts': int(not args.no_gusts), 'pressure': int(not args.no_pressure)}
+    excel_filename = named_files(args.excel_filename)
+    if isinstance(excel_filename, list) and len(excel_filename) == 1 and args.plotroutine != 'hobo_multi':
+        excel_filename = excel_filename[0]
+    module.main(plotroutine=args.plotroutine, excel_filename=excel_filename, var_dict=var_dict,
+                figurename=args.figurename, titlestr=args.title, flag=flag, timebegin=args.timebegin,
+                timeend=args.timeend, timemarker=args.timemarker, daily=args.daily, from_store=args.store,
+                date=args.date)
+
+def verify(module, args):
+    print(module.verify(named_files(args.excel_filenames)).to_string())
+
+def intercompare(module, args):
+    results = module.intercompare(module.load_observations(named_files(args.excel_filenames)))
+    for variable, result in results.items():
+        for name, table in result.items():
+            print("".join(['\n', variable, ' ', name]))
+            print(table.to_string())
+
+def ingest(module, args):
+    for filename in args.files:
+        if args.source == 'hobo' and args.append:
+            paths = module.append_hobo(filename, station=args.station)
+        elif args.source == 'hobo':
+            paths = module.ingest_hobo(filename, station=args.station)
+        elif args.source == 'syn_observation':
+            if args.date is None:
+                raise ValueError('Observation sheets need the --date YYYYMMDD of the observations!!!')
+            paths = module.ingest_syn_observation(filename, args.date, station=args.station or 'Turnau')
+        elif args.source == 'syn_forecast':
+            paths = module.ingest_syn_forecast(filename, args.station or os.path.splitext(filename)[0])
+        elif args.source == 'theodolite':
+            paths = module.ingest_theodolite(filename, station=args.station)
+        else:
+            paths = module.ingest_sounding(filename)
+        print('%s: %d day(s) written' % (filename, len(paths)))
+
+def query(module, args):
+    frame = module.query(source=args.source, stations=args.stations, variables=args.variables, start=args.start, end=args.end)
+    if args.csv:
+        frame.to_csv(args.csv)
+        print('%d rows written to %s' % (len(frame), args.csv))
+    else:
+        print(frame)
+
+def serve(module, args):
+    module.serve(port=args.port, job_file=args.jobs, cache_size=args.cache_size)
+
+def submit(module, args):
+    requests = [{'task': task} for task in args.tasks]
+    if args.function:
+        requests.append({'function': args.function, 'kwargs': json.loads(args.kwargs)})
+    for request in requests:
+        answer = module.submit(request, port=args.port)
+        if answer.get('error'):
+            print('%s failed: %s' % (answer.get('name', 'request'), answer['error']))
+        else:
+            print('%s finished in %.2f s' % (answer['name'], answer['duration']))
+        for path in answer.get('outputs', []):
+            print('    %s' % (path))
+
+def live(module, args):
+    module.live(port=None if args.no_socket else args.port, csv_files=args.csv, station=args.station,
+                capacity=args.capacity, window=args.window, refresh=args.refresh)
+
+def view(module, args):
+    if args.excel_file is None and args.station is None:
+        raise ValueError('Give an excel file or --station of the campaign store!!!')
+    levels = module.load_pyramid(excel_filename=args.excel_file, station=args.station)
+    module.view(levels, title=args.excel_file or args.station, port=args.port, width=args.width)
+
+def run(module, args):
+    module.run_graph(module.load_tasks(args.job_file), n_workers=args.n_workers, incremental=not args.force)
+
+def watch(module, args):
+    module.watch(args.job_file, dirs=args.dirs, interval=args.interval, debounce=args.debounce, n_workers=args.n_workers)
+
+# subcommand -> (module, function, help)
+COMMANDS = {'pressure':       ('python.pressure_reduction_msl', pressure, 'reduce the pressure to mean sea level'),
+            'single-cut':     ('python.theo_single_cut', single_cut, 'theodolite single cut'),
+            'double-cut':     ('python.theo_double_cut', double_cut, 'theodolite double cut'),
+            'raso-kml':       ('python.raso_to_kml', raso_kml, 'download a radio sounding and write a kml file'),
+            'theo-kml':       ('python.theo_to_kml', theo_kml, 'write a kml file of a theodolite measurement'),
+            'plot':           ('python.plotting_routines', plot, 'plotting routines (hobo_single, hobo_multi, hobo_precip, syn_observation, syn_forecast)'),
+            'verify':         ('python.verification', verify, 'verification of synoptic forecast sheets'),
+            'intercompare':   ('python.intercomparison', intercompare, 'intercomparison of the observation instruments'),
+            'ingest':         ('python.store', ingest, 'add input files to the campaign store'),
+            'query':          ('python.store', query, 'data of the campaign store by source, station, variable and time'),
+            'serve':          ('python.server', serve, 'local job server keeping the tools and recently read data in memory'),
+            'submit':         ('python.server', submit, 'send jobs to the local job server'),
+            'live':           ('python.live', live, 'live station readings over tcp or appended csv files with rolling statistics'),
+            'view':           ('python.pyramid', view, 'interactive viewer of a station time series from the whole season down to minutes'),
+            'run':            ('python.runner', run, 'run the tasks of a job file (toml, yaml or json)'),
+            'watch':          ('python.watch', watch, 'rerun the tasks of a job file whenever their input files change')}
+
+def parser():
+    parser = argparse.ArgumentParser(prog='feldprakt', description='Field exercise data tools')
+    parser.add_argument('--timing', action='store_true', help='print import and run time of the command')
+    parser.add_argument('--trace', metavar='FILE', help='write timing and memory of the stages as chrome trace to FILE')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    sub = {name: subparsers.add_parser(name, help=command[2]) for name, command in COMMANDS.items()}
+
+    sub['pressure'].add_argument('p', help='pressure in hPa')
+    sub['pressure'].add_argument('T', help='temperature in deg Celsius')
+    sub['pressure'].add_argument('Td', help='dew-point temperature in deg Celsius')
+    sub['pressure'].add_argument('station_height', help='station height in m')
+    sub['pressure'].add_argument('lat', help='station latitude in deg')
+
+    sub['single-cut'].add_argument('excel_file')
+    sub['single-cut'].add_argument('--title', default='theodolite example single cut')
+
+    sub['double-cut'].add_argument('B', help='distance between the two theodolites in m')
+    sub['double-cut'].add_argument('phi', help='angle between north and the theodolite connecting line in deg')
+    sub['double-cut'].add_argument('excel_file1')
+    sub['double-cut'].add_argument('excel_file2')
+    sub['double-cut'].add_argument('--title', default='theodolite example double cut')
+
+    sub['raso-kml'].add_argument('station', help='station name, e.g. wien')
+    sub['raso-kml'].add_argument('hour', help='hour of the sounding, e.g. 00')
+    sub['raso-kml'].add_argument('date', nargs='?', help='YYYYMMDD (default today)')
+    sub['raso-kml'].add_argument('--store', action='store_true', help='read the sounding from the campaign store')
+
+    sub['theo-kml'].add_argument('height', help='station height in m')
+    sub['theo-kml'].add_argument('lon', help='station longitude in deg')
+    sub['theo-kml'].add_argument('lat', help='station latitude in deg')
+    sub['theo-kml'].add_argument('excel_file', nargs='?')
+    sub['theo-kml'].add_argument('--station', help='theodolite site of an ascent in the campaign store (instead of excel_file)')
+    sub['theo-kml'].add_argument('--launch', help='launch time YYYYMMDDHHMM of the ascent in the campaign store')
+
+    sub['plot'].add_argument('plotroutine')
+    sub['plot'].add_argument('excel_filename', nargs='+', help='excel file, or NAME=FILE for each station of hobo_multi')
+    sub['plot'].add_argument('figurename')
+    sub['plot'].add_argument('--title')
+    sub['plot'].add_argument('--vars', nargs='+', default=HOBO_VARIABLES[:-1], choices=HOBO_VARIABLES, help='variables of hobo_single')
+    sub['plot'].add_argument('--no-gusts', action='store_true', help='hobo_multi without wind gusts')
+    sub['plot'].add_argument('--no-pressure', action='store_true', help='hobo_multi without pressure')
+    sub['plot'].add_argument('--timebegin', help='YYYYMMDDHH')
+    sub['plot'].add_argument('--timeend', help='YYYYMMDDHH')
+    sub['plot'].add_argument('--timemarker', help='YYYYMMDDHH')
+    sub['plot'].add_argument('--date', help='YYYYMMDD of syn_observation sheets (default: date in the filename)')
+    sub['plot'].add_argument('--daily', action='store_true', help='additionally one figure per day')
+    sub['plot'].add_argument('--store', action='store_true', help='hobo data from the campaign store, give station names instead of files')
+
+    sub['verify'].add_argument('excel_filenames', nargs='+', help='forecast sheets, optionally as FORECASTER=FILE')
+    sub['intercompare'].add_argument('excel_filenames', nargs='+', help='observation sheets as YYYYMMDD=FILE')
+
+    sub['ingest'].add_argument('source', choices=['hobo', 'syn_observation', 'syn_forecast', 'theodolite', 'sounding'])
+    sub['ingest'].add_argument('files', nargs='+', help='files in data/excel (soundings in data/raso_text)')
+    sub['ingest'].add_argument('--station', help='station (forecaster of syn_forecast), default file name')
+    sub['ingest'].add_argument('--date', help='YYYYMMDD of syn_observation sheets')
+    sub['ingest'].add_argument('--append', action='store_true', help='hobo readouts: append only rows newer than the stored ones of the logger')
+
+    sub['query'].add_argument('--source', nargs='+', help='default all sources')
+    sub['query'].add_argument('--stations', nargs='+', help='default all stations')
+    sub['query'].add_argument('--variables', nargs='+', help='default all variables')
+    sub['query'].add_argument('--start', help='YYYYMMDDHH')
+    sub['query'].add_argument('--end', help='YYYYMMDDHH')
+    sub['query'].add_argument('--csv', help='write the data to this csv file instead of printing it')
+
+    sub['serve'].add_argument('--port', type=int, default=8765)
+    sub['serve'].add_argument('--jobs', help='job file whose tasks can be submitted by name')
+    sub['serve'].add_argument('--cache-size', type=int, default=32, help='number of workbooks kept in memory')
+
+    sub['submit'].add_argument('tasks', nargs='*', help='names of tasks of the job file of the server')
+    sub['submit'].add_argument('--function', help='function to run instead, e.g. python.theo_single_cut.main')
+    sub['submit'].add_argument('--kwargs', default='{}', help='arguments of the function as json')
+    sub['submit'].add_argument('--port', type=int, default=8765)
+
+    sub['live'].add_argument('--port', type=int, default=8766, help='tcp port on localhost for readings')
+    sub['live'].add_argument('--no-socket', action='store_true', help='only follow the csv files')
+    sub['live'].add_argument('--csv', nargs='+', default=[], help='csv files appended by a logger relay')
+    sub['live'].add_argument('--station', default='live', help='station of streams without station column')
+    sub['live'].add_argument('--capacity', type=int, default=20000, help='readings kept per station and variable')
+    sub['live'].add_argument('--window', type=float, default=600., help='window of the rolling statistics in s')
+    sub['live'].add_argument('--refresh', type=float, default=60., help='time between figure updates in s')
+
+    sub['view'].add_argument('excel_file', nargs='?', help='hobo workbook in data/excel')
+    sub['view'].add_argument('--station', help='hobo station of the campaign store instead')
+    sub['view'].add_argument('--port', type=int, default=8767)
+    sub['view'].add_argument('--width', type=int, default=1200, help='width of the plot in pixels')
+
+    sub['run'].add_argument('job_file')
+    sub['run'].add_argument('-j', '--n-workers', type=int, help='number of processes (default number of cores)')
+    sub['run'].add_argument('--force', action='store_true', help='rerun all tasks, also up to date ones')
+
+    sub['watch'].add_argument('job_file')
+    sub['watch'].add_argument('--dirs', nargs='+', default=[os.path.join('data', 'excel')], help='watched directories')
+    sub['watch'].add_argument('--interval', type=float, default=1., help='polling interval in s')
+    sub['watch'].add_argument('--debounce', type=float, default=2., help='time in s a file has to be unchanged before it is processed')
+    sub['watch'].add_argument('-j', '--n-workers', type=int, help='number of processes (default number of cores)')
+    return parser
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    module_name, command, _ = COMMANDS[args.command]
+
+    if args.trace:
+        instrument.enable(args.trace)
+
+    start = time.perf_counter()
+    with instrument.span('import', category='command', module=module_name):
+        module = importlib.import_module(module_name)
+    import_time = time.perf_counter() - start
+    with instrument.span(args.command, category='command'):
+        command(module, args)
+    run_time = time.perf_counter() - start - import_time
+
+    if args.timing:
+        print('import of %s: %.3f s, %s: %.3f s' % (module_name, import_time, args.command, run_time))
+    return None
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -10,14 +10,11 @@ Control script for the use of field exercise data tools.
 Can be used to play around with the included test data or modified to use other data.
 """
 from datetime import datetime
+import os
 import sys
 
-import python.pressure_reduction_msl as presreduc
-import python.raso_to_kml as rasokml
-import python.theo_to_kml as theokml
-import python.theo_single_cut as thsin
-import python.theo_double_cut as thdou
-import python.plotting_routines as plotrout
+# the tools are imported inside the working steps, so only the enabled ones are loaded
+import python.runner as runner
 
 # 0 = ignore; 1 = execute
 workflow_dict = {'pressure_reduction':           0,
@@ -31,65 +28,92 @@ workflow_dict = {'pressure_reduction':           0,
                  'timeseries_syn_observations':  0,
                  'timeseries_syn_forecast':      1}
 
+# number of processes running the working steps below in parallel (None = number of cores, 1 = sequential)
+n_jobs = None
+# only rerun working steps whose inputs, parameters or code changed (see python/manifest.py)
+incremental = True
+# timing and memory of the stages of all steps are recorded with:  FELDPRAKT_TRACE=trace.json python main_control.py
+
+# the working steps are collected as jobs (name, function, arguments, output files) and run at the end
+jobs = []
+
 
 """ pressure reduction to mean sea level """
 if workflow_dict['pressure_reduction'] == 1:
+    import python.pressure_reduction_msl as presreduc
     # specify the variables below, result gets printed
     pressure = 1000.15
     temp = 15
     temp_dew = 10
     h = 200
     latitude = 48
-    presreduc.main(p=pressure, T=temp, Td=temp_dew, station_height=h, lat=latitude)
+    jobs.append(('pressure_reduction', presreduc.main, dict(p=pressure, T=temp, Td=temp_dew, station_height=h, lat=latitude)))
 
 
 """ Theodolite cuts calculations """
 # theodolite single cut
 if workflow_dict['theo_calc_single_cut'] == 1:
+    import python.theo_single_cut as thsin
     # input args
     filename = 'theo_testfile_single.xlsx'
     titlestr_for_plot = 'theodolite example single cut'
-    thsin.main(excel_file=filename, titlestr=titlestr_for_plot)
+    jobs.append(('theo_calc_single_cut', thsin.main, dict(excel_file=filename, titlestr=titlestr_for_plot),
+                 [os.path.join('figures', "".join([filename.split('.')[0], '_single_cut.png']))]))
 
 # theodolite double cut
 if workflow_dict['theo_calc_double_cut'] == 1:
+    import python.theo_double_cut as thdou
     # input args
     B = 111.7 # distance between the two theodolites
     phi = 97.54 # angle between the north and the thedolite connecting line
     excel_file1 = '.xlsx'
     excel_file2 = '.xlsx'
     titlestr_for_plot='theodolite example double cut'
-    thdou.main(B=B, phi=phi, excel_file1=excel_file1, excel_file2=excel_file2, titlestr=titlestr_for_plot)
+    jobs.append(('theo_calc_double_cut', thdou.main, dict(B=B, phi=phi, excel_file1=excel_file1, excel_file2=excel_file2, titlestr=titlestr_for_plot),
+                 [os.path.join('figures', "".join([excel_file1.split('.')[0], '_double_cut.png']))]))
 
 
 """ Radiosounding to kml file """
 # download radiosounding data and create a kml file for google earth
 if workflow_dict['raso_to_kml'] == 1:
+    import python.raso_to_kml as rasokml
     # datestr = datetime.now().strftime('%Y%m%d')
     datestr = '20170606'
-    rasokml.main(station_name='wien', hour='00', date=datestr)
-    rasokml.main(station_name='linz', hour='03', date=datestr)
-    rasokml.main(station_name='innsbruck', hour='03', date=datestr)
-    rasokml.main(station_name='muenchen', hour='00', date=datestr)
-    rasokml.main(station_name='udine', hour='00', date=datestr)
-    rasokml.main(station_name='zagreb', hour='00', date=datestr)
-    rasokml.main(station_name='ljubljana', hour='06', date=datestr)
-    rasokml.main(station_name='graz', hour='03', date=datestr)
-    rasokml.main(station_name='wien', hour='12', date=datestr)
+    jobs.append(('raso_to_kml_wien_00', rasokml.main, dict(station_name='wien', hour='00', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_wien_*_', datestr, '-00.kml']))]))
+    jobs.append(('raso_to_kml_linz_03', rasokml.main, dict(station_name='linz', hour='03', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_linz_*_', datestr, '-03.kml']))]))
+    jobs.append(('raso_to_kml_innsbruck_03', rasokml.main, dict(station_name='innsbruck', hour='03', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_innsbruck_*_', datestr, '-03.kml']))]))
+    jobs.append(('raso_to_kml_muenchen_00', rasokml.main, dict(station_name='muenchen', hour='00', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_muenchen_*_', datestr, '-00.kml']))]))
+    jobs.append(('raso_to_kml_udine_00', rasokml.main, dict(station_name='udine', hour='00', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_udine_*_', datestr, '-00.kml']))]))
+    jobs.append(('raso_to_kml_zagreb_00', rasokml.main, dict(station_name='zagreb', hour='00', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_zagreb_*_', datestr, '-00.kml']))]))
+    jobs.append(('raso_to_kml_ljubljana_06', rasokml.main, dict(station_name='ljubljana', hour='06', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_ljubljana_*_', datestr, '-06.kml']))]))
+    jobs.append(('raso_to_kml_graz_03', rasokml.main, dict(station_name='graz', hour='03', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_graz_*_', datestr, '-03.kml']))]))
+    jobs.append(('raso_to_kml_wien_12', rasokml.main, dict(station_name='wien', hour='12', date=datestr),
+                 [os.path.join('data', 'google_earth_kml', "".join(['gearth_wien_*_', datestr, '-12.kml']))]))
 
 
 """ Theodolite to kml file """
 if workflow_dict['theo_to_kml'] == 1:
+    import python.theo_to_kml as theokml
     h = 785
     lon = 15.3175
     lat = 47.5553
     excel_file = 'theo_testfile_single.xlsx'
-    theokml.main(stat_height=h, stat_lon=lon, stat_lat=lat, excel_file=excel_file)
+    jobs.append(('theo_to_kml', theokml.main, dict(stat_height=h, stat_lon=lon, stat_lat=lat, excel_file=excel_file),
+                 [os.path.join('data', 'google_earth_kml', "".join([excel_file.split('.')[0], '.kml']))]))
 
 
 """ Plotting routines """
 # timeseries plot for various parameters
 if workflow_dict['hobo_single_station'] == 1:
+    import python.plotting_routines as plotrout
     # creates a single windowed timeseries plot for specified vars
     plotroutine = 'hobo_single'
     excel_filename = 'hobo_lanzenkreuz.xlsx'
@@ -104,11 +128,15 @@ if workflow_dict['hobo_single_station'] == 1:
 
     titlestr_for_plot = 'hobo example plot'
     figname = 'hobo_exampleplot.png'
-    plotrout.main(plotroutine=plotroutine, excel_filename=excel_filename, var_dict=var_dict, titlestr=titlestr_for_plot, figurename=figname)
+    # additionally one figure per day (figname_YYYYMMDD.png)
+    daily = False
+    jobs.append(('hobo_single_station', plotrout.main, dict(plotroutine=plotroutine, excel_filename=excel_filename, var_dict=var_dict, titlestr=titlestr_for_plot, figurename=figname, daily=daily),
+                 [os.path.join('figures', "".join([os.path.splitext(figname)[0], '*.png']))]))
 
 
 # compare multiple time series of the same parameter
 if workflow_dict['hobo_compare_stations'] == 1:
+    import python.plotting_routines as plotrout
     # csv dict: first entry: name; second entry: filename
     plotroutine = 'hobo_multi'
     excel_filenames = {'Campingplatz': 'hobo_campingplatz.xlsx',
@@ -120,33 +148,45 @@ if workflow_dict['hobo_compare_stations'] == 1:
     flag = {'wind_gusts': 1,
             'pressure':   1}
 
+    # number of processes reading the excel files in parallel (None = one per file, 1 = sequential)
+    n_workers = None
+    # additionally one figure per day (figname..._YYYYMMDD.png)
+    daily = False
+
     titlestr_for_plot = 'hobo compare example plot'
     figname = 'hobo_compare_'
-    plotrout.main(plotroutine=plotroutine, excel_filename=excel_filenames, titlestr=titlestr_for_plot, figurename=figname, flag=flag)
+    jobs.append(('hobo_compare_stations', plotrout.main, dict(plotroutine=plotroutine, excel_filename=excel_filenames, titlestr=titlestr_for_plot, figurename=figname, flag=flag, n_workers=n_workers, daily=daily),
+                 [os.path.join('figures', "".join([figname, '*.png']))]))
 
 # timeseries plot for hobo precipitation
 if workflow_dict['hobo_single_station_precip'] == 1:
+    import python.plotting_routines as plotrout
     plotroutine = 'hobo_precip'
     excel_filename = 'hobo_precip.xls'
     figname = 'hobo_example'
     timebegin = '2018082410'
     timeend = '2018082612'
     titlestr_for_plot = 'hobo example observed precipitation'
-    plotrout.main(plotroutine=plotroutine, excel_filename=excel_filename, titlestr=titlestr_for_plot, figurename=figname, timebegin=timebegin, timeend=timeend, hour_interval=3, time_freq='3H')
+    bucket_resolution = 0.2 # precipitation per tip in mm
+    jobs.append(('hobo_single_station_precip', plotrout.main, dict(plotroutine=plotroutine, excel_filename=excel_filename, titlestr=titlestr_for_plot, figurename=figname, timebegin=timebegin, timeend=timeend, hour_interval=3, time_freq='3h', bucket_resolution=bucket_resolution),
+                 [os.path.join('figures', "".join([figname, 'precip.png']))]))
 
 
 
 # timeseries plot for synoptic observations (such as cloudiness)
 if workflow_dict['timeseries_syn_observations'] == 1:
+    import python.plotting_routines as plotrout
     plotroutine='syn_observation'
     excel_filename = 'syn_obs_template.xlsx'
     figname = 'syn_obs_example'
     title = 'synoptic observations example'
-    plotrout.main(plotroutine=plotroutine, excel_filename=excel_filename, figurename=figname, titlestr=title)
+    jobs.append(('timeseries_syn_observations', plotrout.main, dict(plotroutine=plotroutine, excel_filename=excel_filename, figurename=figname, titlestr=title),
+                 [os.path.join('figures', "".join([figname, '.png'])), os.path.join('figures', "".join([figname, '_cloudbase.png']))]))
 
 
 # timeseries plot for synoptic forecast
 if workflow_dict['timeseries_syn_forecast'] == 1:
+    import python.plotting_routines as plotrout
     plotroutine='syn_forecast'
     excel_filename = 'syn_forecast_validation_example.xlsx'
     figname = 'syn_forecast_validation_example'
@@ -154,4 +194,10 @@ if workflow_dict['timeseries_syn_forecast'] == 1:
     timebegin = '2019051908'
     timeend = '2019052016'
     timemarker = '2019051915'
-    plotrout.main(plotroutine=plotroutine, excel_filename=excel_filename, figurename=figname, titlestr=title, timebegin=timebegin, timeend=timeend, timemarker=timemarker)
+    jobs.append(('timeseries_syn_forecast', plotrout.main, dict(plotroutine=plotroutine, excel_filename=excel_filename, figurename=figname, titlestr=title, timebegin=timebegin, timeend=timeend, timemarker=timemarker),
+                 [os.path.join('figures', "".join([figname, '_new.png']))]))
+
+
+""" Run all jobs """
+if __name__ == '__main__':
+    runner.run_jobs(jobs, n_workers=n_jobs, incremental=incremental)
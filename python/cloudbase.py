@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 15:46:10 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 15:46:10 +0200
+"""
+Estimation of the cloud base height from temperature and dew-point temperature
+of the synoptic observation instruments and comparison with the observed cloud base.
+
+Methods:
+    spread  cloud base = (T - Td) * 125 m
+    lcl     height of the lifting condensation level (temperature at the LCL after Bolton 1980,
+            dry adiabatic lapse rate g/cp)
+"""
+import numpy as np
+import pandas as pd
+import warnings
+
+from .intercomparison import INSTRUMENTS
+
+g = 9.81 # m/s2
+cp = 1005. # J/(kg K)
+
+def stack_t_td(frame):
+    """ Returns the instruments measuring T and Td and their readings as arrays (instruments x observations). """
+    instruments = [inst for inst in INSTRUMENTS['T'] if inst in INSTRUMENTS['Td']
+                   and "_".join(['T', inst]) in frame.columns and "_".join(['Td', inst]) in frame.columns]
+    T = np.vstack([pd.to_numeric(frame["_".join(['T', inst])], errors='coerce').values for inst in instruments])
+    Td = np.vstack([pd.to_numeric(frame["_".join(['Td', inst])], errors='coerce').values for inst in instruments])
+    return instruments, T.astype(float), Td.astype(float)
+
+def spread_cloud_base(T, Td):
+    return (T - Td)*125
+
+def lcl_cloud_base(T, Td):
+    T_k = T + 273.15
+    Td_k = Td + 273.15
+    T_lcl = 1./(1./(Td_k - 56) + np.log(T_k/Td_k)/800.) + 56
+    return (T_k - T_lcl)*cp/g
+
+def estimate_cloud_base(frame, method='spread'):
+    """
+    Estimates the cloud base height in m for all instruments at once (frame: observation sheet,
+    e.g. from intercomparison.load_observations). Returns the instruments and the
+    array of cloud base heights (instruments x observations).
+    """
+    instruments, T, Td = stack_t_td(frame)
+    if method == 'spread':
+        return instruments, spread_cloud_base(T, Td)
+    elif method == 'lcl':
+        return instruments, lcl_cloud_base(T, Td)
+    raise ValueError('Unknown cloud base method %s, use spread or lcl!' % (method))
+
+def cloud_base_errors(frame, methods=('spread', 'lcl'), max_height=None):
+    """
+    Compares the estimated cloud base of all instruments and methods with the observed
+    'cloud_base' column, returns a frame with bias, mae, rmse and n for each (method, instrument).
+    max_height: observations above this height (e.g. 4000 m as in the plots) are ignored
+    """
+    observed = pd.to_numeric(frame['cloud_base'], errors='coerce').values.astype(float)
+    if max_height is not None:
+        observed = np.where(observed > max_height, np.nan, observed)
+
+    tables = []
+    with warnings.catch_warnings():
+        # instruments without data result in nan
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for method in methods:
+            instruments, estimate = estimate_cloud_base(frame, method=method)
+            diff = estimate - observed[None, :]
+            tables.append(pd.DataFrame({'bias': np.nanmean(diff, axis=1),
+                                        'mae': np.nanmean(np.abs(diff), axis=1),
+                                        'rmse': np.sqrt(np.nanmean(diff**2, axis=1)),
+                                        'n': np.sum(np.isfinite(diff), axis=1)},
+                                       index=pd.MultiIndex.from_product([[method], instruments], names=['method', 'instrument'])))
+    return pd.concat(tables)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 10:02:17 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 10:02:17 +0200
+"""
+Pixel aware decimation of dense time series before plotting.
+A line with far more points than the axes has pixels is reduced to the minimum
+and maximum value per pixel column, which looks the same but keeps peaks
+such as wind gusts (simple subsampling would lose them).
+"""
+import matplotlib.dates as mdates
+import numpy as np
+
+# series with more points than this are decimated by default
+POINT_THRESHOLD = 5000
+
+def minmax_indices(x, y, n_buckets):
+    """
+    Returns the (sorted) indices of the minimum and maximum value of y in each of
+    n_buckets equally wide x intervals. The first and last valid sample as well
+    as the start of each gap (nan) are kept, so axis limits and gaps stay intact.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    valid = np.flatnonzero(finite)
+    if valid.size <= 2*n_buckets:
+        return np.arange(len(y))
+
+    xv = x[valid]
+    yv = y[valid]
+    edges = np.linspace(xv.min(), xv.max(), n_buckets+1)
+    bucket = np.clip(np.searchsorted(edges, xv, side='right')-1, 0, n_buckets-1)
+
+    # sort by bucket, then by value: first/last entry of each bucket is min/max
+    order = np.lexsort((yv, bucket))
+    bucket_sorted = bucket[order]
+    first = np.r_[True, bucket_sorted[1:] != bucket_sorted[:-1]]
+    last = np.r_[first[1:], True]
+    keep = valid[np.r_[order[first], order[last], 0, valid.size-1]]
+
+    # keep the first nan of each gap to interrupt the line
+    gap_starts = np.flatnonzero(~finite & np.r_[True, finite[:-1]])
+    return np.union1d(keep, gap_starts)
+
+def decimate_series(ax, time, y, threshold=POINT_THRESHOLD):
+    """ Returns time and y reduced to min/max pairs per pixel of the axes width if longer than threshold. """
+    if len(y) > threshold:
+        n_buckets = max(int(ax.bbox.width), 1)
+        idx = minmax_indices(mdates.date2num(time), y, n_buckets)
+        time = np.asarray(time)[idx]
+        y = np.asarray(y)[idx]
+    return time, y
+
+def plot_series(ax, time, y, *args, decimate=True, threshold=POINT_THRESHOLD, **kwargs):
+    """
+    Drop-in replacement for ax.plot(time, y, *args, **kwargs), which reduces
+    series longer than threshold to min/max pairs per pixel of the axes width.
+    """
+    if decimate:
+        time, y = decimate_series(ax, time, y, threshold=threshold)
+    return ax.plot(time, y, *args, **kwargs)
+
+def set_series(line, time, y, decimate=True, threshold=POINT_THRESHOLD):
+    """ Replaces the data of an existing line (e.g. from plot_series), decimated the same way. """
+    if decimate:
+        time, y = decimate_series(line.axes, time, y, threshold=threshold)
+    line.set_data(time, y)
+    return line
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 09:12:31 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 09:12:31 +0200
+"""
+Reading routines for HOBO station workbooks.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from time import sleep
+import numpy as np
+import pandas as pd
+
+from . import instrument
+from . import pressure_reduction_msl
+from . import thermodynamics
+
+# short names for the measured variables (same keys as the var_dict in main_control.py)
+HOBO_COLUMNS = {'Windgeschwindigkeit, m/s': 'wind_spd',
+                'Böengeschwindigkeit, m/s': 'wind_gusts',
+                'Windrichtung, ø': 'wind_dir',
+                'Temp., °C': 'temp',
+                'RH, %': 'rel_hum',
+                'Druck, mbar': 'pres',
+                'Sonnenstrahlung, W/m²': 'radiation'}
+
+# station heights in m above sea level
+STATION_HEIGHTS = {'Campingplatz': 771,
+                   'Lanzenkreuz': 791,
+                   'Seetal': 842,
+                   'Stübming': 824,
+                   'UnterDerLanzen': 733}
+
+# loaded hobo frames including derived columns are cached here
+cache_dir = os.path.join('data', 'cache')
+# modules whose code determines the cached frames (reading, derived columns, pres_msl), a change rebuilds the caches
+CACHE_MODULES = (__file__, thermodynamics.__file__, pressure_reduction_msl.__file__)
+_code_hash = []
+# attempts of read_columns if the directory is replaced while it is read
+READ_ATTEMPTS = 20
+
+def cache_version(station=None):
+    """ Version of a hobo cache: station (height of pres_msl) and the hash of CACHE_MODULES. """
+    if not _code_hash:
+        sha = hashlib.sha256()
+        for filename in CACHE_MODULES:
+            with open(filename, 'rb') as f:
+                sha.update(f.read())
+        _code_hash.append(sha.hexdigest())
+    return {'station': station, 'code': _code_hash[0]}
+
+def hobo_header(columns):
+    """ Fixes the column header from hobo file output (removes the logger and sensor serial numbers). """
+    return [" ".join(x.split(' ')[:2]).strip(',') for x in columns]
+
+def logger_serial(columns):
+    """ Logger serial number from the raw column header ('Temp., °C (LGR S/N: 1149556, SEN S/N: ...)'), None if missing. """
+    for col in columns:
+        match = re.search(r'LGR S/N: (\d+)', str(col))
+        if match:
+            return match.group(1)
+    return None
+
+def read_hobo_excel(excel_filename):
+    """
+    Read a HOBO workbook from data/excel and fix the column header
+    (removes the logger and sensor serial numbers).
+    """
+    return read_hobo_logger(excel_filename)[1]
+
+def read_hobo_csv(csv_filename):
+    """ Same as read_hobo_excel for a HOBOware csv export in data/excel. """
+    return read_hobo_logger(csv_filename)[1]
+
+def read_hobo_logger(filename):
+    """
+    Reads a HOBO workbook or csv export from data/excel, returns the logger serial number
+    (from the header, before it is removed) and the dataframe with fixed column header.
+    """
+    path = os.path.join('data', 'excel', filename)
+    with instrument.span('read', file=filename):
+        if filename.lower().endswith('.csv'):
+            df = pd.read_csv(path, skiprows=1)
+        else:
+            df = pd.read_excel(path, skiprows=1)
+    serial = logger_serial(df.columns)
+    df.columns = hobo_header(df.columns)
+    return serial, df
+
+def read_hobo_excels(excel_filenames, n_workers=None):
+    """
+    Read several HOBO workbooks concurrently in a process pool, parsing
+    the xlsx files is the slow part and the files are independent.
+    The returned list of dataframes has the same order as excel_filenames.
+
+    n_workers: number of worker processes, defaults to one per file
+               (limited by the number of cpus), 1 reads sequentially
+    """
+    excel_filenames = list(excel_filenames)
+    if n_workers is None:
+        n_workers = min(len(excel_filenames), os.cpu_count() or 1)
+    if n_workers <= 1 or len(excel_filenames) <= 1:
+        return [read_hobo_excel(fn) for fn in excel_filenames]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(read_hobo_excel, excel_filenames))
+
+def hobo_time(df):
+    """
+    Returns the 'Datum Zeit' column as DatetimeIndex, parsed in one go
+    for the old (string) and new (datetime) hobo export versions.
+    """
+    time = df['Datum Zeit']
+    if pd.api.types.is_datetime64_any_dtype(time):
+        return pd.DatetimeIndex(time, name='time')
+    time = time.astype(str)
+    if len(time.iloc[0]) > 18:
+        fmt = '%d.%m.%Y %H:%M:%S'
+    else:
+        fmt = '%d.%m.%y %H:%M:%S'
+    return pd.DatetimeIndex(pd.to_datetime(time, format=fmt), name='time')
+
+def hobo_values(column):
+    """ Returns a column as float array, also if the excel file uses a , as decimal. """
+    if not pd.api.types.is_numeric_dtype(column):
+        column = column.astype(str).str.replace(',', '.')
+    return pd.to_numeric(column, errors='coerce').values.astype(float)
+
+@instrument.traced('parse', category='stage')
+def hobo_frame(df):
+    """
+    Converts a dataframe from read_hobo_excel into a frame indexed by time
+    with float columns named as in HOBO_COLUMNS.
+    """
+    data = {name: hobo_values(df[col]) for col, name in HOBO_COLUMNS.items() if col in df.columns}
+    return pd.DataFrame(data, index=hobo_time(df))
+
+def compact_frame(frame):
+    """
+    Returns a memory saving version of a hobo frame: float32 measurement columns and
+    a categorical 'station' column. The DatetimeIndex is kept, it is stored as int64
+    epoch (ns) internally, unlike lists of datetime objects.
+    """
+    float_columns = [col for col in frame.columns if pd.api.types.is_float_dtype(frame[col])]
+    frame = frame.astype({col: np.float32 for col in float_columns})
+    if 'station' in frame.columns:
+        frame['station'] = frame['station'].astype('category')
+    return frame
+
+@instrument.traced('cache write', category='stage')
+def write_columns(frame, path, version=None):
+    """
+    Stores a hobo frame (float columns only) in the directory path as npy files:
+    time.npy (int64 epoch in ns), values.npy (float32, rows x columns) and the column names
+    (columns.json, together with version if given, see read_version).
+    The files are written into a new directory next to path which then replaces path, so
+    other processes reading (or memory-mapping) the old files never see partly written ones.
+    """
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='.%s.' % (os.path.basename(path)), dir=os.path.dirname(path))
+    try:
+        time = np.asarray(frame.index.values, dtype='datetime64[ns]').astype(np.int64)
+        np.save(os.path.join(tmp, 'time.npy'), time)
+        np.save(os.path.join(tmp, 'values.npy'), np.ascontiguousarray(frame.values, dtype=np.float32))
+        with open(os.path.join(tmp, 'columns.json'), 'w') as f:
+            if version is None:
+                json.dump(list(frame.columns), f)
+            else:
+                json.dump({'columns': list(frame.columns), 'version': version}, f)
+        replace_dir(tmp, path)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return None
+
+def replace_dir(src, dst):
+    """
+    Moves the directory src to dst, an existing dst is moved aside first and then deleted
+    (memory-mapped files stay valid for their readers). If another process put its
+    directory to dst in between, that one is kept.
+    """
+    old = ".".join([src, 'old'])
+    try:
+        os.rename(dst, old)
+    except FileNotFoundError:
+        old = None
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # dst was written by another process meanwhile
+        pass
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+    return None
+
+def read_version(path):
+    """ Version stored by write_columns in path, None if there is none. """
+    try:
+        with open(os.path.join(path, 'columns.json'), 'r') as f:
+            columns = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return columns.get('version') if isinstance(columns, dict) else None
+
+def read_columns(path, mmap_mode='r'):
+    """
+    Reads a frame stored by write_columns. With mmap_mode='r' (default) the values
+    are memory-mapped from disk instead of loaded, so only the parts of the data
+    actually used occupy memory (the frame is read-only then, use mmap_mode=None for a copy).
+    If path is replaced while it is read (by write_columns of another process), it is read again.
+    """
+    for attempt in range(READ_ATTEMPTS):
+        try:
+            # the files belong together if the directory is still the same after reading them
+            inode = os.stat(path).st_ino
+            with open(os.path.join(path, 'columns.json'), 'r') as f:
+                columns = json.load(f)
+            time = np.load(os.path.join(path, 'time.npy')).view('datetime64[ns]')
+            values = np.load(os.path.join(path, 'values.npy'), mmap_mode=mmap_mode)
+            if os.stat(path).st_ino == inode:
+                break
+        except (OSError, EOFError, ValueError):
+            if attempt == READ_ATTEMPTS - 1:
+                raise
+        sleep(0.05)
+    else:
+        raise ValueError('%s was replaced while reading it!!!' % (path))
+    if isinstance(columns, dict):
+        columns = columns['columns']
+    return pd.DataFrame(values, index=pd.DatetimeIndex(time, name='time'), columns=columns, copy=False)
+
+def hobo_cache_path(excel_filename, station=None):
+    """ Cache directory of a workbook, one per station (the station height determines pres_msl). """
+    name = os.path.splitext(excel_filename)[0]
+    return os.path.join(cache_dir, name if station is None else "_".join([name, station]))
+
+def load_hobo(excel_filename, station=None, mmap_mode='r'):
+    """
+    Returns the hobo frame of excel_filename including the derived thermodynamic
+    columns (see thermodynamics.add_derived_columns) as float32 columns. The frame is
+    cached in data/cache (see hobo_cache_path) and only rebuilt if the excel file is newer
+    than the cache or the cache was built by another version of the code (see cache_version),
+    cached data is memory-mapped (see read_columns).
+    station: station name used to look up the height in STATION_HEIGHTS
+    """
+    cache_path = hobo_cache_path(excel_filename, station)
+    cache_file = os.path.join(cache_path, 'values.npy')
+    excel_path = os.path.join('data', 'excel', excel_filename)
+    try:
+        fresh = os.path.getmtime(cache_file) >= os.path.getmtime(excel_path)
+    except OSError:
+        # no cache yet (or replaced by another process just now)
+        fresh = False
+    if fresh:
+        version = read_version(cache_path)
+        if version == cache_version(station):
+            return read_columns(cache_path, mmap_mode=mmap_mode)
+
+    frame = hobo_frame(read_hobo_excel(excel_filename))
+    thermodynamics.add_derived_columns(frame, station_height=STATION_HEIGHTS.get(station))
+    write_columns(frame, cache_path, version=cache_version(station))
+    return read_columns(cache_path, mmap_mode=mmap_mode)
+
+def load_hobo_network(excel_filenames, n_workers=None):
+    """
+    Loads several stations (dict station name -> excel filename) concurrently
+    and returns one compact frame for the whole network with an additional
+    categorical 'station' column.
+    """
+    stations = list(excel_filenames.keys())
+    filenames = list(excel_filenames.values())
+    if n_workers is None:
+        n_workers = min(len(filenames), os.cpu_count() or 1)
+    if n_workers <= 1 or len(filenames) <= 1:
+        frames = [load_hobo(fn, st) for fn, st in zip(filenames, stations)]
+    else:
+        # memory-mapped frames can not be sent between processes, load the cache afterwards
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(_build_cache, filenames, stations))
+        frames = [load_hobo(fn, st) for fn, st in zip(filenames, stations)]
+    network = compact_frame(pd.concat([frame.assign(station=st) for frame, st in zip(frames, stations)]))
+    network['station'] = pd.Categorical(network['station'].values, categories=stations)
+    return network
+
+def _build_cache(excel_filename, station):
+    load_hobo(excel_filename, station)
+    # spans of the worker process, written before the pool is shut down
+    instrument.flush()
+    return None
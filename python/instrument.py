@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 19:20:45 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 19:20:45 +0200
+"""
+Timing and memory instrumentation of the working steps. Each stage (file read, parsing,
+computation, plotting, savefig, kml write, download) is recorded as a span with its
+wall time, cpu time and peak memory (python allocations incl. numpy, via tracemalloc).
+
+Switched on by the environment variable FELDPRAKT_TRACE=trace.json (or feldprakt.py --trace),
+the spans of all processes are written into this file in the Chrome trace format
+(open in chrome://tracing or https://ui.perfetto.dev). Without it, spans cost nothing.
+
+    with instrument.span('read', file=excel_filename):
+        df = pd.read_excel(...)
+
+    @instrument.traced('plot')
+    def main(...):
+"""
+import atexit
+from contextlib import contextmanager
+import functools
+import glob
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+TRACE_ENV = 'FELDPRAKT_TRACE'
+# pid of the process writing the trace file, set by the first process which enables tracing
+OWNER_ENV = 'FELDPRAKT_TRACE_OWNER'
+
+_events = []
+_stack = []
+
+def trace_file():
+    return os.environ.get(TRACE_ENV)
+
+def enable(filename):
+    """ Switches tracing on for this process and its child processes. """
+    os.environ[TRACE_ENV] = os.path.abspath(filename)
+    os.environ[OWNER_ENV] = str(os.getpid())
+    atexit.register(write)
+    return None
+
+@contextmanager
+def span(name, category='stage', **args):
+    """ Records the block as span name with wall time, cpu time and peak memory (if tracing is on). """
+    if not trace_file():
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    # the peak of the enclosing span is kept before the peak is reset for this span
+    current, peak = tracemalloc.get_traced_memory()
+    if _stack:
+        _stack[-1]['peak'] = max(_stack[-1]['peak'], peak)
+    if hasattr(tracemalloc, 'reset_peak'):
+        # python >= 3.9, otherwise the peak since the start of tracing is reported
+        tracemalloc.reset_peak()
+    entry = {'peak': current}
+    _stack.append(entry)
+    start_wall = time.time()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.time() - start_wall
+        cpu = time.process_time() - start_cpu
+        entry['peak'] = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+        _stack.pop()
+        if _stack:
+            _stack[-1]['peak'] = max(_stack[-1]['peak'], entry['peak'])
+        args.update({'cpu_s': round(cpu, 6), 'peak_mem_mb': round(entry['peak']/1e6, 3)})
+        _events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start_wall*1e6, 'dur': wall*1e6,
+                        'pid': os.getpid(), 'tid': threading.get_ident() % 2**31,
+                        'args': {key: value if isinstance(value, (int, float)) else str(value) for key, value in args.items()}})
+
+def traced(name=None, category='step'):
+    """ Decorator recording every call of the function as span (default name module.function). """
+    def decorator(function):
+        span_name = name or ".".join([function.__module__.split('.')[-1], function.__name__])
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category=category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def flush():
+    """ Appends the spans of this process to its part file next to the trace file. """
+    if not trace_file() or not _events:
+        return None
+    with open('%s.%d.part' % (trace_file(), os.getpid()), 'a') as f:
+        for event in _events:
+            # forked worker processes inherit the spans recorded before the fork
+            if event['pid'] == os.getpid():
+                f.write(json.dumps(event) + '\n')
+    del _events[:]
+    return None
+
+def write():
+    """
+    Writes the trace file from the spans of all processes (only in the process which enabled
+    tracing, the other processes only flush their spans). Returns the filename.
+    """
+    filename = trace_file()
+    if not filename:
+        return None
+    flush()
+    if os.environ.get(OWNER_ENV) != str(os.getpid()):
+        return None
+    events = []
+    for part in sorted(glob.glob('%s.*.part' % (glob.escape(filename)))):
+        with open(part, 'r') as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+        os.remove(part)
+    if not events:
+        return None
+    events.sort(key=lambda event: event['ts'])
+    with open(filename, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    print('Trace with %d spans written to %s' % (len(events), filename))
+    return filename
+
+# tracing switched on from outside (FELDPRAKT_TRACE=trace.json python main_control.py)
+if trace_file() and OWNER_ENV not in os.environ:
+    enable(trace_file())
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 15:08:53 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 15:08:53 +0200
+"""
+Intercomparison of the instruments of the synoptic observation sheets
+(columns VARIABLE_INSTRUMENT, e.g. T_assmann, see syn_obs_template.xlsx).
+For each variable the readings of all instruments are stacked into one array
+(instruments x observations), and the statistics are computed for all
+instrument pairs at once:
+
+    bias, rmse      pairwise matrices, row instrument minus column instrument
+    regression      slope, intercept, correlation of each instrument against the reference
+    drift           trend of the difference to the reference in units per day
+"""
+import numpy as np
+import pandas as pd
+import warnings
+
+from . import syn_sheets
+
+# instruments measuring each variable
+INSTRUMENTS = {'T':     ['assmann', 'davis', 'kestrel', 'davis-station', 'humiport'],
+               'Td':    ['assmann', 'davis', 'kestrel', 'davis-station', 'mirror'],
+               'RH':    ['assmann', 'davis', 'kestrel', 'davis-station', 'humiport'],
+               'p':     ['kestrel', 'vaisala']}
+
+# default reference instrument for each variable
+REFERENCE = {'T': 'assmann', 'Td': 'mirror', 'RH': 'assmann', 'p': 'vaisala'}
+
+def load_observations(excel_filenames):
+    """
+    Reads several observation sheets from data/excel into one frame with a 'time' column.
+    excel_filenames: dict date (YYYYMMDD) -> filename, the sheets only contain the time of day
+    """
+    return syn_sheets.load_sheets(excel_filenames, 'syn_observation')
+
+def stack_instruments(frame, variable):
+    """ Returns the instrument names and the readings as float array (instruments x observations). """
+    instruments = [inst for inst in INSTRUMENTS[variable] if "_".join([variable, inst]) in frame.columns]
+    values = np.vstack([pd.to_numeric(frame["_".join([variable, inst])], errors='coerce').values for inst in instruments])
+    return instruments, values.astype(float)
+
+def pairwise_statistics(values):
+    """ Pairwise bias and rmse matrices of all instruments (rows minus columns). """
+    diff = values[:, None, :] - values[None, :, :]
+    return np.nanmean(diff, axis=2), np.sqrt(np.nanmean(diff**2, axis=2))
+
+def linear_regression(x, y):
+    """
+    Least squares fit y = slope*x + intercept for each row of y (x has the same shape or
+    broadcasts), using only pairs where both values exist. Returns slope, intercept, r and n.
+    """
+    x, y = np.broadcast_arrays(x, y)
+    valid = np.isfinite(x) & np.isfinite(y)
+    n = valid.sum(axis=1)
+    x = np.where(valid, x, 0.)
+    y = np.where(valid, y, 0.)
+    mean_x = x.sum(axis=1)/n
+    mean_y = y.sum(axis=1)/n
+    dx = np.where(valid, x - mean_x[:, None], 0.)
+    dy = np.where(valid, y - mean_y[:, None], 0.)
+    sxy = (dx*dy).sum(axis=1)
+    sxx = (dx**2).sum(axis=1)
+    syy = (dy**2).sum(axis=1)
+    slope = sxy/sxx
+    return slope, mean_y - slope*mean_x, sxy/np.sqrt(sxx*syy), n
+
+def intercompare(frame, reference=None):
+    """
+    Runs the intercomparison for all variables in INSTRUMENTS, frame as returned by
+    load_observations. reference: dict variable -> instrument (defaults to REFERENCE).
+    Returns a dict variable -> dict with the entries 'bias', 'rmse' (instrument x instrument frames),
+    'regression' (frame with slope, intercept, r, n per instrument) and 'drift' (series, units per day).
+    """
+    reference = dict(REFERENCE, **(reference or {}))
+    days = (frame['time'] - frame['time'].min()).dt.total_seconds().values/86400.
+    results = {}
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        # instruments without data result in nan
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for variable in INSTRUMENTS:
+            instruments, values = stack_instruments(frame, variable)
+            if len(instruments) < 2:
+                continue
+            bias, rmse = pairwise_statistics(values)
+            ref = values[instruments.index(reference[variable])]
+            slope, intercept, r, n = linear_regression(ref[None, :], values)
+            drift = linear_regression(days[None, :], values - ref[None, :])[0]
+            results[variable] = {'bias': pd.DataFrame(bias, index=instruments, columns=instruments),
+                                 'rmse': pd.DataFrame(rmse, index=instruments, columns=instruments),
+                                 'regression': pd.DataFrame({'slope': slope, 'intercept': intercept, 'r': r, 'n': n}, index=instruments),
+                                 'drift': pd.Series(drift, index=instruments, name='drift per day')}
+    return results
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 21:02:37 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 21:02:37 +0200
+"""
+Live station feed for the monitoring on site: readings arrive as csv lines over a tcp socket
+(localhost) or are appended to csv files by a logger relay. Each stream starts with a header
+line naming its columns, 'time' is required, 'station' is optional (default station otherwise),
+all other columns are variables (named as the hobo frame columns, see hobo_io.HOBO_COLUMNS):
+
+    time,station,wind_spd,wind_gusts,wind_dir,temp,rel_hum,pres
+    2019-05-19 12:00:00,Seetal,2.1,4.3,270,12.3,80.1,921.4
+
+The last CAPACITY readings of every station and variable are kept in a ring buffer, the mean,
+minimum and maximum over the last WINDOW seconds are updated with every reading in constant
+(amortized) time, and a hobo_single figure of every station is redrawn every REFRESH seconds.
+"""
+from collections import deque
+import os
+import socketserver
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from . import plotting_routines as plotrout
+
+HOST = '127.0.0.1'
+PORT = 8766
+CAPACITY = 20000 # readings kept per station and variable (about 2 months of 5 min values)
+WINDOW = 600. # s, window of the rolling statistics
+REFRESH = 60. # s, time between two figure updates
+POLL_INTERVAL = 1. # s, for appended csv files
+DEFAULT_STATION = 'live' # station of streams without station column
+# variables of the hobo_single figure (same order as the var_dict in main_control.py)
+FIGURE_VARIABLES = ('wind_spd', 'wind_gusts', 'wind_dir', 'temp', 'rel_hum', 'pres', 'radiation')
+
+class RingBuffer(object):
+    """ The last capacity (time, value) pairs in preallocated arrays, appending overwrites the oldest. """
+    def __init__(self, capacity=CAPACITY):
+        self.time = np.zeros(capacity, dtype='datetime64[ns]')
+        self.values = np.full(capacity, np.nan)
+        self.head = 0 # next position to write
+        self.count = 0
+
+    def append(self, time, value):
+        self.time[self.head] = time
+        self.values[self.head] = value
+        self.head = (self.head + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+        return None
+
+    def series(self):
+        """ Contents in time order as series. """
+        index = np.arange(self.head - self.count, self.head) % len(self.values)
+        return pd.Series(self.values[index], index=pd.DatetimeIndex(self.time[index], name='time'))
+
+class RollingStats(object):
+    """
+    Mean, minimum and maximum over the last window seconds, updated with every reading:
+    a running sum for the mean, and monotonic queues for minimum and maximum (a reading
+    is removed from them as soon as a newer reading is smaller/larger).
+    Readings have to arrive in time order, NaN is ignored.
+    """
+    def __init__(self, window=WINDOW):
+        self.window = np.timedelta64(int(window*1e9), 'ns')
+        self.samples = deque()
+        self.total = 0.
+        self.maxima = deque()
+        self.minima = deque()
+
+    def add(self, time, value):
+        if not np.isnan(value):
+            self.samples.append((time, value))
+            self.total += value
+            while self.maxima and self.maxima[-1][1] <= value:
+                self.maxima.pop()
+            self.maxima.append((time, value))
+            while self.minima and self.minima[-1][1] >= value:
+                self.minima.pop()
+            self.minima.append((time, value))
+        self.expire(time)
+        return None
+
+    def expire(self, now):
+        """ Removes the readings older than the window before now. """
+        start = now - self.window
+        while self.samples and self.samples[0][0] <= start:
+            self.total -= self.samples.popleft()[1]
+        while self.maxima and self.maxima[0][0] <= start:
+            self.maxima.popleft()
+        while self.minima and self.minima[0][0] <= start:
+            self.minima.popleft()
+        return None
+
+    def mean(self):
+        return self.total/len(self.samples) if self.samples else np.nan
+
+    def min(self):
+        return self.minima[0][1] if self.minima else np.nan
+
+    def max(self):
+        return self.maxima[0][1] if self.maxima else np.nan
+
+class LiveFeed(object):
+    """ Ring buffers and rolling statistics of all stations and variables (thread safe). """
+    def __init__(self, capacity=CAPACITY, window=WINDOW):
+        self.capacity = capacity
+        self.window = window
+        self.stations = {} # station -> variable -> (RingBuffer, RollingStats)
+        self.last_time = {} # station -> time of the last reading
+        self.n_readings = 0
+        self.n_dropped = 0
+        self.lock = threading.Lock()
+
+    def add(self, station, time, values):
+        """ Adds the readings (dict variable -> value) of station at time, older readings than the last are dropped. """
+        time = np.datetime64(time, 'ns')
+        with self.lock:
+            if station in self.last_time and time <= self.last_time[station]:
+                self.n_dropped += 1
+                return False
+            self.last_time[station] = time
+            variables = self.stations.setdefault(station, {})
+            for variable, value in values.items():
+                if variable not in variables:
+                    variables[variable] = (RingBuffer(self.capacity), RollingStats(self.window))
+                buffer, stats = variables[variable]
+                buffer.append(time, value)
+                stats.add(time, value)
+            self.n_readings += 1
+        return True
+
+    def stats(self, station):
+        """ dict variable -> {'mean', 'min', 'max'} over the window, and 'gust' (maximum wind gust or speed). """
+        with self.lock:
+            result = {variable: {'mean': stats.mean(), 'min': stats.min(), 'max': stats.max()}
+                      for variable, (_, stats) in self.stations.get(station, {}).items()}
+        for variable in ('wind_gusts', 'wind_spd'):
+            if variable in result:
+                result['gust'] = result[variable]['max']
+                break
+        return result
+
+    def frame(self, station):
+        """ Buffered readings of station as hobo frame (one column per variable). """
+        with self.lock:
+            series = {variable: buffer.series() for variable, (buffer, _) in self.stations.get(station, {}).items()}
+        if not series:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='time'))
+        frame = pd.concat(series, axis=1, sort=True)
+        frame.index.name = 'time'
+        return frame
+
+def parse_header(line):
+    """ Column names of a stream. """
+    columns = [col.strip() for col in line.strip().split(',')]
+    if 'time' not in columns:
+        raise ValueError('The header of a live stream needs a time column, got %s!!!' % (line.strip()))
+    return columns
+
+def parse_line(columns, line, station=DEFAULT_STATION):
+    """ Returns (station, time, dict variable -> value) of a csv line, None for empty lines. """
+    if not line.strip():
+        return None
+    fields = [field.strip() for field in line.strip().split(',')]
+    if len(fields) != len(columns):
+        raise ValueError('Expected %d values, got %s!!!' % (len(columns), line.strip()))
+    row = dict(zip(columns, fields))
+    values = {}
+    for col, value in row.items():
+        if col in ('time', 'station'):
+            continue
+        try:
+            values[col] = float(value)
+        except ValueError:
+            values[col] = np.nan
+    return row.get('station', station), pd.Timestamp(row['time']), values
+
+def read_stream(lines, feed, station=DEFAULT_STATION, columns=None):
+    """
+    Adds the readings of csv lines to feed, the first line is the header unless the columns
+    are given. Bad lines are reported and skipped. Returns the columns.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if columns is None:
+            if line.strip():
+                try:
+                    columns = parse_header(line)
+                except ValueError as e:
+                    print('Skipping line: %s' % (e))
+            continue
+        try:
+            reading = parse_line(columns, line, station)
+        except ValueError as e:
+            print('Skipping line: %s' % (e))
+            continue
+        if reading is not None:
+            feed.add(*reading)
+    return columns
+
+def follow_csv(path, feed, station=DEFAULT_STATION, interval=POLL_INTERVAL, stop=None):
+    """
+    Reads the lines appended to a csv file (like tail -f) until stop (threading.Event) is set.
+    Incomplete last lines are kept until they are finished, a truncated or replaced file
+    is read again from the beginning.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        if not os.path.isfile(path):
+            stop.wait(interval)
+            continue
+        with open(path, 'r') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            columns = None
+            rest = ''
+            while not stop.is_set():
+                chunk = f.read()
+                if not chunk:
+                    stat = os.stat(path) if os.path.isfile(path) else None
+                    if stat is None or stat.st_ino != inode or stat.st_size < f.tell():
+                        # replaced or truncated
+                        break
+                    stop.wait(interval)
+                    continue
+                lines = (rest + chunk).split('\n')
+                rest = lines.pop()
+                columns = read_stream(lines, feed, station, columns=columns)
+    return None
+
+def tcp_server(feed, port=PORT, station=DEFAULT_STATION):
+    """ Threaded tcp server on localhost, every connection sends a header line and readings. """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            read_stream(self.rfile, feed, station)
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer((HOST, port), Handler)
+    server.daemon_threads = True
+    return server
+
+def summary(station, stats, window=WINDOW):
+    """ One line with the rolling statistics of a station. """
+    parts = []
+    for variable, unit in (('temp', '°C'), ('rel_hum', '%'), ('pres', 'hPa'), ('wind_spd', 'm/s')):
+        if variable in stats and not np.isnan(stats[variable]['mean']):
+            parts.append('%s %.1f %s (%.1f - %.1f)' % (variable, stats[variable]['mean'], unit, stats[variable]['min'], stats[variable]['max']))
+    if 'gust' in stats and not np.isnan(stats['gust']):
+        parts.append('gust %.1f m/s' % (stats['gust']))
+    return '%s, %d min: %s' % (station, round(window/60.), ", ".join(parts) or 'no data')
+
+def figure_title(station, stats, window=WINDOW):
+    """ Short title with the rolling means and the gust of a station. """
+    parts = []
+    for variable, label, unit in (('temp', 'T', '°C'), ('rel_hum', 'RH', '%'), ('pres', 'p', 'hPa'), ('wind_spd', 'wind', 'm/s')):
+        if variable in stats and not np.isnan(stats[variable]['mean']):
+            parts.append('%s %.1f %s' % (label, stats[variable]['mean'], unit))
+    if 'gust' in stats and not np.isnan(stats['gust']):
+        parts.append('gust %.1f m/s' % (stats['gust']))
+    return '%s, last %d min: %s' % (station, round(window/60.), ", ".join(parts))
+
+def refresh_figures(feed, figure_prefix='live_'):
+    """ Draws a hobo_single figure of the buffered readings of every station, returns the filenames. """
+    filenames = []
+    with feed.lock:
+        stations = sorted(feed.stations)
+    for station in stations:
+        frame = feed.frame(station)
+        if len(frame) < 2:
+            continue
+        var_dict = {variable: int(variable in frame.columns) for variable in FIGURE_VARIABLES}
+        # hobo_single expects all columns except radiation
+        frame = frame.reindex(columns=[variable for variable in FIGURE_VARIABLES if variable in frame.columns or variable != 'radiation'])
+        stats = feed.stats(station)
+        figurename = "".join([figure_prefix, str(station), '.png'])
+        print(summary(station, stats, feed.window))
+        try:
+            plotrout.main(plotroutine='hobo_single', frame=frame, var_dict=var_dict, figurename=figurename,
+                          titlestr=figure_title(station, stats, feed.window))
+        except Exception as e:
+            # keep receiving readings
+            print('Could not draw the figure of %s: %s' % (station, e))
+            continue
+        filenames.append(os.path.join('figures', figurename))
+    return filenames
+
+def live(port=PORT, csv_files=(), station=DEFAULT_STATION, capacity=CAPACITY, window=WINDOW, refresh=REFRESH):
+    """
+    Receives readings over tcp (port, None for no socket) and from appended csv files and
+    redraws the figures every refresh seconds until interrupted (ctrl+c).
+    station: default station of streams without station column
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    feed = LiveFeed(capacity=capacity, window=window)
+    stop = threading.Event()
+    for path in csv_files:
+        threading.Thread(target=follow_csv, args=(path, feed), kwargs={'station': station, 'stop': stop}, daemon=True).start()
+    server = None
+    if port is not None:
+        server = tcp_server(feed, port=port, station=station)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print('Receiving readings on %s:%d ...' % (HOST, port))
+    for path in csv_files:
+        print('Following %s ...' % (path))
+
+    try:
+        while True:
+            time.sleep(refresh)
+            refresh_figures(feed)
+    except KeyboardInterrupt:
+        print('Stopped live feed after %d readings (%d dropped)' % (feed.n_readings, feed.n_dropped))
+    finally:
+        stop.set()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return feed
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 17:02:44 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 17:02:44 +0200
+"""
+Build manifest for the outputs of the working steps (figures/, data/google_earth_kml/).
+For each job the manifest stores a key (hash of the input files in data/excel, the
+parameters and the source code of the job and the modules it uses) and the hash of
+every output file. A job is only rerun if it is stale: the key changed, or one of its
+outputs is missing or was modified since it was written.
+"""
+import errno
+import glob
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+MANIFEST_FILE = os.path.join('data', 'cache', 'manifest.json')
+
+def file_hash(path):
+    """ sha256 of the content of a file. """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def code_version(function):
+    """
+    Hash of the source files of the module of function and all modules of the same
+    package it uses (recursively), so any change of the code invalidates the outputs.
+    """
+    package = function.__module__.split('.')[0]
+    todo = [sys.modules[function.__module__]]
+    seen = {}
+    while todo:
+        module = todo.pop()
+        if module.__name__ in seen or not getattr(module, '__file__', None):
+            continue
+        seen[module.__name__] = file_hash(module.__file__)
+        for name, value in inspect.getmembers(module):
+            dependency = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+            if dependency is not None and dependency.__name__.split('.')[0] == package:
+                todo.append(dependency)
+    return hashlib.sha256(json.dumps(seen, sort_keys=True).encode()).hexdigest()
+
+def argument_strings(kwargs):
+    """ Returns all strings in the arguments of a job (also inside dicts and lists). """
+    values = []
+    todo = list(kwargs.values())
+    while todo:
+        value = todo.pop()
+        if isinstance(value, dict):
+            todo.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            todo.extend(value)
+        elif isinstance(value, str):
+            values.append(value)
+    return values
+
+def job_inputs(kwargs):
+    """ Returns the files in data/excel named in the arguments of a job. """
+    return sorted(set(path for path in (os.path.join('data', 'excel', value) for value in argument_strings(kwargs)) if os.path.isfile(path)))
+
+def job_key(function, kwargs, inputs=()):
+    """
+    Hash of the function, its arguments, its input files and its code version.
+    inputs: additional input files (glob patterns), e.g. outputs of other jobs
+    """
+    key = {'function': ".".join([function.__module__, function.__name__]),
+           'kwargs': repr(sorted(kwargs.items())),
+           'inputs': {path: file_hash(path) for path in job_inputs(kwargs) + output_files(inputs)},
+           'code': code_version(function)}
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+def output_files(outputs):
+    """ Returns the existing files matching the output patterns (glob) of a job. """
+    return sorted(set(path for pattern in outputs for path in glob.glob(pattern)))
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    if not os.path.isfile(manifest_file):
+        return {}
+    with open(manifest_file, 'r') as f:
+        return json.load(f)
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    try:
+        os.makedirs(os.path.dirname(manifest_file))
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+def is_stale(manifest, name, key, outputs):
+    """ True if the job has to be (re)run, jobs without declared outputs are always stale. """
+    entry = manifest.get(name)
+    if not outputs or entry is None or entry['key'] != key:
+        return True
+    for pattern in outputs:
+        if not glob.glob(pattern):
+            return True
+    for path, output_hash in entry['outputs'].items():
+        if not os.path.isfile(path) or file_hash(path) != output_hash:
+            return True
+    return False
+
+def record(manifest, name, key, outputs):
+    """ Stores the key and the hashes of the current outputs of a job. """
+    manifest[name] = {'key': key, 'outputs': {path: file_hash(path) for path in output_files(outputs)}}
+    return manifest
@@ -13,7 +13,7 @@ import errno
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import matplotlib.path as mpath
-import matplotlib.patches as mpatches
+from matplotlib.collections import PathCollection
 from matplotlib.ticker import FormatStrFormatter
 import numpy as np
 import os
@@ -21,9 +21,82 @@ import pandas as pd
 from pandas.plotting import register_matplotlib_converters
 import sys
 
-def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None, titlestr=None, flag=None, timebegin=None, timeend=None, timemarker=None, hour_interval=3, time_freq='D'):
+from . import cloudbase
+from . import decimation
+from . import hobo_io
+from . import instrument
+from . import precip
+from . import qc
+from . import store
+from . import syn_sheets
+
+# cloud glyph used in the synoptic observation plot: path codes and vertices relative
+# to the glyph position, x in units of the glyph width and y of the glyph height
+Path = mpath.Path
+CLOUD_CODES = [Path.MOVETO, Path.LINETO, Path.CURVE4, Path.CURVE4, Path.CURVE4, Path.LINETO,
+               Path.CURVE4, Path.CURVE4, Path.CURVE4, Path.LINETO, Path.CURVE4, Path.CURVE4,
+               Path.CURVE4, Path.LINETO, Path.CURVE4, Path.CURVE4, Path.CURVE4, Path.LINETO, Path.CLOSEPOLY]
+CLOUD_TEMPLATE = np.array([[0, 0], [-1, 0], [-2, 2], [-2, 10], [-1/1.3, 7], [-1/1.3, 7],
+                           [-1.5, 12], [-0.2, 17], [0, 10], [0, 10], [0.2, 17], [1.5, 12],
+                           [1/1.3, 7], [1/1.3, 7], [2, 10], [2, 2], [1, 0], [0, 0], [0, 0]])
+
+def cloud_glyph_paths(x, y, width, height):
+    """
+    Returns cloud glyph paths at the positions x, y scaled by width and height (all arrays
+    of the same length) computed in one array operation from CLOUD_TEMPLATE, as well as
+    the boolean array of valid glyphs (glyphs with nan coordinates are omitted).
+    """
+    verts = np.empty((len(x), len(CLOUD_TEMPLATE), 2))
+    verts[:, :, 0] = x[:, None] + CLOUD_TEMPLATE[None, :, 0]*width[:, None]
+    verts[:, :, 1] = y[:, None] + CLOUD_TEMPLATE[None, :, 1]*height[:, None]
+    valid = np.all(np.isfinite(verts), axis=(1, 2))
+    return [mpath.Path(v, CLOUD_CODES) for v in verts[valid]], valid
+
+def save_daily_figures(fig, series, title, filename, titlestr=None, decimate=True):
+    """
+    Saves one figure per day (FILENAME_YYYYMMDD.EXT) of an existing figure: for each day
+    the lines are given the data of that day, the x-limits, y-limits of autoscaled axes
+    and the title are updated, no artists are recreated.
+    series: list of (line, time, y) with the full data of each line, title: title text artist
+    decimate: decimate the data of each day (see decimation.set_series)
+    """
+    root, ext = os.path.splitext(filename)
+    start = min(time[0] for line, time, y in series).floor('D')
+    end = max(time[-1] for line, time, y in series)
+    filenames = []
+    for day in pd.date_range(start, end, freq='D'):
+        next_day = day + pd.Timedelta('1D')
+        n_values = 0
+        for line, time, y in series:
+            i0, i1 = time.searchsorted(day), time.searchsorted(next_day)
+            decimation.set_series(line, time[i0:i1], y[i0:i1], decimate=decimate)
+            n_values += i1 - i0
+        if n_values == 0:
+            continue
+
+        for ax in fig.axes:
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+            ax.set_xlim([day, next_day])
+        if not titlestr:
+            title.set_text("".join(['HOBO time series from ', day.strftime('%d.%m.%Y - %H:%M'), ' to ', next_day.strftime('%d.%m.%Y - %H:%M')]))
+        else:
+            title.set_text("".join([titlestr, ' ', day.strftime('%d.%m.%Y')]))
+        filenames.append("".join([root, '_', day.strftime('%Y%m%d'), ext]))
+        with instrument.span('savefig', file=filenames[-1]):
+            fig.savefig(filenames[-1])
+    return filenames
+
+@instrument.traced('plot')
+def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None, titlestr=None, flag=None, timebegin=None, timeend=None, timemarker=None, hour_interval=3, time_freq='D', n_workers=None, decimate=True, quality_control=False, bucket_resolution=precip.BUCKET_RESOLUTION, daily=False, from_store=False, frame=None, date=None):
     # define some methods
     register_matplotlib_converters()
+    series = [] # hobo lines with their full data, redrawn for each day if daily
+    def plot_series(ax, time, y, *args, **kwargs):
+        lines = decimation.plot_series(ax, time, y, *args, decimate=decimate, **kwargs)
+        series.append((lines[0], time, y))
+        return lines
+
     def set_visuals(ax, pl, spine_location):
         # set all kinds of visuals to correspond to the line color
         ax.yaxis.label.set_color(pl.get_color())
@@ -46,6 +119,10 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
             dt2 = (time[1]-time[0])/2
             ax.set_xlim([time[0]-dt2, time[-1]+dt2])
             h_fmt = mdates.DateFormatter('%H')
+            # hours only on the axis, the date goes into the label (unless unknown, 1900-01-01)
+            if time[0].year > 1900:
+                first, last = time[0].strftime('%d.%m.%Y'), time[-1].strftime('%d.%m.%Y')
+                ax.set_xlabel('time UTC, %s' % (first if first == last else " - ".join([first, last])))
         ax.xaxis.set_major_locator(hours)
         ax.xaxis.set_major_formatter(h_fmt)
         return None
@@ -70,54 +147,29 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
     # timeseries from hobo csv file
     if plotroutine == 'hobo_single':
-        df = pd.read_excel(os.path.join('data', 'excel', excel_filename), skiprows=1)
-
-        # fix column header from hobo file output (remove serial num)
-        for i, x in enumerate(df.columns):
-            newstr = x.split(' ')
-            df.columns.values[i] = " ".join(newstr[:2]).strip(',')
+        # read (cached) data, measurements as float32 arrays
+        if frame is not None:
+            # hobo frame given directly (e.g. the buffers of the live feed)
+            df = frame
+        elif from_store:
+            # excel_filename is the station name in the campaign store
+            df = store.query('hobo', stations=[excel_filename], start=timebegin, end=timeend)
+        else:
+            df = hobo_io.load_hobo(excel_filename)
+        if quality_control:
+            # remove values flagged by the quality control
+            df = qc.mask_flagged(df, qc.qc_flags(df))
+        time = df.index
 
         # get important data
-        # include time meta for old and new versions
-        if isinstance(df['Datum Zeit'].values[0], str):
-            time_vec = df['Datum Zeit'].values
-        elif isinstance(df['Datum Zeit'].values[0], np.datetime64):
-            time = pd.to_datetime(df['Datum Zeit'].values)
-            new_time_vec = []
-            for i in range(len(time)):
-                new_time = time[i].strftime('%d.%m.%Y %H:%M:%S')
-                new_time_vec.append(new_time)
-            time_vec = np.array(new_time_vec)
-
-        # check if data from excel file uses a , or . as decimal
-        if isinstance(df['Windgeschwindigkeit, m/s'].values[0], float):
-            v_spd = np.array([v for v in df['Windgeschwindigkeit, m/s'].values], dtype=float) # m/s
-            v_spd_boeen = np.array([vb for vb in df['Böengeschwindigkeit, m/s'].values], dtype=float) # m/s
-            v_dir = np.array([vd for vd in df['Windrichtung, ø'].values], dtype=float) # deg
-            T = np.array([t for t in df['Temp., °C'].values], dtype=float) # deg C
-            RH = np.array([rh for rh in df['RH, %'].values], dtype=float) # %
-            p = np.array([pp for pp in df['Druck, mbar'].values], dtype=float) # hPa
-            try:
-                sun_rad = np.array([l for l in df['Sonnenstrahlung, W/m²'].values], dtype=float) # W/m2
-            except:
-                pass
-        else:
-            v_spd = np.array([float(v.replace(',', '.')) for v in df['Windgeschwindigkeit, m/s'].values], dtype=float) # m/s
-            v_spd_boeen = np.array([float(vb.replace(',', '.')) for vb in df['Böengeschwindigkeit, m/s'].values], dtype=float) # m/s
-            v_dir = np.array([float(vd.replace(',', '.')) for vd in df['Windrichtung, ø'].values], dtype=float) # deg
-            T = np.array([float(t.replace(',', '.')) for t in df['Temp., °C'].values], dtype=float) # deg C
-            RH = np.array([float(rh.replace(',', '.')) for rh in df['RH, %'].values], dtype=float) # %
-            p = np.array([float(pp.replace(',', '.')) for pp in df['Druck, mbar'].values], dtype=float) # hPa
-            try:
-                sun_rad = np.array([float(l.replace(',', '.')) for l in df['Sonnenstrahlung, W/m²'].values], dtype=float) # W/m2
-            except:
-                pass
-
-        # read into dataframe from csv file
-        if len(time_vec[0]) > 18:
-            time = [datetime.strptime(tt, '%d.%m.%Y %H:%M:%S') for tt in time_vec]
-        else:
-            time = [datetime.strptime(tt, '%d.%m.%y %H:%M:%S') for tt in time_vec]
+        v_spd = df['wind_spd'].values # m/s
+        v_spd_boeen = df['wind_gusts'].values # m/s
+        v_dir = df['wind_dir'].values # deg
+        T = df['temp'].values # deg C
+        RH = df['rel_hum'].values # %
+        p = df['pres'].values # hPa
+        if 'radiation' in df.columns:
+            sun_rad = df['radiation'].values # W/m2
 
         # create figure
         fig, ax = plt.subplots(figsize=(12, 6))
@@ -132,7 +184,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                     y = v_spd
 
                     # plotting
-                    p1, = ax.plot(time, y, 'cyan', label='wind speed')
+                    p1, = plot_series(ax, time, y, 'cyan', label='wind speed')
                     ax.set_ylabel('wind speed [m/s]')
                     set_visuals(ax, p1, 'left')
                     pls.append(p1)
@@ -141,7 +193,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                     y = v_spd_boeen
 
                     # plotting
-                    p2, = ax.plot(time, y, 'magenta', label='wind gusts')
+                    p2, = plot_series(ax, time, y, 'magenta', label='wind gusts')
                     ax.set_ylabel('wind speed [m/s]')
                     pls.append(p2)
 
@@ -149,7 +201,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                     y = v_dir
 
                     # plotting
-                    p3, = axr1.plot(time, y, 'k*', label='wind direction')
+                    p3, = plot_series(axr1, time, y, 'k*', label='wind direction')
                     axr1.set_ylabel('wind direction [°]')
                     axr1.set_ylim([0, 360])
                     axr1.set_yticks(np.arange(0,361,45))
@@ -166,11 +218,11 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                         axr2.spines['right'].set_position(('axes', 1.1))
                         axr2.spines['right'].set_visible(True)
 
-                        p4, = axr2.plot(time, y, 'r', label='temperature')
+                        p4, = plot_series(axr2, time, y, 'r', label='temperature')
                         axr2.set_ylabel('temperature [°C]')
                         set_visuals(axr2, p4, 'right')
                     else:
-                        p4, = axr1.plot(time, y, 'r', label='temperature')
+                        p4, = plot_series(axr1, time, y, 'r', label='temperature')
                         axr1.set_ylabel('temperature [°C]')
                         set_visuals(axr1, p4, 'right')
                     pls.append(p4)
@@ -186,7 +238,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                                 axr3.spines['right'].set_position(('axes', 1.2))
                                 axr3.spines['right'].set_visible(True)
 
-                                p5, = axr3.plot(time, y, 'g', label='relative humidity')
+                                p5, = plot_series(axr3, time, y, 'g', label='relative humidity')
                                 axr3.set_ylabel('relative humidity [%]')
                                 axr3.set_ylim([35, 100])
                                 set_visuals(axr3, p5, 'right')
@@ -195,12 +247,12 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                             axr2.spines['right'].set_position(('axes', 1.1))
                             axr2.spines['right'].set_visible(True)
 
-                            p5, = axr2.plot(time, y, 'g', label='relative humidity')
+                            p5, = plot_series(axr2, time, y, 'g', label='relative humidity')
                             axr2.set_ylabel('relative humidity [%]')
                             axr2.set_ylim([35, 100])
                             set_visuals(axr2, p5, 'right')
                     else:
-                        p5, = axr1.plot(time, y, 'g', label='relative humidity')
+                        p5, = plot_series(axr1, time, y, 'g', label='relative humidity')
                         axr1.set_ylabel('relative humidity [%]')
                         axr1.set_ylim([35, 100])
                         set_visuals(axr1, p5, 'right')
@@ -219,11 +271,11 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                         axl2.spines['left'].set_position(('axes', -0.1))
                         axl2.spines['left'].set_visible(True)
 
-                        p6, = axl2.plot(time, y, 'b', label='pressure')
+                        p6, = plot_series(axl2, time, y, 'b', label='pressure')
                         axl2.yaxis.set_major_formatter(FormatStrFormatter('%.1f'))
                         set_visuals(axl2, p6, 'left')
                     else:
-                        p6, = ax.plot(time, y, 'b', label='pressure')
+                        p6, = plot_series(ax, time, y, 'b', label='pressure')
                         ax.set_ylabel('air pressure [hPa]')
                         ax.yaxis.set_major_formatter(FormatStrFormatter('%.1f'))
                         set_visuals(ax, p6, 'left')
@@ -244,7 +296,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                                 axl3.spines['left'].set_position(('axes', -0.22))
                                 axl3.spines['left'].set_visible(True)
 
-                                p7, = axl3.plot(time, y, 'y', label='radiation')
+                                p7, = plot_series(axl3, time, y, 'y', label='radiation')
                                 set_visuals(axl3, p7, 'left')
                         except:
                             axl2.yaxis.tick_left()
@@ -254,19 +306,19 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
                             axl2.spines['left'].set_position(('axes', -0.1))
                             axl2.spines['left'].set_visible(True)
 
-                            p7, = axl2.plot(time, y, 'y', label='radiation')
+                            p7, = plot_series(axl2, time, y, 'y', label='radiation')
                             set_visuals(axl2, p7, 'left')
                     else:
                         ax.set_ylabel('sun radiation [W/m2]')
-                        p7, = ax.plot(time, y, 'y', label='radiation')
+                        p7, = plot_series(ax, time, y, 'y', label='radiation')
                         set_visuals(ax, p7, 'left')
                     pls.append(p7)
 
         # set title
         if not titlestr:
-            plt.title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
+            title = plt.title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
         else:
-            plt.title(titlestr)
+            title = plt.title(titlestr)
         # set time/x-axis and legend
         set_time_axis(ax, time, withDate=True)
         labels = [pl.get_label() for pl in pls]
@@ -275,54 +327,42 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
         # save figure
         print('Saving figure ...')
-        plt.savefig(os.path.join(fig_dir, figurename))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, figurename))
+        if daily:
+            save_daily_figures(fig, series, title, os.path.join(fig_dir, figurename), titlestr=titlestr, decimate=decimate)
+        plt.close(fig)
 
     if plotroutine == 'hobo_multi':
         # height correction for stations: dp = -g * rho * dz
-        station_heights = {'Campingplatz': 771,
-                         'Lanzenkreuz': 791,
-                         'Seetal': 842,
-                         'Stübming': 824,
-                         'UnterDerLanzen': 733}
+        station_heights = hobo_io.STATION_HEIGHTS
         metrs = []
         for num, itm in enumerate(station_heights.items()):
             metrs.append(itm[1])
         avg_height = np.mean(metrs)
 
-        # read into dataframe from csv file
+        # read (cached) data of all stations into one compact frame (in parallel)
         id = []
-        dflist = []
         dplist = []
+        if from_store and not isinstance(excel_filename, dict):
+            # station name or list of station names in the campaign store
+            if isinstance(excel_filename, str):
+                excel_filename = [excel_filename]
+            excel_filename = dict.fromkeys(excel_filename)
         for index, item in enumerate(excel_filename.items()):
             height_corr = station_heights[item[0]] - avg_height
             dp = -9.81*1.1*height_corr
             id.append(item[0])
-            df = pd.read_excel(os.path.join('data', 'excel', item[1]), skiprows=1)
-            # fix column header from hobo file output (remove serial num)
-            for i, x in enumerate(df.columns):
-                newstr = x.split(' ')
-                df.columns.values[i] = " ".join(newstr[:2]).strip(',')
-
-            dflist.append(df)
             dplist.append(dp)
-
-        def get_time_vec(df):
-            # include time meta for old and new versions
-            if isinstance(df['Datum Zeit'].values[0], str):
-                time_vec = df['Datum Zeit'].values
-            elif isinstance(df['Datum Zeit'].values[0], np.datetime64):
-                time = pd.to_datetime(df['Datum Zeit'].values)
-                new_time_vec = []
-                for i in range(len(time)):
-                    new_time = time[i].strftime('%d.%m.%Y %H:%M:%S')
-                    new_time_vec.append(new_time)
-                time_vec = np.array(new_time_vec)
-
-            if len(time_vec[0]) > 18:
-                time = [datetime.strptime(tt, '%d.%m.%Y %H:%M:%S') for tt in time_vec]
-            else:
-                time = [datetime.strptime(tt, '%d.%m.%y %H:%M:%S') for tt in time_vec]
-            return time
+        if from_store:
+            # the station names are looked up in the campaign store
+            network = store.query('hobo', stations=id, start=timebegin, end=timeend)
+        else:
+            network = hobo_io.load_hobo_network(excel_filename, n_workers=n_workers)
+        if quality_control:
+            # remove values flagged by the quality control
+            network = qc.mask_flagged(network, qc.qc_flags(network))
+        dflist = [network[network['station'] == station] for station in id]
 
         # create figure
         # 1) wind gusts, wind speed, wind direction comparison
@@ -340,33 +380,24 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         for ind, df in enumerate(dflist):
             colr = colrs[ind]
             lab = id[ind]
-            time = get_time_vec(df)
-            if isinstance(df['Windgeschwindigkeit, m/s'].values[0], float):
-                v_spd = [v for v in df['Windgeschwindigkeit, m/s'].values] # m/s
-            else:
-                v_spd = [float(v.replace(',', '.')) for v in df['Windgeschwindigkeit, m/s'].values] # m/s
+            time = df.index
+            v_spd = df['wind_spd'].values # m/s
             y = v_spd
-            p, = ax.plot(time, y, color=colr, label=lab)
+            p, = plot_series(ax, time, y, color=colr, label=lab)
             ax.set_ylabel('wind speed [m/s]')
             pls.append(p)
 
 
             if switch == 1:
-                if isinstance(df['Böengeschwindigkeit, m/s'].values[0], float):
-                    v_spd_boeen = [vb for vb in df['Böengeschwindigkeit, m/s'].values] # m/s
-                else:
-                    v_spd_boeen = [float(vb.replace(',', '.')) for vb in df['Böengeschwindigkeit, m/s'].values] # m/s
+                v_spd_boeen = df['wind_gusts'].values # m/s
                 y = v_spd_boeen
-                ax3.plot(time, y, '--', color=colr)
+                plot_series(ax3, time, y, '--', color=colr)
                 ax3.set_ylabel('wind gusts [m/s]')
                 ax3.grid(True)
 
-            if isinstance(df['Windrichtung, ø'].values[0], float):
-                v_dir = [vd for vd in df['Windrichtung, ø'].values] # deg
-            else:
-                v_dir = [float(vd.replace(',', '.')) for vd in df['Windrichtung, ø'].values] # deg
+            v_dir = df['wind_dir'].values # deg
             y = v_dir
-            ax2.plot(time, y, '*', color=colr)
+            plot_series(ax2, time, y, '*', color=colr)
             ax2.set_ylabel('wind direction [°]')
             ax2.set_ylim([0, 360])
             ax2.set_yticks(np.arange(0,361,45))
@@ -374,9 +405,9 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
         # set title
         if not titlestr:
-            ax.set_title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
+            title = ax.set_title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
         else:
-            ax.set_title(titlestr)
+            title = ax.set_title(titlestr)
 
         # set time/x-axis and legend
         set_time_axis_compare(ax, time)
@@ -393,10 +424,15 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
             savename = 'wind_speed_direction_gusts.png'
         else:
             savename = 'wind_speed_direction.png'
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, savename])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, savename])))
+        if daily:
+            save_daily_figures(fig, series, title, os.path.join(fig_dir, "".join([figurename, savename])), titlestr=titlestr, decimate=decimate)
+        plt.close(fig)
 
 
         # create figure
+        del series[:]
         # 2) Temperature, RH, pressure
         for i, flags in enumerate(flag.items()):
             if flags[0] == 'pressure':
@@ -412,45 +448,36 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         for ind, df in enumerate(dflist):
             colr = colrs[ind]
             lab = id[ind]
-            time = get_time_vec(df)
+            time = df.index
 
-            if isinstance(df['Temp., °C'].values[0], float):
-                T = [t for t in df['Temp., °C'].values] # deg C
-            else:
-                T = [float(t.replace(',', '.')) for t in df['Temp., °C'].values] # deg C
+            T = df['temp'].values # deg C
             y = T
-            p, = ax.plot(time, y, color=colr, label=lab)
+            p, = plot_series(ax, time, y, color=colr, label=lab)
             ax.set_ylabel('temperature [°C]')
             pls.append(p)
 
-            if isinstance(df['RH, %'].values[0], float):
-                RH = [rh for rh in df['RH, %'].values] # %
-            else:
-                RH = [float(rh.replace(',', '.')) for rh in df['RH, %'].values] # %
+            RH = df['rel_hum'].values # %
             y = RH
-            ax2.plot(time, y, '--', color=colr)
+            plot_series(ax2, time, y, '--', color=colr)
             ax2.set_ylabel('relative humidity [%]')
             ax2.set_ylim([35, 100])
 
             if switch == 1:
-                if isinstance(df['Druck, mbar'].values[0], float):
-                    p = [pp for pp in df['Druck, mbar'].values] # hPa
-                else:
-                    p = [float(pp.replace(',', '.')) for pp in df['Druck, mbar'].values] # hPa
+                p = df['pres'].values # hPa
                 y = p
                 dp = dplist[ind]
                 # station height, density and gravitational acceleration need to be verified
                 # and calculated with higher precision before applying the correction succesfully
                 #ax3.plot(time, y-dp/100, '-.', color=colr)
-                ax3.plot(time, y, '-.', color=colr)
+                plot_series(ax3, time, y, '-.', color=colr)
                 ax3.set_ylabel('pressure [hPa]')
                 ax3.grid(True)
 
         # set title
         if not titlestr:
-            ax.set_title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
+            title = ax.set_title("".join(['HOBO time series from ', time[0].strftime('%d.%m.%Y - %H:%M'), ' to ', time[-1].strftime('%d.%m.%Y - %H:%M')]))
         else:
-            ax.set_title(titlestr)
+            title = ax.set_title(titlestr)
 
         # set time/x-axis and legend
         set_time_axis_compare(ax, time)
@@ -466,46 +493,20 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
             savename = 'temp_rh_pressure.png'
         else:
             savename = 'temp_rh.png'
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, savename])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, savename])))
+        if daily:
+            save_daily_figures(fig, series, title, os.path.join(fig_dir, "".join([figurename, savename])), titlestr=titlestr, decimate=decimate)
+        plt.close(fig)
 
 
     elif plotroutine == 'hobo_precip':
-        # read into dataframe from excel file
-        df = pd.read_excel(os.path.join('data', 'excel', excel_filename), skiprows=1)
-
-        # fix column header from hobo file output (remove serial num)
-        for i, x in enumerate(df.columns):
-            newstr = x.split(' ')
-            df.columns.values[i] = " ".join(newstr[:2]).strip(',')
-
-        # get important data
-        # include time meta for old and new versions
-        if isinstance(df['Datum Zeit'].values[0], str):
-            time_vec = df['Datum Zeit'].values
-        elif isinstance(df['Datum Zeit'].values[0], np.datetime64):
-            time = pd.to_datetime(df['Datum Zeit'].values)
-            new_time_vec = []
-            for i in range(len(time)):
-                new_time = time[i].strftime('%d.%m.%Y %H:%M:%S')
-                new_time_vec.append(new_time)
-            time_vec = np.array(new_time_vec)
-
-        if len(time_vec[0]) > 18:
-            time = [datetime.strptime(tt, '%d.%m.%Y %H:%M:%S') for tt in time_vec]
-        else:
-            time = [datetime.strptime(tt, '%d.%m.%y %H:%M:%S') for tt in time_vec]
-
-        # accumulated ticks
-        precip_ticks = precip_ticks = df['Event, units'].values
-        precip_num = [np.float(str(ti).split(',')[0].replace(' ', '')) for ti in precip_ticks]
-
-        # diff and transform in precipitation mm
-        precip_amount = np.diff(precip_num)*0.2
-
-        new_pd_ticks = pd.Series(data=precip_ticks, index=time)
-        new_pd_series = pd.Series(data=precip_amount, index=time[:-1])
-        precip_hourly = new_pd_series.resample('H', label='right', closed='right').sum()
-        precip_3hourly = new_pd_series.resample('3H', label='right', closed='right').sum()
+        # cumulative precipitation and hourly/3-hourly sums
+        cum, sums = precip.load_precip(excel_filename, resolution=bucket_resolution, windows=('1h', '3h'))
+        time = cum.index
+        precip_num = cum.values/bucket_resolution # accumulated ticks
+        precip_hourly = sums['1h']
+        precip_3hourly = sums['3h']
 
         # create figure
         width_hourly = np.min(np.diff(mdates.date2num(precip_hourly.index)))
@@ -518,7 +519,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         ax3.grid(True)
         ax.plot(time, precip_num)
         ax.set_title('precipitation ticks')
-        ax.set_ylabel('precipitation ticks [0.2 mm]')
+        ax.set_ylabel('precipitation ticks [{:g} mm]'.format(bucket_resolution))
         ax2.bar(precip_hourly.index, precip_hourly, width=-width_hourly*0.9, align='edge')
         ax2.set_title('hourly precipitation')
         ax2.set_ylabel('hourly precipitation [mm/h]')
@@ -543,18 +544,18 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
         # save figure
         print('Saving figure ...')
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, 'precip.png'])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, 'precip.png'])))
+        plt.close(fig)
 
     # synoptic observations
     elif plotroutine == 'syn_observation':
-        # read into dataframe from csv file
-        df = pd.read_excel(os.path.join('data', 'excel', excel_filename))
+        # read into dataframe from excel file (columns checked and converted to float)
+        df = syn_sheets.load_sheet(excel_filename, 'syn_observation', date=date)
 
         ## get important data
         # time
-        timestr = df['UTC'].values
-        timestr_iter = [str(tt1) for tt1 in timestr]
-        time = [datetime.strptime(tt, '%H:%M:%S') for tt in timestr_iter]
+        time = pd.DatetimeIndex(df['time'])
 
         # assmann
         T_assmann = df['T_assmann'].values
@@ -659,101 +660,53 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         # difference between ticks on x-axis; used for positioning and horizontal scaling
         dx = (timeticks[1] - timeticks[0])/2
 
-        # add a path patch for the cloud structure
-        def create_cloud_patch(axis, x, dx, y, calpha, ctype, scaling_factor):
-            x = x-dx/3.
-            height_scaling = 150*0.3 + 150*0.7*scaling_factor/8. # used for scaling the patch vertically
-            dx = dx*0.3 + dx*0.7*scaling_factor/8.
-            Path = mpath.Path
-            # points and type of line path
-            path_data = [
-                (Path.MOVETO, [x, y]),
-                (Path.LINETO, [x-dx, y]),
-                (Path.CURVE4, [x-dx*2, y+height_scaling*2]),
-                (Path.CURVE4, [x-dx*2, y+height_scaling*10]),
-                (Path.CURVE4, [x-dx/1.3, y+height_scaling*7]),
-                (Path.LINETO, [x-dx/1.3, y+height_scaling*7]),
-                (Path.CURVE4, [x-dx*1.5, y+height_scaling*12]),
-                (Path.CURVE4, [x-dx*0.2, y+height_scaling*17]),
-                (Path.CURVE4, [x, y+height_scaling*10]),
-                (Path.LINETO, [x, y+height_scaling*10]),
-                (Path.CURVE4, [x+dx*0.2, y+height_scaling*17]),
-                (Path.CURVE4, [x+dx*1.5, y+height_scaling*12]),
-                (Path.CURVE4, [x+dx/1.3, y+height_scaling*7]),
-                (Path.LINETO, [x+dx/1.3, y+height_scaling*7]),
-                (Path.CURVE4, [x+dx*2, y+height_scaling*10]),
-                (Path.CURVE4, [x+dx*2, y+height_scaling*2]),
-                (Path.CURVE4, [x+dx, y]),
-                (Path.LINETO, [x, y]),
-                (Path.CLOSEPOLY, [0, 0])]
-            codes, verts = zip(*path_data)
-            path = mpath.Path(verts, codes)
-            patch = mpatches.PathPatch(path, FaceColor=[1*calpha, 1*calpha, 1*calpha])
-            axis.add_patch(patch)
-
-            # add text about the cloud type information (can be omitted)
-            #ptred = axis.text(x+dx/3, y+1400, int(ctype), FontSize=15, Color='m')
-            return None
-
-        # plots text about the cloudiness
-        def plot_cloudiness(axis, x, dx, y, cl, cl_low):
-            if np.isnan(cl):
-                cl_str = None
-            else:
-                cl_str = str(int(cl))+'/8'
-            axis.text(x-dx/1.7, -z[-1]/4., cl_str, FontSize=15, Color='k')
-
-            if np.isnan(cl_low):
-                cl_low = None
-            else:
-                cl_low = str(int(cl_low))
-            if y > 500:
-                axis.text(x-dx/3, y-500, cl_low, FontSize=15, Color='c')
-            else:
-                axis.text(x-dx/3, y, cl_low, FontSize=15, Color='c')
-            return None
-
-        # plot cloudiness text
-        for i in range(len(timeticks)):
-            if not (np.isnan(cloud_base[i]) or cloud_base[i]>4000):
-                plot_cloudiness(ax2, timeticks[i], dx, cloud_base[i], cloudiness[i], cloudiness_low[i])
-            else:
-                plot_cloudiness(ax2, timeticks[i], dx, -2000, cloudiness[i], np.nan)
-
-        # create low clouds
-        for i in range(len(clouds_low)):
-            if not np.isnan(clouds_low[i]):
-                create_cloud_patch(ax2, timeticks[i], dx, cloud_base[i], calpha=0.3, ctype=clouds_low[i], scaling_factor=cloudiness_low[i])
-
-        # create medium clouds
-        for i in range(len(clouds_medium)):
-            if not np.isnan(clouds_medium[i]):
-                if np.isnan(cloudiness_low[i]):
-                    scaling_low = 0
-                else:
-                    scaling_low = cloudiness_low[i]
-                create_cloud_patch(ax2, timeticks[i], dx, 4000, calpha=0.6, ctype=clouds_medium[i], scaling_factor=cloudiness[i]-scaling_low)
-
-        # create high clouds
-        for i in range(len(clouds_high)):
-            if not np.isnan(clouds_high[i]):
-                if np.isnan(cloudiness_low[i]):
-                    scaling_low = 0
-                else:
-                    scaling_low = cloudiness_low[i]
-                create_cloud_patch(ax2, timeticks[i], dx, 6000, calpha=0.85, ctype=clouds_high[i], scaling_factor=cloudiness[i]-scaling_low)
+        # cloud glyphs of all layers (low clouds at the cloud base, medium at 4000m, high at 6000m)
+        # glyph width and height scale with the cloudiness of the layer
+        def cloud_layer(clouds, y, calpha, scaling_factor):
+            present = ~np.isnan(clouds)
+            scaling_factor = np.asarray(scaling_factor, dtype=float)[present]
+            x = timeticks[:len(clouds)][present] - dx/3.
+            y = np.broadcast_to(np.asarray(y, dtype=float), clouds.shape)[present]
+            width = dx*0.3 + dx*0.7*scaling_factor/8.
+            height = 150*0.3 + 150*0.7*scaling_factor/8.
+            return x, y, width, height, np.full(len(x), calpha)
+
+        scaling_low = np.where(np.isnan(cloudiness_low), 0, cloudiness_low)
+        layers = [cloud_layer(clouds_low, cloud_base, 0.3, cloudiness_low),
+                  cloud_layer(clouds_medium, 4000, 0.6, cloudiness-scaling_low),
+                  cloud_layer(clouds_high, 6000, 0.85, cloudiness-scaling_low)]
+        x, y, width, height, calpha = [np.concatenate(v) for v in zip(*layers)]
+        paths, valid = cloud_glyph_paths(x, y, width, height)
+        calpha = calpha[valid]
+        ax2.add_collection(PathCollection(paths, facecolors=np.column_stack([calpha, calpha, calpha]), edgecolors='k', linewidths=1))
+
+        # text about the cloudiness: total cloudiness below the plot, low cloudiness at the cloud base
+        n = len(timeticks)
+        cl_total = np.asarray(cloudiness[:n], dtype=float)
+        y_low = np.asarray(cloud_base[:n], dtype=float)
+        with np.errstate(invalid='ignore'):
+            low_visible = ~(np.isnan(y_low) | (y_low > 4000))
+        cl_low = np.where(low_visible, cloudiness_low[:n], np.nan)
+        y_low = np.where(y_low > 500, y_low-500, y_low)
+
+        has_total = ~np.isnan(cl_total)
+        has_low = ~np.isnan(cl_low)
+        for xt, cl in zip(timeticks[:n][has_total]-dx/1.7, cl_total[has_total].astype(int)):
+            ax2.text(xt, -z[-1]/4., str(cl)+'/8', fontsize=15, color='k')
+        for xt, yt, cl in zip(timeticks[:n][has_low]-dx/3, y_low[has_low], cl_low[has_low].astype(int)):
+            ax2.text(xt, yt, str(cl), fontsize=15, color='c')
 
         # create descriptive text
         #ax2.text(timeticks[5], z[-1]*1.02, 'cloud type', FontSize=8, color='m', backgroundcolor=[0.9, 0.9, 0.9])
-        ax2.text(timeticks[0]-dx/1.7, -z[-1]/6, 'cloudiness total', FontSize=10, color='k')
-        ax2.text(timeticks[0]-dx*0.8, z[-1]*1.02, 'cloudiness low', FontSize=8, color='c', backgroundcolor=[0.9, 0.9, 0.9])
-        ax2.text(timeticks[0]-dx*0.8, z[-1]*1.15, 'T: drawn through; Td: dashed; RH: dotted', FontSize=8, color='k')
+        ax2.text(timeticks[0]-dx/1.7, -z[-1]/6, 'cloudiness total', fontsize=10, color='k')
+        ax2.text(timeticks[0]-dx*0.8, z[-1]*1.02, 'cloudiness low', fontsize=8, color='c', backgroundcolor=[0.9, 0.9, 0.9])
+        ax2.text(timeticks[0]-dx*0.8, z[-1]*1.15, 'T: drawn through; Td: dashed; RH: dotted', fontsize=8, color='k')
         #ax2.text(timeticks[0]+dx*0.9, z[-1]*1.02, 'visibility', FontSize=8, color='y', backgroundcolor=[0.9, 0.9, 0.9])
         #ax2.add_patch(mpatches.Rectangle((timeticks[0]-dx, z[-1]*0.99), dx*13, 700, FaceColor=[0.9, 0.9, 0.9], EdgeColor='k'))
 
         # set lims, labels, time axis properties
         ax2.set_ylim([0, 8001])
-        axr2.bar(timeticks+dx/3, visibility, width=0.005, fill=False, hatch='/', EdgeColor='y', linewidth=1.2)
+        axr2.bar(timeticks+dx/3, visibility, width=0.005, fill=False, hatch='/', edgecolor='y', linewidth=1.2)
         axr2.set_ylabel('horizontal visibility [km]', color='y')
         axr2.tick_params(axis='y', colors='y')
         ax2.set_ylabel('height above ground [m]')
@@ -762,22 +715,20 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
         # save figure
         print('Saving figure ...')
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, '.png'])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, '.png'])))
+        plt.close(fig)
 
         ## barplot height of cloud base
-        # approximation: spread * 125
-        cb_assmann = (T_assmann - TD_assmann) * 125
-        cb_davis = (T_davis - TD_davis) * 125
-        cb_kestrel = (T_kestrel - TD_kestrel) * 125
-        cb_davisstation = (T_davisstation - TD_davisstation) * 125
+        # approximation: spread * 125 for all instruments with T and Td
+        instruments, cb_estimate = cloudbase.estimate_cloud_base(df, method='spread')
+        cb_colors = {'assmann': 'r', 'davis': 'b', 'kestrel': 'g', 'davis-station': 'purple'}
 
         # plot bars
         fig, ax = plt.subplots(figsize=(12, 8))
         ax.bar(timeticks-dx/6*4, cloud_base, width=dx/3, color='y', align='center', label='observation')
-        ax.bar(timeticks-dx/6*2, cb_assmann, width=dx/3, color='r', align='center', label='assmann')
-        ax.bar(timeticks, cb_davis, width=dx/3, color='b', align='center', label='davis')
-        ax.bar(timeticks+dx/6*2, cb_kestrel, width=dx/3, color='g', align='center', label='kestrel')
-        ax.bar(timeticks+dx/6*4, cb_davisstation, width=dx/3, color='purple', align='center', label='davis-station')
+        for i, inst in enumerate(instruments):
+            ax.bar(timeticks+dx/6*(2*i-2), cb_estimate[i], width=dx/3, color=cb_colors.get(inst), align='center', label=inst)
         set_time_axis(ax, time, withDate=False, hour_interval=1)
         plt.title('Cloud base height')
         ax.set_ylabel('height [m]')
@@ -785,18 +736,18 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
 
         # save figure
         print('Saving figure ...')
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, '_cloudbase.png'])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, '_cloudbase.png'])))
+        plt.close(fig)
 
 
     # synoptic forecast
     elif plotroutine == 'syn_forecast':
-        df = pd.read_excel(os.path.join('data', 'excel', excel_filename))
+        df = syn_sheets.load_sheet(excel_filename, 'syn_forecast')
 
         ## get important data
         # time
-        timestr = df['UTC'].values
-        timestr_iter = [str(tt1) for tt1 in timestr]
-        time = [datetime.strptime(tt.split('.')[0], '%Y-%m-%dT%H:%M:%S') for tt in timestr_iter]
+        time = pd.DatetimeIndex(df['time'])
 
         # T_fcst = df['T_forecast [°C]'].values
         # Td_fcst = df['Td_forecast [°C]'].values
@@ -838,7 +789,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         # ra_fcst = df['rain_amount_forecast [mm/h]'].values
         # rp_fcst = df['rain_probability_forecast [%]'].values
         # cl_fcst = df['cloudiness_forecast'].values
-        clb_fcst = pd.to_numeric(df['cloud_base_forecast'].values)
+        clb_fcst = df['cloud_base_forecast'].values
         ra_fcst = df['rain_amount_forecast'].values
         rp_fcst = df['rain_probability_forecast'].values
 
@@ -894,7 +845,7 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         ax[3,1].plot(time, rp_vali, 'r')
 
         if timebegin is not None:
-            time = pd.date_range(datetime.strptime(timebegin, '%Y%m%d%H'), end=datetime.strptime(timeend, '%Y%m%d%H'), freq='H')
+            time = pd.date_range(datetime.strptime(timebegin, '%Y%m%d%H'), end=datetime.strptime(timeend, '%Y%m%d%H'), freq='h')
 
         if timemarker is not None:
             timemark = datetime.strptime(timemarker, '%Y%m%d%H')
@@ -904,12 +855,16 @@ def main(plotroutine=None, excel_filename=None, var_dict=None, figurename=None,
         set_time_axis_compare(ax[3,0], time, hour_interval=3)
         set_time_axis_compare(ax[3,1], time, hour_interval=3)
         print('Saving figure ...')
-        plt.savefig(os.path.join(fig_dir, "".join([figurename, '_new.png'])))
+        with instrument.span('savefig'):
+            plt.savefig(os.path.join(fig_dir, "".join([figurename, '_new.png'])))
+        plt.close(fig)
     return None
 
 if __name__ == '__main__':
+    # args from command line (python -m python.plotting_routines PLOTROUTINE EXCEL_FILE FIGURENAME),
+    # see feldprakt.py for all options
     plotroutine = sys.argv[1]
-    csv_file = sys.argv[2]
-    dict = sys.argv[3]
-    name = sys.argv[4]
-    main(plotroutine=plotroutine, csv_filename=csv_file, csv_file2=dict, figurename=name)
+    excel_file = sys.argv[2]
+    name = sys.argv[3]
+    var_dict = {'wind_spd': 1, 'wind_gusts': 1, 'wind_dir': 1, 'temp': 1, 'rel_hum': 1, 'pres': 1, 'radiation': 0}
+    main(plotroutine=plotroutine, excel_filename=excel_file, var_dict=var_dict, figurename=name)
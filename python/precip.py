@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 13:27:12 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 13:27:12 +0200
+"""
+Precipitation from HOBO tipping bucket loggers.
+The tip counter of the logger is converted into one cumulative precipitation series,
+from which sums over any accumulation window are derived by differencing the
+cumulative values at the window edges (windows are closed and labelled right,
+i.e. the value at 12:00 of the 1h window is the sum from 11:00 to 12:00).
+"""
+import errno
+import numpy as np
+import os
+import pandas as pd
+
+from . import hobo_io
+
+# precipitation per tip of the bucket in mm
+BUCKET_RESOLUTION = 0.2
+
+# default accumulation windows
+WINDOWS = ('10min', '1h', '3h', '6h', '24h')
+
+def tip_counts(events):
+    """ Returns the tip counter from the 'Event, units' column ('12,00' -> 12.), nan for other logger events. """
+    counts = pd.Series(events).astype(str).str.split(',').str[0].str.replace(' ', '')
+    return pd.to_numeric(counts, errors='coerce').values
+
+def cumulative_precip(df, resolution=BUCKET_RESOLUTION):
+    """
+    Returns the cumulative precipitation in mm (tip counter * resolution) as series indexed
+    by time, from a dataframe read by hobo_io.read_hobo_excel.
+    """
+    counts = tip_counts(df['Event, units'].values)
+    valid = np.isfinite(counts)
+    return pd.Series(counts[valid]*resolution, index=hobo_io.hobo_time(df)[valid], name='precip')
+
+def accumulate(cum, windows=WINDOWS):
+    """
+    Returns a dict window -> series of precipitation sums in mm for each window
+    (pandas offset strings), derived from the cumulative series cum.
+    """
+    cum = cum.sort_index()
+    time = cum.index.values
+    values = cum.values
+    sums = {}
+    for window in windows:
+        offset = pd.Timedelta(window)
+        edges = pd.date_range(cum.index[0].ceil(offset) - offset, cum.index[-1].ceil(offset), freq=offset)
+        # cumulative value at each edge: last value at or before the edge
+        idx = np.searchsorted(time, edges.values, side='right') - 1
+        cum_edges = np.where(idx >= 0, values[np.clip(idx, 0, None)], values[0])
+        sums[window] = pd.Series(np.diff(cum_edges), index=edges[1:], name=window)
+    return sums
+
+def load_precip(excel_filename, resolution=BUCKET_RESOLUTION, windows=WINDOWS):
+    """ Reads a hobo precipitation workbook, returns the cumulative series and the window sums. """
+    cum = cumulative_precip(hobo_io.read_hobo_excel(excel_filename), resolution=resolution)
+    return cum, accumulate(cum, windows=windows)
+
+def write_precip_csv(sums, name):
+    """ Writes the window sums into data/precip/NAME_WINDOW.csv and returns the filenames. """
+    precip_dir = os.path.join('data', 'precip')
+    try:
+        os.makedirs(precip_dir)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    filenames = []
+    for window, series in sums.items():
+        file_path = os.path.join(precip_dir, "".join([name, '_', window, '.csv']))
+        series.to_csv(file_path, header=['precipitation [mm]'], index_label='time UTC')
+        filenames.append(file_path)
+    return filenames
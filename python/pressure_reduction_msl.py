@@ -9,6 +9,27 @@
 import numpy as np
 import sys
 
+def reduce_pressure(p, T, Td, station_height, lat):
+    """
+    Vectorised barometric reduction of pressure p (hPa) to mean sea level,
+    works for scalars as well as numpy arrays of equal shape (see main for the units).
+    """
+    lat_rad = np.asarray(lat, dtype=float)*np.pi/180 # conversion to radian
+    station_height = np.asarray(station_height, dtype=float)
+
+    # mean values correspond to average between sea level and station height,
+    # which is used to reduce the pressure via the barometric formula
+    # g_corrected_station = 9.80616 * (1 - 0.0026373*np.cos(2*lat_rad) + 0.0000059*np.cos(2*lat_rad)**2) * (1 - 2*station_height/6371e3) # not needed
+    g_corrected_mean = 9.80616 * (1 - 0.0026373*np.cos(2*lat_rad) + 0.0000059*np.cos(2*lat_rad)**2) * (1 - station_height/6371e3)
+
+    # magnus formula
+    e = 6.11*np.exp(17.08*Td/(234.175 + Td))
+    q = 0.622*e/(p - 0.378*e)*1000
+    Tv_h = (1 + 0.609*q/1000) * (T+273.15) - 273.15
+    Tv_mean = Tv_h + 1./2*station_height*0.65/100
+    p_red = p * (np.exp(g_corrected_mean*station_height / (287 * (Tv_mean+273.15))))
+    return p_red
+
 def main(p, T, Td, station_height, lat):
     """
     Returns reduced pressure based on pressure, temperature, dew-point temperature,
@@ -27,19 +48,8 @@ def main(p, T, Td, station_height, lat):
     T = float(T)
     Td = float(Td)
     station_height = float(station_height)
-    lat_rad = float(lat)*np.pi/180 # conversion to radian
-
-    # mean values correspond to average between sea level and station height,
-    # which is used to reduce the pressure via the barometric formula
-    # g_corrected_station = 9.80616 * (1 - 0.0026373*np.cos(2*lat_rad) + 0.0000059*np.cos(2*lat_rad)**2) * (1 - 2*station_height/6371e3) # not needed
-    g_corrected_mean = 9.80616 * (1 - 0.0026373*np.cos(2*lat_rad) + 0.0000059*np.cos(2*lat_rad)**2) * (1 - station_height/6371e3)
 
-    # magnus formula
-    e = 6.11*np.exp(17.08*Td/(234.175 + Td))
-    q = 0.622*e/(p - 0.378*e)*1000
-    Tv_h = (1 + 0.609*q/1000) * (T+273.15) - 273.15
-    Tv_mean = Tv_h + 1./2*station_height*0.65/100
-    p_red = p * (np.exp(g_corrected_mean*station_height / (287 * (Tv_mean+273.15))))
+    p_red = float(reduce_pressure(p, T, Td, station_height, float(lat)))
     print(f'Reduced pressure for station: h = {station_height}m, lat = {lat}° is: p_red = {p_red} hPa')
     return p_red
 
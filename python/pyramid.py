@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 21:40:12 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 21:40:12 +0200
+"""
+Multi-resolution pyramid of a station time series for zooming from a whole season down to
+single minutes: minimum, maximum and mean of every variable in bins of 1 min, 10 min, 1 h and
+1 day, built once per station (each level from the one below) and cached in data/cache/pyramid.
+query returns the finest level which still fits the requested time window into the given
+number of pixels, so drawing costs the same at every zoom level:
+
+    levels = pyramid.load_pyramid('hobo_seetal.xlsx')
+    level, frame = pyramid.query(levels, 'temp', start, end, width=1200)
+
+view serves an interactive viewer (zoom with the mouse wheel, pan by dragging) on localhost:
+
+    python feldprakt.py view hobo_seetal.xlsx
+"""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import urllib.parse
+import numpy as np
+import pandas as pd
+
+from . import hobo_io
+
+# level name -> bin size (pandas offset), from fine to coarse
+LEVELS = (('1min', '1min'), ('10min', '10min'), ('1h', '60min'), ('1d', '1D'))
+PYRAMID_DIR = os.path.join(hobo_io.cache_dir, 'pyramid')
+HOST = '127.0.0.1'
+PORT = 8767
+WIDTH = 1200 # default number of pixels of a query
+
+def aggregate(frame, rule):
+    """ First level from the raw frame: columns VAR:min, VAR:max, VAR:mean and VAR:count per bin, empty bins are dropped. """
+    resampler = frame.resample(rule)
+    counts = resampler.count()
+    columns = {}
+    for stat, values in (('min', resampler.min()), ('max', resampler.max()), ('mean', resampler.mean()), ('count', counts)):
+        for variable in frame.columns:
+            columns[':'.join([variable, stat])] = values[variable].values.astype(float)
+    level = pd.DataFrame(columns, index=counts.index)
+    return level[counts.values.sum(axis=1) > 0]
+
+def coarsen(level, rule):
+    """ Next coarser level from a level: min of the minima, max of the maxima, count weighted mean. """
+    variables = [col[:-len(':count')] for col in level.columns if col.endswith(':count')]
+    sums = pd.DataFrame({variable: level[variable + ':mean'].values*level[variable + ':count'].values
+                         for variable in variables}, index=level.index).fillna(0).resample(rule).sum()
+    counts = level[[variable + ':count' for variable in variables]].resample(rule).sum()
+    minima = level[[variable + ':min' for variable in variables]].resample(rule).min()
+    maxima = level[[variable + ':max' for variable in variables]].resample(rule).max()
+    columns = {}
+    for variable in variables:
+        count = counts[variable + ':count'].values
+        columns[variable + ':min'] = minima[variable + ':min'].values
+        columns[variable + ':max'] = maxima[variable + ':max'].values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns[variable + ':mean'] = np.where(count > 0, sums[variable].values/count, np.nan)
+        columns[variable + ':count'] = count
+    coarse = pd.DataFrame(columns, index=counts.index)
+    return coarse[counts.values.sum(axis=1) > 0]
+
+def build(frame):
+    """ Returns the pyramid of a frame (float columns indexed by time): dict level name -> level frame. """
+    frame = frame[[col for col in frame.columns if pd.api.types.is_float_dtype(frame[col])]].astype(float)
+    levels = {}
+    level = None
+    for name, rule in LEVELS:
+        level = aggregate(frame, rule) if level is None else coarsen(level, rule)
+        levels[name] = level
+    levels['raw'] = frame
+    return levels
+
+def load_pyramid(excel_filename=None, station=None):
+    """
+    Returns the pyramid of a hobo workbook (cached in PYRAMID_DIR, rebuilt if the hobo cache
+    is newer) or of a station of the campaign store (built on every call).
+    """
+    if excel_filename is None:
+        from . import store
+        frame = store.query('hobo', stations=[station])
+        return build(frame.drop(columns=['source', 'station']))
+
+    frame = hobo_io.load_hobo(excel_filename)
+    hobo_cache = os.path.join(hobo_io.hobo_cache_path(excel_filename), 'values.npy')
+    path = os.path.join(PYRAMID_DIR, os.path.splitext(excel_filename)[0])
+    cached = [os.path.join(path, name, 'values.npy') for name, _ in LEVELS]
+    if all(os.path.isfile(fn) and os.path.getmtime(fn) >= os.path.getmtime(hobo_cache) for fn in cached):
+        levels = {name: hobo_io.read_columns(os.path.join(path, name)) for name, _ in LEVELS}
+    else:
+        levels = build(frame)
+        for name, _ in LEVELS:
+            hobo_io.write_columns(levels[name], os.path.join(path, name))
+    levels['raw'] = frame
+    return levels
+
+def query(levels, variable, start=None, end=None, width=WIDTH):
+    """
+    Returns (level name, frame with the columns min, max and mean) of variable between start
+    and end, from the finest level with at most width bins in this window ('raw' if the raw
+    data fits, its min, max and mean are the values themselves).
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    for name in ['raw'] + [name for name, _ in LEVELS]:
+        level = levels[name]
+        i0 = 0 if start is None else level.index.searchsorted(start)
+        i1 = len(level) if end is None else level.index.searchsorted(end, side='right')
+        if i1 - i0 <= width or name == LEVELS[-1][0]:
+            break
+    # one bin more on each side, so lines continue to the edges of the window
+    window = level.iloc[max(i0 - 1, 0):i1 + 1]
+    if name == 'raw':
+        values = window[variable].values.astype(float)
+        return name, pd.DataFrame({'min': values, 'max': values, 'mean': values}, index=window.index)
+    return name, pd.DataFrame({stat: window[':'.join([variable, stat])].values.astype(float) for stat in ('min', 'max', 'mean')},
+                              index=window.index)
+
+def variables(levels):
+    return list(levels['raw'].columns)
+
+def query_json(levels, variable, start=None, end=None, width=WIDTH):
+    """ query as json serialisable dict (times in ms since 1970, NaN as None), used by the viewer. """
+    name, frame = query(levels, variable, start=start, end=end, width=width)
+    data = {'level': name, 'variable': variable,
+            'time': (np.asarray(frame.index.values, dtype='datetime64[ms]').astype(np.int64)).tolist()}
+    for stat in ('min', 'max', 'mean'):
+        data[stat] = [None if np.isnan(value) else round(float(value), 4) for value in frame[stat].values]
+    return data
+
+VIEWER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title>
+<style>body {font-family: sans-serif; margin: 10px} canvas {border: 1px solid #ccc; cursor: grab}</style>
+</head><body>
+<h3>%(title)s</h3>
+<select id="variable">%(options)s</select> <span id="info"></span>
+<p><canvas id="plot" width="%(width)d" height="450"></canvas></p>
+<p>mouse wheel: zoom, drag: pan, double click: whole series</p>
+<script>
+var full = [%(start)d, %(end)d], t0 = full[0], t1 = full[1], data = null, pending = null;
+var canvas = document.getElementById('plot'), ctx = canvas.getContext('2d');
+var select = document.getElementById('variable'), info = document.getElementById('info');
+var pad = {left: 70, right: 20, top: 10, bottom: 40};
+function xpos(t) { return pad.left + (t - t0)/(t1 - t0)*(canvas.width - pad.left - pad.right); }
+function tpos(x) { return t0 + (x - pad.left)/(canvas.width - pad.left - pad.right)*(t1 - t0); }
+function load() {
+  clearTimeout(pending);
+  pending = setTimeout(function() {
+    var url = 'data?variable=' + select.value + '&start=' + Math.floor(t0) + '&end=' + Math.ceil(t1) + '&width=' + (canvas.width - pad.left - pad.right);
+    fetch(url).then(function(r) { return r.json(); }).then(function(d) { data = d; draw(); });
+  }, 50);
+}
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  if (!data) return;
+  var lo = Infinity, hi = -Infinity, i;
+  for (i = 0; i < data.time.length; i++) {
+    if (data.min[i] !== null && data.min[i] < lo) lo = data.min[i];
+    if (data.max[i] !== null && data.max[i] > hi) hi = data.max[i];
+  }
+  if (lo === Infinity) { lo = 0; hi = 1; }
+  if (hi === lo) { hi += 0.5; lo -= 0.5; }
+  var h = canvas.height - pad.top - pad.bottom;
+  function ypos(v) { return pad.top + (hi - v)/(hi - lo)*h; }
+  ctx.save();
+  ctx.beginPath(); ctx.rect(pad.left, pad.top, canvas.width - pad.left - pad.right, h); ctx.clip();
+  // band between minimum and maximum, and the mean
+  ctx.fillStyle = 'rgba(255, 0, 0, 0.2)';
+  for (i = 0; i < data.time.length - 1; i++) {
+    if (data.min[i] === null) continue;
+    var x = xpos(data.time[i]), w = Math.max(xpos(data.time[i + 1]) - x, 1);
+    ctx.fillRect(x, ypos(data.max[i]), w, Math.max(ypos(data.min[i]) - ypos(data.max[i]), 1));
+  }
+  ctx.strokeStyle = 'red'; ctx.beginPath();
+  var drawing = false;
+  for (i = 0; i < data.time.length; i++) {
+    if (data.mean[i] === null) { drawing = false; continue; }
+    if (drawing) ctx.lineTo(xpos(data.time[i]), ypos(data.mean[i])); else ctx.moveTo(xpos(data.time[i]), ypos(data.mean[i]));
+    drawing = true;
+  }
+  ctx.stroke(); ctx.restore();
+  // axes
+  ctx.fillStyle = 'black'; ctx.strokeStyle = '#ccc'; ctx.font = '12px sans-serif';
+  for (i = 0; i <= 5; i++) {
+    var v = lo + i*(hi - lo)/5, y = ypos(v);
+    ctx.fillText(v.toFixed(1), 5, y + 4);
+    ctx.beginPath(); ctx.moveTo(pad.left, y); ctx.lineTo(canvas.width - pad.right, y); ctx.stroke();
+  }
+  for (i = 0; i <= 6; i++) {
+    var t = t0 + i*(t1 - t0)/6, label = new Date(t).toISOString().slice(0, 16).replace('T', ' ');
+    ctx.fillText(label, Math.min(xpos(t) - 40, canvas.width - 110), canvas.height - 15);
+  }
+  info.textContent = data.variable + ': level ' + data.level + ', ' + data.time.length + ' values';
+}
+canvas.addEventListener('wheel', function(e) {
+  e.preventDefault();
+  var t = tpos(e.offsetX), f = e.deltaY > 0 ? 1.25 : 0.8;
+  t0 = t - (t - t0)*f; t1 = t + (t1 - t)*f;
+  if (t1 - t0 < 60000) { t0 = t - 30000; t1 = t + 30000; }
+  draw(); load();
+});
+var drag = null;
+canvas.addEventListener('mousedown', function(e) { drag = {x: e.offsetX, t0: t0, t1: t1}; });
+window.addEventListener('mouseup', function() { drag = null; });
+canvas.addEventListener('mousemove', function(e) {
+  if (!drag) return;
+  var dt = (e.offsetX - drag.x)/(canvas.width - pad.left - pad.right)*(drag.t1 - drag.t0);
+  t0 = drag.t0 - dt; t1 = drag.t1 - dt; draw(); load();
+});
+canvas.addEventListener('dblclick', function() { t0 = full[0]; t1 = full[1]; load(); });
+select.addEventListener('change', load);
+load();
+</script></body></html>
+"""
+
+def viewer_html(levels, title, width=WIDTH):
+    index = levels['raw'].index
+    options = "".join('<option>%s</option>' % (variable) for variable in variables(levels))
+    start, end = [int(np.datetime64(t, 'ms').astype(np.int64)) for t in (index[0], index[-1])]
+    return VIEWER % {'title': title, 'options': options, 'width': width + 90, 'start': start, 'end': end}
+
+def view(levels, title='HOBO time series', port=PORT, width=WIDTH):
+    """ Serves the viewer of a pyramid on localhost until interrupted (ctrl+c). """
+    class Handler(BaseHTTPRequestHandler):
+        def answer(self, body, content_type):
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            if url.path == '/data':
+                params = dict(urllib.parse.parse_qsl(url.query))
+                if params.get('variable') not in variables(levels):
+                    self.send_error(400, 'unknown variable')
+                    return
+                start = pd.Timestamp(int(params['start']), unit='ms') if 'start' in params else None
+                end = pd.Timestamp(int(params['end']), unit='ms') if 'end' in params else None
+                data = query_json(levels, params['variable'], start=start, end=end, width=int(params.get('width', width)))
+                self.answer(json.dumps(data), 'application/json')
+            else:
+                self.answer(viewer_html(levels, title, width=width), 'text/html; charset=utf-8')
+
+        def log_message(self, format, *args):
+            return None
+
+    httpd = HTTPServer((HOST, port), Handler)
+    print('Viewer on http://%s:%d (ctrl+c to stop) ...' % (HOST, port))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print('Stopped viewer')
+    finally:
+        httpd.server_close()
+    return None
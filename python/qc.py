@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 12:34:50 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 12:34:50 +0200
+"""
+Quality control of hobo frames (see hobo_io.load_hobo / load_hobo_network).
+Each test sets a bit in a uint8 flag per value, the result of qc_flags is a
+frame with the same index as the data and one flag column per variable:
+
+    RANGE        value outside of the physically plausible range
+    STEP         spike/jump, deviation from the rolling median too large
+    PERSISTENCE  sensor stuck, no change at all over a rolling window
+    CONSISTENCY  anomaly differs too much from the other stations (network frames only)
+
+Flagged values can be removed via mask_flagged before plotting or statistics.
+"""
+import numpy as np
+import pandas as pd
+
+RANGE = 1
+STEP = 2
+PERSISTENCE = 4
+CONSISTENCY = 8
+ALL = RANGE | STEP | PERSISTENCE | CONSISTENCY
+
+# plausible range per variable
+RANGE_LIMITS = {'temp':         (-40, 45),  # deg C
+                'rel_hum':      (0, 100),   # %
+                'pres':         (700, 1050), # hPa
+                'wind_spd':     (0, 60),    # m/s
+                'wind_gusts':   (0, 75),    # m/s
+                'wind_dir':     (0, 360),   # deg
+                'radiation':    (0, 1400)}  # W/m2
+
+# maximum deviation from the rolling median
+STEP_LIMITS = {'temp':          4,
+               'rel_hum':       20,
+               'pres':          2,
+               'wind_spd':      15,
+               'wind_gusts':    25,
+               'radiation':     1000}
+step_window = '1h'
+
+# windows without any change are flagged (only for variables which are never constant for long)
+PERSISTENCE_WINDOWS = {'temp':      '2h',
+                       'rel_hum':   '6h',
+                       'pres':      '3h'}
+
+# maximum deviation of the station anomaly (value - station mean) from the network median anomaly
+CONSISTENCY_LIMITS = {'temp':       6,
+                      'rel_hum':    30,
+                      'pres':       3}
+
+def _per_station(frame, func):
+    """ Applies func (frame -> array of the same length) to each station separately. """
+    if 'station' not in frame.columns:
+        return np.asarray(func(frame))
+    codes = pd.Categorical(frame['station']).codes
+    out = np.empty(len(frame))
+    for code in np.unique(codes):
+        idx = np.flatnonzero(codes == code)
+        out[idx] = func(frame.iloc[idx])
+    return out
+
+def range_test(frame, variable):
+    lower, upper = RANGE_LIMITS[variable]
+    values = frame[variable].values
+    with np.errstate(invalid='ignore'):
+        return (values < lower) | (values > upper)
+
+def step_test(frame, variable, window=None):
+    window = window or step_window
+    median = _per_station(frame, lambda f: f[variable].rolling(window, min_periods=1).median().values)
+    with np.errstate(invalid='ignore'):
+        return np.abs(frame[variable].values - median) > STEP_LIMITS[variable]
+
+def persistence_test(frame, variable, window=None, min_samples=3):
+    window = window or PERSISTENCE_WINDOWS[variable]
+    def stuck(f):
+        rolling = f[variable].rolling(window, min_periods=min_samples)
+        return ((rolling.max() - rolling.min()) == 0).values
+    return _per_station(frame, stuck).astype(bool)
+
+def consistency_test(frame, variable, min_stations=3):
+    """
+    Compares the anomaly (value - station mean) of each station with the median anomaly of
+    all stations at the same time, so height differences between stations do not matter.
+    """
+    if 'station' not in frame.columns:
+        return np.zeros(len(frame), dtype=bool)
+    data = pd.DataFrame({'time': frame.index.values,
+                         'station': np.asarray(frame['station'], dtype=object),
+                         'value': frame[variable].values.astype(float)})
+    data['anomaly'] = data['value'] - data.groupby('station')['value'].transform('mean')
+    wide = data.pivot_table(index='time', columns='station', values='anomaly')
+    network_median = wide.median(axis=1)
+    n_stations = wide.count(axis=1)
+    median = network_median.reindex(data['time']).values
+    valid = n_stations.reindex(data['time']).values >= min_stations
+    with np.errstate(invalid='ignore'):
+        return valid & (np.abs(data['anomaly'].values - median) > CONSISTENCY_LIMITS[variable])
+
+def qc_flags(frame):
+    """
+    Runs all tests for the variables available in frame and returns
+    the uint8 flag frame (one column per variable).
+    """
+    flags = pd.DataFrame(index=frame.index)
+    for variable in RANGE_LIMITS:
+        if variable not in frame.columns:
+            continue
+        flag = np.where(range_test(frame, variable), RANGE, 0)
+        if variable in STEP_LIMITS:
+            flag |= np.where(step_test(frame, variable), STEP, 0)
+        if variable in PERSISTENCE_WINDOWS:
+            flag |= np.where(persistence_test(frame, variable), PERSISTENCE, 0)
+        if variable in CONSISTENCY_LIMITS:
+            flag |= np.where(consistency_test(frame, variable), CONSISTENCY, 0)
+        flags[variable] = flag.astype(np.uint8)
+    return flags
+
+def mask_flagged(frame, flags, tests=ALL):
+    """ Returns a copy of frame with values flagged by any of the given tests set to nan. """
+    frame = frame.copy()
+    for variable in flags.columns:
+        bad = (flags[variable].values & tests) > 0
+        frame[variable] = np.where(bad, np.nan, frame[variable].values).astype(frame[variable].dtype)
+    return frame
@@ -32,13 +32,24 @@ exist. This is done to prevent too much queries, which would result in a tempora
 ban from the university server.
 ###############################################################################
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 import errno
+import glob
 import numpy as np
 import os
 import sys
-import urllib
+import urllib.request
 
+try:
+    from . import instrument
+except ImportError:
+    # run as script
+    import instrument
+
+# hours after the launch in which the levels of a stored sounding are looked up
+STORE_WINDOW = 3
+
+@instrument.traced('kml write', category='stage')
 def write_kml_file(name, data, stat_num, year, month, day, hour):
     """
     Create a directory for google earth kml files and write a file containing
@@ -111,10 +122,47 @@ def write_kml_file(name, data, stat_num, year, month, day, hour):
         f.write('</kml>\n')
     return None
 
-def main(station_name='wien', hour=12, date=None):
+def combine_kml_files(kml_files, name):
+    """
+    Combines the paths of several kml files in data/google_earth_kml (filenames or glob
+    patterns, e.g. 'gearth_*_20170606-00.kml') into one file NAME.kml, each path is named
+    after its source file.
+    """
+    print('Combining kml files ...')
+    google_kml_dir = os.path.join('data', 'google_earth_kml')
+    file_paths = sorted(set(path for pattern in kml_files for path in glob.glob(os.path.join(google_kml_dir, pattern))))
+    if not file_paths:
+        raise ValueError('No kml files found for %s!!!' % (", ".join(kml_files)))
+
+    header = None
+    placemarks = []
+    for file_path in file_paths:
+        with open(file_path, 'r') as f:
+            text = f.read()
+        start = text.index('\t<Placemark>')
+        end = text.rindex('</Document>')
+        if header is None:
+            header = text[:start]
+        source = os.path.splitext(os.path.basename(file_path))[0]
+        placemarks.append(text[start:end].replace('<name>Pfad ohne Namen</name>', "".join(['<name>', source, '</name>'])))
+
+    # name of the combined document
+    name_start = header.index('<name>') + len('<name>')
+    header = "".join([header[:name_start], name, '.kml', header[header.index('</name>'):]])
+    file_path = os.path.join(google_kml_dir, "".join([name, '.kml']))
+    with open(file_path, 'w') as f:
+        f.write(header)
+        f.write("".join(placemarks))
+        f.write('</Document>\n')
+        f.write('</kml>\n')
+    return file_path
+
+@instrument.traced()
+def main(station_name='wien', hour=12, date=None, from_store=False):
     """
     Includes downlod of the radio sounding data, save process into a txt file,
     calculation of the horizontal translation and conversion into lat/lon.
+    from_store: read the sounding from the campaign store instead (see store.py)
     """
     print('Executing raso_to_kml.py ...')
     # transform into correct type and format
@@ -156,65 +204,79 @@ def main(station_name='wien', hour=12, date=None):
         month = date[4:6]
         day = date[6:8]
 
-    # url for radiosounding data from the university of wyoming
-    urlp1 = 'http://weather.uwyo.edu/cgi-bin/sounding?region=europe&TYPE=TEXT%3ALIST&YEAR='
-    urlp2 = '&MONTH='
-    urlp3 = '&FROM='
-    urlp4 = '&TO='
-    urlp5 = '&STNM='
-    url_full = "".join([urlp1, year, urlp2, month, urlp3, day, hour, urlp4, day, hour, urlp5, stat_num])
+    if from_store:
+        # sounding from the campaign store (see store.ingest_sounding), only when run as package
+        from . import store
+        launch = datetime(int(year), int(month), int(day), int(hour))
+        frame = store.query('sounding', stations=[station_name], start=launch, end=launch + timedelta(hours=STORE_WINDOW))
+        if not len(frame):
+            raise ValueError('No sounding of %s at %s in the campaign store!!!' % (station_name, launch.strftime('%Y%m%d-%H')))
+        stat_lon = frame['station_lon'].values[0]
+        stat_lat = frame['station_lat'].values[0]
+        # height, wind direction, wind speed in m/s
+        data_arr = np.column_stack([frame['height'].values, frame['wind_dir'].values, frame['wind_spd'].values]).astype(float)
+        data_arr = data_arr[~np.isnan(data_arr).any(axis=1)]
+    else:
+        # url for radiosounding data from the university of wyoming
+        urlp1 = 'http://weather.uwyo.edu/cgi-bin/sounding?region=europe&TYPE=TEXT%3ALIST&YEAR='
+        urlp2 = '&MONTH='
+        urlp3 = '&FROM='
+        urlp4 = '&TO='
+        urlp5 = '&STNM='
+        url_full = "".join([urlp1, year, urlp2, month, urlp3, day, hour, urlp4, day, hour, urlp5, stat_num])
 
-    # create directory if it does not exist
-    raso_dir = os.path.join('data', 'raso_text')
-    try:
-        os.makedirs(raso_dir)
-    except OSError as e:
-        if e.errno != errno.EEXIST:
-            raise
-    new_file_name = "".join(["_".join(['raso', station_name, stat_num, "".join([year, month, day, '-', hour])]), '.txt'])
-    new_file_path = os.path.join(raso_dir, new_file_name)
-
-    # only download and create a new file if there exists none (needs to be deleted if redownload is wanted!!)
-    if not os.path.isfile(new_file_path):
-        print('Downloading raso data ...')
-        # read data from url and save to txt file
-        urldata = urllib.request.urlopen(url_full)
-        dataraw = urldata.read().decode('utf-8')
-        with open(new_file_path, 'w') as f:
-            f.write(dataraw)
-
-    data_list = []
-    # read text file and extract needed data
-    with open(new_file_path, 'r') as f:
-        data =  f.readlines()
-
-        # loop through lines from txt file
-        for line in data:
-            # get longitude and latitude from the station
-            if line.strip().startswith('Station longitude'): stat_lon = line.split()[2]
-            if line.strip().startswith('Station latitude'): stat_lat = line.split()[2]
-            lines_split = line.split()
-            try: # only include lines from the table data
-                height = float(lines_split[1]) # in metres
-                v_dir = float(lines_split[6]) # in degrees
-                v_spd = float(lines_split[7]) # in knots
-
-                # append to new list
-                data_list.append([height, v_dir, v_spd])
-            except: # skip lines without eligible numbers
-                pass
-
-    # create numpy array from list
-    data_arr = np.array(data_list)
-    if data_arr.size == 0:
-        raise ValueError("""
-                ERROR NOTIFICATION:
-                Could not find available data in the textfile, check if
-                the timestamp is eligible (i.e. not in the future) and/or
-                if the data is available at http://weather.uwyo.edu/upperair/sounding.html!!!""")
-
-    # knots to m/s
-    data_arr[:,2] = data_arr[:,2]*0.5144
+        # create directory if it does not exist
+        raso_dir = os.path.join('data', 'raso_text')
+        try:
+            os.makedirs(raso_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        new_file_name = "".join(["_".join(['raso', station_name, stat_num, "".join([year, month, day, '-', hour])]), '.txt'])
+        new_file_path = os.path.join(raso_dir, new_file_name)
+
+        # only download and create a new file if there exists none (needs to be deleted if redownload is wanted!!)
+        if not os.path.isfile(new_file_path):
+            print('Downloading raso data ...')
+            # read data from url and save to txt file
+            with instrument.span('download', url=url_full):
+                urldata = urllib.request.urlopen(url_full)
+                dataraw = urldata.read().decode('utf-8')
+            with open(new_file_path, 'w') as f:
+                f.write(dataraw)
+
+        data_list = []
+        # read text file and extract needed data
+        with open(new_file_path, 'r') as f:
+            data =  f.readlines()
+
+            # loop through lines from txt file
+            for line in data:
+                # get longitude and latitude from the station
+                if line.strip().startswith('Station longitude'): stat_lon = line.split()[2]
+                if line.strip().startswith('Station latitude'): stat_lat = line.split()[2]
+                lines_split = line.split()
+                try: # only include lines from the table data
+                    height = float(lines_split[1]) # in metres
+                    v_dir = float(lines_split[6]) # in degrees
+                    v_spd = float(lines_split[7]) # in knots
+
+                    # append to new list
+                    data_list.append([height, v_dir, v_spd])
+                except: # skip lines without eligible numbers
+                    pass
+
+        # create numpy array from list
+        data_arr = np.array(data_list)
+        if data_arr.size == 0:
+            raise ValueError("""
+                    ERROR NOTIFICATION:
+                    Could not find available data in the textfile, check if
+                    the timestamp is eligible (i.e. not in the future) and/or
+                    if the data is available at http://weather.uwyo.edu/upperair/sounding.html!!!""")
+
+        # knots to m/s
+        data_arr[:,2] = data_arr[:,2]*0.5144
 
     # estimate time between each data point
     vert_velo = 5 # approximation of vertical velocity (needed because there is no such data available)
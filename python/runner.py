@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 16:41:05 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 16:41:05 +0200
+"""
+Runs independent working steps (plots, kml files, ...) of main_control.py in a process pool.
+A job is a tuple (name, function, kwargs) or (name, function, kwargs, outputs), the function
+has to be defined on module level (e.g. plotting_routines.main) so it can be sent to the
+worker processes. outputs are glob patterns of the files written by the job; such jobs are
+skipped if they are up to date according to the build manifest (see manifest.py).
+Figures are rendered with the non-interactive Agg backend, and a failing job only
+reports its error without stopping the other jobs (also if it crashes its worker process).
+
+Jobs with dependencies are described in a job file (toml, yaml or json) and run by run_graph:
+
+    [tasks.raso_wien]
+    function = "python.raso_to_kml.main"
+    kwargs = {station_name = "wien", hour = "00", date = "20170606"}
+    outputs = ["data/google_earth_kml/gearth_wien_*_20170606-00.kml"]
+
+    [tasks.raso_combined]
+    function = "python.raso_to_kml.combine_kml_files"
+    kwargs = {kml_files = ["gearth_*_20170606-*.kml"], name = "raso_20170606"}
+    inputs = ["data/google_earth_kml/gearth_*_20170606-*.kml"]
+    outputs = ["data/google_earth_kml/raso_20170606.kml"]
+    depends = ["raso_wien"]
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+
+from . import instrument
+from . import manifest
+
+def _init_worker():
+    """ Switches matplotlib to the Agg backend in each worker process. """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+def run_job(job):
+    """
+    Runs one job and returns (name, error, duration in s), error is None on success
+    or the formatted traceback of the exception. Open figures are closed afterwards.
+    """
+    name, function, kwargs = job[:3]
+    start = time.time()
+    error = None
+    try:
+        with instrument.span(name, category='job'):
+            function(**kwargs)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # close figures, without importing matplotlib for jobs not using it
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].close('all')
+        # spans of worker processes are written before the pool is shut down
+        instrument.flush()
+    return name, error, time.time() - start
+
+def run_pool(jobs, n_workers, indices=None):
+    """
+    Runs jobs[indices] (default all) in a process pool and yields (index, (name, error, duration))
+    as the jobs finish. A worker process crashing (segfault, out of memory, ...) breaks the pool:
+    the jobs not finished are run again in a new pool, and if they break it again each in its
+    own process, so only the crashing job fails.
+    """
+    indices = list(range(len(jobs))) if indices is None else indices
+    broken = []
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(indices)), initializer=_init_worker) as executor:
+        futures = {executor.submit(run_job, jobs[i]): i for i in indices}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                if len(indices) > 1:
+                    broken.append(i)
+                    continue
+                result = (jobs[i][0], 'Worker process crashed: %s' % (e), time.time() - start)
+            yield i, result
+    if not broken:
+        return
+    print('A worker process crashed, running %d job(s) again ...' % (len(broken)))
+    if len(broken) < len(indices):
+        yield from run_pool(jobs, n_workers, sorted(broken))
+    else:
+        for i in sorted(broken):
+            yield from run_pool(jobs, 1, [i])
+
+def run_jobs(jobs, n_workers=None, incremental=True):
+    """
+    Runs all jobs and prints a summary, returns the list of (name, error, duration).
+    n_workers: number of processes (None = number of cores, 1 = sequential in this process)
+    incremental: skip jobs whose outputs are up to date and record the outputs of the others
+    """
+    jobs = list(jobs)
+    if incremental:
+        build_manifest = manifest.load_manifest()
+        keys = {}
+        stale_jobs = []
+        for job in jobs:
+            name, function, kwargs = job[:3]
+            outputs = job[3] if len(job) > 3 else None
+            keys[name] = manifest.job_key(function, kwargs)
+            if manifest.is_stale(build_manifest, name, keys[name], outputs):
+                stale_jobs.append(job)
+            else:
+                print('%s is up to date' % (name))
+        jobs = stale_jobs
+    if not jobs:
+        return []
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(jobs))
+
+    # index of the job -> result, the outputs of finished jobs are recorded also if the run is interrupted
+    finished = {}
+    try:
+        if n_workers == 1:
+            for i, job in enumerate(jobs):
+                finished[i] = run_job(job)
+        else:
+            for i, result in run_pool(jobs, n_workers):
+                finished[i] = result
+    finally:
+        if incremental:
+            for i, (name, error, duration) in finished.items():
+                if error is None and len(jobs[i]) > 3:
+                    manifest.record(build_manifest, name, keys[name], jobs[i][3])
+            manifest.save_manifest(build_manifest)
+    results = [finished[i] for i in range(len(jobs))]
+
+    for name, error, duration in results:
+        if error is None:
+            print('%s finished in %.1f s' % (name, duration))
+        else:
+            print('%s failed after %.1f s:\n%s' % (name, duration, error))
+    failed = [name for name, error, duration in results if error is not None]
+    if failed:
+        print('%d of %d jobs failed: %s' % (len(failed), len(results), ", ".join(failed)))
+    return results
+
+# keys of a task in the job file
+TASK_KEYS = ('function', 'kwargs', 'inputs', 'outputs', 'depends')
+
+def read_job_file(job_file):
+    """ Reads a job file (.toml needs python 3.11 or the toml package, .yaml/.yml needs pyyaml). """
+    extension = os.path.splitext(job_file)[1].lower()
+    if extension == '.toml':
+        try:
+            import tomllib
+            with open(job_file, 'rb') as f:
+                return tomllib.load(f)
+        except ImportError:
+            try:
+                import toml
+            except ImportError:
+                raise ImportError('Reading toml job files needs python 3.11 or the toml package (or use yaml/json)!!!')
+            with open(job_file, 'r') as f:
+                return toml.load(f)
+    elif extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError('Reading yaml job files needs the pyyaml package (or use toml/json)!!!')
+        with open(job_file, 'r') as f:
+            return yaml.safe_load(f)
+    elif extension == '.json':
+        with open(job_file, 'r') as f:
+            return json.load(f)
+    raise ValueError('Unknown job file format %s, use toml, yaml or json!!!' % (extension))
+
+def load_tasks(job_file):
+    """
+    Reads the tasks of a job file and checks them, returns a dict name -> task with the keys
+    function (module.function), kwargs, inputs, outputs and depends (names of other tasks).
+    """
+    tasks = read_job_file(job_file).get('tasks', {})
+    for name, task in tasks.items():
+        unknown = set(task) - set(TASK_KEYS)
+        if unknown or 'function' not in task:
+            raise ValueError('Task %s needs a function and can only have the keys %s!!!' % (name, ", ".join(TASK_KEYS)))
+        task.setdefault('kwargs', {})
+        for key in ('inputs', 'outputs', 'depends'):
+            task.setdefault(key, [])
+        missing = [dep for dep in task['depends'] if dep not in tasks]
+        if missing:
+            raise ValueError('Task %s depends on unknown tasks: %s!!!' % (name, ", ".join(missing)))
+
+    # check for cycles (depth first search)
+    state = {}
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'active':
+            raise ValueError('Cyclic task dependencies: %s!!!' % (" -> ".join(path + [name])))
+        state[name] = 'active'
+        for dep in tasks[name]['depends']:
+            visit(dep, path + [name])
+        state[name] = 'done'
+    for name in tasks:
+        visit(name, [])
+    return tasks
+
+def resolve(function):
+    """ 'python.plotting_routines.main' -> function object (the module is imported only now). """
+    module_name, function_name = function.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+def run_graph(tasks, n_workers=None, incremental=True):
+    """
+    Runs the tasks (see load_tasks) in a process pool, each as soon as all its dependencies
+    finished. Up to date tasks are skipped (the key includes their input files, so they rerun
+    if a dependency changed its outputs), tasks whose dependencies failed (or crashed their
+    worker process) are not run.
+    Prints the timing of every task and returns a dict name -> (status, duration in s).
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    build_manifest = manifest.load_manifest() if incremental else {}
+    results = {}
+    keys = {}
+    pending = dict(tasks)
+    running = {}
+    start = time.time()
+
+    def finish(name, error, duration):
+        if error is None:
+            results[name] = ('finished', duration)
+            print('%s finished in %.1f s' % (name, duration))
+            if incremental:
+                manifest.record(build_manifest, name, keys[name], tasks[name]['outputs'])
+        else:
+            results[name] = ('failed', duration)
+            print('%s failed after %.1f s:\n%s' % (name, duration, error))
+
+    executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker)
+    try:
+        while pending or running:
+            # submit all tasks whose dependencies are finished
+            for name, task in list(pending.items()):
+                states = [results[dep][0] if dep in results else None for dep in task['depends']]
+                if None in states:
+                    continue
+                del pending[name]
+                if any(state in ('failed', 'skipped') for state in states):
+                    results[name] = ('skipped', 0.)
+                    print('%s skipped, a dependency failed' % (name))
+                    continue
+                function = resolve(task['function'])
+                if incremental:
+                    keys[name] = manifest.job_key(function, task['kwargs'], inputs=task['inputs'])
+                    if not manifest.is_stale(build_manifest, name, keys[name], task['outputs']):
+                        results[name] = ('up to date', 0.)
+                        print('%s is up to date' % (name))
+                        continue
+                running[executor.submit(run_job, (name, function, task['kwargs']))] = name
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            if not any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                for future in done:
+                    finish(*future.result())
+                    del running[future]
+                continue
+            # a worker process crashed and broke the pool: the tasks which did not finish
+            # are run again (see run_pool), the remaining tasks in a new pool
+            executor.shutdown(wait=True)
+            broken = []
+            for future, name in running.items():
+                if future.exception() is None:
+                    finish(*future.result())
+                else:
+                    broken.append((name, resolve(tasks[name]['function']), tasks[name]['kwargs']))
+            running = {}
+            for _, result in run_pool(broken, n_workers):
+                finish(*result)
+            executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker)
+    finally:
+        executor.shutdown(wait=True)
+        if incremental:
+            manifest.save_manifest(build_manifest)
+
+    print('%d tasks in %.1f s:' % (len(results), time.time() - start))
+    for name, (state, duration) in results.items():
+        print('    %-30s %-12s %6.1f s' % (name, state, duration))
+    return results
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 20:31:44 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 20:31:44 +0200
+"""
+Local job server: one long-running process keeps pandas, matplotlib and the tools imported
+and the recently read workbooks in memory (LRU cache), so repeated plot or kml requests in
+the field start immediately. Jobs are sent as json over http to localhost only:
+
+    python feldprakt.py serve --jobs jobs.toml
+    python feldprakt.py submit hobo_single_station
+    curl -d '{"function": "python.theo_single_cut.main", "kwargs": {"excel_file": "theo_testfile_single.xlsx"}}' localhost:8765/run
+
+The answer lists the files written by the job (new or modified in OUTPUT_DIRS, or matching
+its outputs), its duration and the error if it failed. Jobs run one after another in the
+server process, only functions of the python package can be called.
+"""
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import importlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from . import manifest
+from . import runner
+from . import watch
+
+HOST = '127.0.0.1'
+PORT = 8765
+# modules imported when the server starts
+WARM_MODULES = ('python.plotting_routines', 'python.theo_single_cut', 'python.theo_double_cut',
+                'python.theo_to_kml', 'python.raso_to_kml', 'python.store', 'python.verification')
+# directories checked for the files written by a job
+OUTPUT_DIRS = ('figures', os.path.join('data', 'google_earth_kml'), os.path.join('data', 'precip'))
+CACHE_SIZE = 32 # workbooks kept in memory
+CACHE_MB = 1000 # memory limit of the cache in MB
+
+class LRUCache(object):
+    """ Least recently used cache of dataframes, limited by the number of entries and their memory. """
+    def __init__(self, maxsize=CACHE_SIZE, max_mb=CACHE_MB):
+        self.maxsize = maxsize
+        self.max_bytes = max_mb*1e6
+        self.entries = OrderedDict() # key -> (frame, size in bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return self.entries[key][0]
+
+    def put(self, key, frame):
+        size = frame.memory_usage(index=True, deep=True).sum()
+        self.entries[key] = (frame, size)
+        self.entries.move_to_end(key)
+        while self.entries and (len(self.entries) > self.maxsize or self.nbytes() > self.max_bytes):
+            self.entries.popitem(last=False)
+        return None
+
+    def nbytes(self):
+        return sum(size for _, size in self.entries.values())
+
+    def stats(self):
+        return {'entries': len(self.entries), 'mb': round(self.nbytes()/1e6, 1), 'hits': self.hits, 'misses': self.misses}
+
+def cached_reader(reader, cache):
+    """
+    Wraps a pandas reader (read_excel, read_csv): frames of files which did not change since
+    they were read come from the cache. Callers get a copy, so they can modify it.
+    """
+    def read(path, *args, **kwargs):
+        if not isinstance(path, str) or not os.path.isfile(path):
+            return reader(path, *args, **kwargs)
+        stat = os.stat(path)
+        key = (reader.__name__, os.path.abspath(path), stat.st_mtime, stat.st_size, repr(args), repr(sorted(kwargs.items())))
+        frame = cache.get(key)
+        if frame is None:
+            frame = reader(path, *args, **kwargs)
+            if hasattr(frame, 'memory_usage'):
+                cache.put(key, frame)
+            else:
+                # several sheets (dict), not cached
+                return frame
+        return frame.copy()
+    read.__wrapped__ = reader
+    return read
+
+def warm_up(cache):
+    """ Imports the tools with the Agg backend and installs the cached workbook readers in pandas. """
+    runner._init_worker()
+    import pandas as pd
+    pd.read_excel = cached_reader(getattr(pd.read_excel, '__wrapped__', pd.read_excel), cache)
+    pd.read_csv = cached_reader(getattr(pd.read_csv, '__wrapped__', pd.read_csv), cache)
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+    return None
+
+def run_request(request, tasks, cache):
+    """
+    Runs a request {'task': NAME} (task of the job file) or {'function': 'python.module.function',
+    'kwargs': {...}, 'outputs': [...]}, returns the answer (dict).
+    """
+    if 'task' in request:
+        if request['task'] not in tasks:
+            raise ValueError('Unknown task %s!!!' % (request['task']))
+        request = dict(tasks[request['task']], name=request['task'])
+    function = request.get('function', '')
+    if not function.startswith('python.'):
+        raise ValueError('Only functions of the python package can be run, got %s!!!' % (function))
+    name = request.get('name', function)
+
+    before = watch.snapshot(OUTPUT_DIRS)
+    name, error, duration = runner.run_job((name, runner.resolve(function), request.get('kwargs', {})))
+    after = watch.snapshot(OUTPUT_DIRS)
+    outputs = set(path for path, state in after.items() if before.get(path) != state)
+    outputs.update(manifest.output_files(request.get('outputs', [])))
+    print('%s %s in %.2f s' % (name, 'failed' if error else 'finished', duration))
+    return {'name': name, 'outputs': sorted(os.path.abspath(path) for path in outputs),
+            'duration': duration, 'error': error, 'cache': cache.stats()}
+
+def serve(port=PORT, job_file=None, cache_size=CACHE_SIZE):
+    """ Runs the job server on localhost until interrupted (ctrl+c). """
+    cache = LRUCache(maxsize=cache_size)
+    tasks = runner.load_tasks(job_file) if job_file else {}
+    start = time.time()
+    print('Importing modules ...')
+    warm_up(cache)
+
+    class Handler(BaseHTTPRequestHandler):
+        def answer(self, status, data):
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/status':
+                self.answer(200, {'uptime': time.time() - start, 'tasks': sorted(tasks), 'cache': cache.stats()})
+            else:
+                self.answer(404, {'error': 'use GET /status or POST /run'})
+
+        def do_POST(self):
+            if self.path.rstrip('/') != '/run':
+                self.answer(404, {'error': 'use GET /status or POST /run'})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+                self.answer(200, run_request(request, tasks, cache))
+            except (ValueError, AttributeError, ImportError) as e:
+                self.answer(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            # jobs are reported by run_request
+            return None
+
+    httpd = HTTPServer((HOST, port), Handler)
+    print('Job server on http://%s:%d (ctrl+c to stop) ...' % (HOST, port))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print('Stopped job server')
+    finally:
+        httpd.server_close()
+    return None
+
+def submit(request, port=PORT, timeout=600):
+    """ Sends a request (see run_request) to the job server and returns its answer. """
+    data = json.dumps(request).encode('utf-8')
+    req = urllib.request.Request('http://%s:%d/run' % (HOST, port), data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read().decode('utf-8'))
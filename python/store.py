@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 19:52:10 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 19:52:10 +0200
+"""
+Campaign data store: the measurements of all instruments (HOBO stations, synoptic sheets,
+theodolite ascents and radio soundings) in one place, partitioned by source, station and day
+
+    data/store/SOURCE/STATION/YYYYMMDD/   time.npy, values.npy, columns.json
+
+in the column format of the hobo cache (see hobo_io.write_columns), so a query only reads
+(memory-maps) the days it asks for. The ingest functions convert the input files of each
+tool into time indexed float columns, query returns them filtered by time, station and variable:
+
+    store.ingest_hobo('hobo_seetal.xlsx', 'Seetal')
+    store.query(variables=['temp', 'T_assmann'], start='2019052000', end='2019052200')
+"""
+from datetime import datetime
+import io
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+from . import hobo_io
+from . import syn_sheets
+from . import thermodynamics
+
+STORE_DIR = os.path.join('data', 'store')
+SOURCES = ('hobo', 'syn_observation', 'syn_forecast', 'theodolite', 'sounding')
+# HOBO logger serial number -> station, written by append_hobo
+LOGGER_FILE = os.path.join(STORE_DIR, 'hobo_loggers.json')
+
+# columns of the University of Wyoming TEXT:LIST soundings (7 characters each)
+SOUNDING_COLUMNS = {'PRES': 'pres', 'HGHT': 'height', 'TEMP': 'temp', 'DWPT': 'dew_point',
+                    'RELH': 'rel_hum', 'MIXR': 'mixing_ratio', 'DRCT': 'wind_dir', 'SKNT': 'wind_spd',
+                    'THTA': 'pot_temp', 'THTE': 'equiv_pot_temp', 'THTV': 'virt_pot_temp'}
+SOUNDING_VERT_VELO = 5 # m/s, ascent rate of the sounding balloons (same as in raso_to_kml)
+
+# theodolite export column -> store column
+THEODOLITE_COLUMNS = {'Height(m)': 'height', 'EL(deg)': 'elevation', 'AZ(deg)': 'azimuth',
+                      'X(m)': 'x', 'Y(m)': 'y', 'WD(deg)': 'wind_dir', 'WS(m/s)': 'wind_spd'}
+
+def timestamp(value):
+    """ Datetime of value (YYYYMMDDHH as in the plotting routines, or anything pandas can parse), None stays None. """
+    if value is None:
+        return None
+    if isinstance(value, str) and value.isdigit() and len(value) == 10:
+        return pd.Timestamp(datetime.strptime(value, '%Y%m%d%H'))
+    return pd.Timestamp(value)
+
+def partition_path(source, station, day):
+    return os.path.join(STORE_DIR, source, str(station), day.strftime('%Y%m%d'))
+
+def list_sources():
+    """ Sources with data in the store. """
+    if not os.path.isdir(STORE_DIR):
+        return []
+    return [source for source in SOURCES if os.path.isdir(os.path.join(STORE_DIR, source))]
+
+def list_stations(source):
+    """ Stations of source with data in the store. """
+    path = os.path.join(STORE_DIR, source)
+    if not os.path.isdir(path):
+        return []
+    return sorted(os.listdir(path))
+
+def days(source, station, start=None, end=None):
+    """ Partitions (YYYYMMDD) of a station, only those overlapping start-end if given. """
+    path = os.path.join(STORE_DIR, source, str(station))
+    if not os.path.isdir(path):
+        return []
+    # directories starting with . are partitions being written (see hobo_io.write_columns)
+    names = sorted(name for name in os.listdir(path) if not name.startswith('.') and os.path.isfile(os.path.join(path, name, 'values.npy')))
+    if start is not None:
+        names = [name for name in names if name >= timestamp(start).strftime('%Y%m%d')]
+    if end is not None:
+        names = [name for name in names if name <= timestamp(end).strftime('%Y%m%d')]
+    return names
+
+def write(frame, source, station):
+    """
+    Stores frame (float columns indexed by time) in the day partitions of station. Rows of
+    stored days with the same time are replaced, other stored rows are kept.
+    Returns the paths of the written partitions.
+    """
+    if source not in SOURCES:
+        raise ValueError('Unknown source %s, use one of %s!!!' % (source, ", ".join(SOURCES)))
+    frame = frame.sort_index()
+    paths = []
+    for day, day_frame in frame.groupby(frame.index.floor('D')):
+        path = partition_path(source, station, day)
+        if os.path.isfile(os.path.join(path, 'values.npy')):
+            stored = hobo_io.read_columns(path, mmap_mode=None)
+            day_frame = pd.concat([stored[~stored.index.isin(day_frame.index)], day_frame], sort=False).sort_index()
+        hobo_io.write_columns(day_frame, path)
+        paths.append(path)
+    return paths
+
+def remove(source, station=None):
+    """ Deletes all data of source (or of one station of it) from the store. """
+    path = os.path.join(STORE_DIR, source) if station is None else os.path.join(STORE_DIR, source, str(station))
+    shutil.rmtree(path, ignore_errors=True)
+    return None
+
+def query(source=None, stations=None, variables=None, start=None, end=None, mmap_mode='r'):
+    """
+    Returns the stored data as one compact frame indexed by time (float32 columns and the
+    categorical columns 'source' and 'station'), ordered by source and station.
+    source:    source or list of sources (default all)
+    stations:  list of station names (default all of each source)
+    variables: list of columns (default all), partitions without any of them are skipped
+    start/end: time range (datetime or YYYYMMDDHH), only the partitions of these days are read
+    """
+    if source is None:
+        source = list_sources()
+    source_list = [source] if isinstance(source, str) else list(source)
+    start, end = timestamp(start), timestamp(end)
+
+    frames = []
+    station_names = []
+    for src in source_list:
+        for station in (stations if stations is not None else list_stations(src)):
+            if station not in station_names:
+                station_names.append(station)
+            for day in days(src, station, start, end):
+                frame = hobo_io.read_columns(os.path.join(STORE_DIR, src, str(station), day), mmap_mode=mmap_mode)
+                if variables is not None:
+                    columns = [var for var in variables if var in frame.columns]
+                    if not columns:
+                        continue
+                    frame = frame[columns]
+                frame = frame.loc[start:end]
+                if len(frame):
+                    frames.append(frame.assign(source=src, station=station))
+
+    if not frames:
+        frame = pd.DataFrame(columns=list(variables or []) + ['source', 'station'], index=pd.DatetimeIndex([], name='time'))
+    else:
+        frame = pd.concat(frames, sort=False)
+        frame = frame[[col for col in frame.columns if col not in ('source', 'station')] + ['source', 'station']]
+    frame = hobo_io.compact_frame(frame)
+    frame['source'] = pd.Categorical(np.asarray(frame['source'], dtype=object), categories=source_list)
+    frame['station'] = pd.Categorical(np.asarray(frame['station'], dtype=object), categories=station_names)
+    return frame
+
+def ingest_hobo(excel_filename, station=None):
+    """
+    Stores a HOBO workbook (or csv export) from data/excel including the derived thermodynamic
+    columns. station: defaults to the file name, used to look up the height in STATION_HEIGHTS
+    """
+    station = station or os.path.splitext(excel_filename)[0]
+    _, df = hobo_io.read_hobo_logger(excel_filename)
+    frame = thermodynamics.add_derived_columns(hobo_io.hobo_frame(df), station_height=hobo_io.STATION_HEIGHTS.get(station))
+    return write(frame, 'hobo', station)
+
+def loggers():
+    """ Registered HOBO loggers: dict serial number -> station (see append_hobo). """
+    if not os.path.isfile(LOGGER_FILE):
+        return {}
+    with open(LOGGER_FILE, 'r') as f:
+        return json.load(f)
+
+def register_logger(serial, station):
+    registry = loggers()
+    registry[serial] = station
+    os.makedirs(os.path.dirname(LOGGER_FILE), exist_ok=True)
+    with open(LOGGER_FILE, 'w') as f:
+        json.dump(registry, f, indent=1, sort_keys=True)
+    return None
+
+def last_time(source, station):
+    """ Time of the last stored row of a station (None if nothing is stored), only the last partition is read. """
+    stored_days = days(source, station)
+    if not stored_days:
+        return None
+    time = np.load(os.path.join(STORE_DIR, source, str(station), stored_days[-1], 'time.npy'), mmap_mode='r')
+    return pd.Timestamp(time[-1]) if len(time) else None
+
+def append_hobo(excel_filename, station=None):
+    """
+    Incremental ingest of a HOBO readout (workbook or csv export) which overlaps the previous
+    ones: the logger is recognized by its serial number, only rows newer than the last stored
+    row of its station are appended (duplicate times within the readout are dropped), so only
+    the new days and the last stored day are written. Returns the paths of the written partitions.
+    station: assigns the logger to a station (remembered in LOGGER_FILE), needed once per logger,
+             unknown loggers are stored under their serial number
+    """
+    serial, df = hobo_io.read_hobo_logger(excel_filename)
+    if serial is None:
+        raise ValueError('No logger serial number (LGR S/N) in the header of %s!!!' % (excel_filename))
+    if station is not None and loggers().get(serial) != station:
+        register_logger(serial, station)
+    station = loggers().get(serial, serial)
+
+    # only the new rows are converted
+    last = last_time('hobo', station)
+    if last is not None and len(df):
+        df = df[hobo_io.hobo_time(df) > last]
+    print('%s: logger %s (%s), %d new rows' % (excel_filename, serial, station, len(df)))
+    if not len(df):
+        return []
+    frame = hobo_io.hobo_frame(df)
+    frame = frame[~frame.index.duplicated(keep='last')]
+    thermodynamics.add_derived_columns(frame, station_height=hobo_io.STATION_HEIGHTS.get(station))
+    return write(frame, 'hobo', station)
+
+def ingest_syn_observation(excel_filename, date, station='Turnau'):
+    """ Stores a synoptic observation sheet, date: YYYYMMDD of the observations. """
+    df = syn_sheets.load_sheet(excel_filename, 'syn_observation', date=date)
+    frame = df.set_index(pd.DatetimeIndex(df['time'], name='time'))[syn_sheets.OBSERVATION_COLUMNS]
+    return write(frame, 'syn_observation', station)
+
+def ingest_syn_forecast(excel_filename, forecaster):
+    """ Stores a forecast/validation sheet, the forecaster (group) is used as station. """
+    df = syn_sheets.load_sheet(excel_filename, 'syn_forecast')
+    frame = df.set_index(pd.DatetimeIndex(df['time'], name='time'))[syn_sheets.FORECAST_COLUMNS]
+    return write(frame, 'syn_forecast', forecaster)
+
+def read_theodolite(excel_file):
+    """
+    Reads a theodolite export from data/excel into a frame indexed by the time of each
+    measurement (launch date and time from the header plus the seconds since launch).
+    """
+    df = pd.read_excel(os.path.join('data', 'excel', excel_file), skiprows=4, sheet_name='Data')
+    # header of the time columns: launch date (yy/mm/dd) and time
+    launch = datetime.strptime(" ".join([str(df.columns[2]), str(df.columns[3])]), '%y/%m/%d %H:%M:%S')
+    elapsed = pd.to_numeric(df.iloc[:, 2], errors='coerce').values.astype(float)
+    valid = ~np.isnan(elapsed)
+    data = {name: pd.to_numeric(df[col], errors='coerce').values.astype(float)[valid] for col, name in THEODOLITE_COLUMNS.items()}
+    data['elapsed'] = elapsed[valid]
+    return pd.DataFrame(data, index=pd.DatetimeIndex(launch + pd.to_timedelta(elapsed[valid], unit='s'), name='time'))
+
+def ingest_theodolite(excel_file, station=None):
+    """ Stores a theodolite ascent, station: theodolite site (defaults to the file name). """
+    return write(read_theodolite(excel_file), 'theodolite', station or os.path.splitext(excel_file)[0])
+
+def read_sounding(txt_filename):
+    """
+    Reads a sounding saved by raso_to_kml (data/raso_text/raso_STATION_NUMBER_YYYYMMDD-HH.txt)
+    into a frame indexed by the estimated time of each level (launch time plus the ascent
+    time at SOUNDING_VERT_VELO), wind speed in m/s. Returns (station, frame).
+    """
+    _, station, stat_num, launch = os.path.splitext(os.path.basename(txt_filename))[0].split('_')
+    with open(os.path.join('data', 'raso_text', os.path.basename(txt_filename)), 'r') as f:
+        lines = f.read().splitlines()
+
+    # table between the column header and the end of the <PRE> block, fixed width columns
+    header = [i for i, line in enumerate(lines) if line.split()[:2] == ['PRES', 'HGHT']]
+    if not header:
+        raise ValueError('No sounding table found in %s!!!' % (txt_filename))
+    table = []
+    for line in lines[header[0] + 3:]:
+        if line.startswith('</PRE>') or not line.strip():
+            break
+        table.append(line)
+    names = lines[header[0]].split()
+    df = pd.read_fwf(io.StringIO("\n".join(table)), widths=[7]*len(names), names=names, header=None)
+    frame = pd.DataFrame({SOUNDING_COLUMNS[col]: pd.to_numeric(df[col], errors='coerce').values.astype(float)
+                          for col in names if col in SOUNDING_COLUMNS})
+    frame = frame[~np.isnan(frame['height'].values)]
+    frame['wind_spd'] = frame['wind_spd']*0.5144 # knots to m/s
+
+    # station position (constant columns, used for the kml trajectory)
+    for line in lines:
+        if line.strip().startswith('Station longitude'): frame['station_lon'] = float(line.split()[2])
+        if line.strip().startswith('Station latitude'): frame['station_lat'] = float(line.split()[2])
+
+    launch = datetime.strptime(launch, '%Y%m%d-%H')
+    elapsed = (frame['height'].values - frame['height'].values[0])/SOUNDING_VERT_VELO
+    frame.index = pd.DatetimeIndex(launch + pd.to_timedelta(elapsed, unit='s'), name='time')
+    return station, frame
+
+def ingest_sounding(txt_filename):
+    """ Stores a sounding from data/raso_text (see read_sounding), the station is taken from the file name. """
+    station, frame = read_sounding(txt_filename)
+    return write(frame, 'sounding', station)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 16:20:37 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 16:20:37 +0200
+"""
+Loader for the synoptic excel sheets (observation and forecast/validation sheets).
+The columns of each sheet type are declared in SCHEMAS, missing columns raise an error
+and all data columns are converted to float up front. The 'UTC' column is parsed
+in one go into a full datetime column 'time' (for observation sheets, which only
+contain the time of day, the date of the sheet is attached).
+"""
+from datetime import datetime
+import os
+import re
+import pandas as pd
+
+from . import instrument
+
+# data columns of the observation sheets (see syn_obs_template.xlsx)
+OBSERVATION_COLUMNS = ['T_assmann', 'Tf_assmann', 'RH_assmann', 'Td_assmann',
+                       'T_davis', 'RH_davis', 'Td_davis', 'Td_mirror',
+                       'T_kestrel', 'RH_kestrel', 'Td_kestrel', 'p_kestrel',
+                       'T_davis-station', 'RH_davis-station', 'Td_davis-station',
+                       'T_humiport', 'RH_humiport', 'p_vaisala', 'visibility',
+                       'clouds_high', 'clouds_medium', 'clouds_low', 'cloud_base',
+                       'cloudiness', 'cloudiness_low']
+
+# data columns of the forecast sheets (see syn_forecast_validation_example.xlsx)
+FORECAST_VARIABLES = ['T', 'Td', 'wind_speed', 'wind_direction', 'cloudiness',
+                      'cloud_base', 'rain_amount', 'rain_probability']
+FORECAST_COLUMNS = ["_".join([var, kind]) for var in FORECAST_VARIABLES for kind in ('forecast', 'validation')]
+
+# sheet type -> (time column, time of day only, data columns)
+SCHEMAS = {'syn_observation':   ('UTC', True, OBSERVATION_COLUMNS),
+           'syn_forecast':      ('UTC', False, FORECAST_COLUMNS)}
+
+def parse_time(values, date=None):
+    """
+    Parses a time column into datetimes. If date (datetime or YYYYMMDD) is given, values
+    are times of day (datetime.time or 'HH:MM:SS') starting on that date, a time of day
+    smaller than the previous one belongs to the next day (sheets across midnight).
+    """
+    values = pd.Series(values)
+    if date is None:
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return pd.to_datetime(values)
+        # strings like 2019-05-19T08:00:00.000000000
+        return pd.to_datetime(values.astype(str).str.split('.').str[0])
+    if not isinstance(date, datetime):
+        date = datetime.strptime(str(date), '%Y%m%d')
+    time_of_day = pd.Series(pd.to_timedelta(values.astype(str)).values)
+    previous = time_of_day.ffill().shift()
+    days = (time_of_day < previous).cumsum()
+    return date + time_of_day + pd.to_timedelta(days, unit='D')
+
+def sheet_date(excel_filename):
+    """ Date (YYYYMMDD) in the filename of a sheet, e.g. syn_obs_20190519.xlsx, or None. """
+    match = re.search(r'(?<!\d)(\d{8})(?!\d)', os.path.basename(excel_filename))
+    if match is None:
+        return None
+    try:
+        return datetime.strptime(match.group(1), '%Y%m%d')
+    except ValueError:
+        return None
+
+def load_sheet(excel_filename, kind, date=None):
+    """
+    Reads a synoptic sheet from data/excel, checks the columns of the schema of kind
+    ('syn_observation' or 'syn_forecast'), converts them to float and adds a 'time' column.
+    date: date of observation sheets (datetime or YYYYMMDD), if omitted the date in the
+          filename (YYYYMMDD) is used, 1900-01-01 if there is none
+    """
+    time_column, time_of_day, columns = SCHEMAS[kind]
+    with instrument.span('read', file=excel_filename):
+        df = pd.read_excel(os.path.join('data', 'excel', excel_filename))
+
+    missing = [col for col in [time_column] + columns if col not in df.columns]
+    if missing:
+        raise ValueError('The %s sheet %s is missing the columns: %s' % (kind, excel_filename, ", ".join(missing)))
+
+    with instrument.span('parse', file=excel_filename):
+        df[columns] = df[columns].apply(pd.to_numeric, errors='coerce').astype(float)
+        if time_of_day:
+            date = date or sheet_date(excel_filename) or datetime(1900, 1, 1)
+            df['time'] = parse_time(df[time_column], date=date)
+        else:
+            df['time'] = parse_time(df[time_column])
+    return df
+
+def load_sheets(excel_filenames, kind):
+    """
+    Loads many sheets of the same kind into one frame with an additional 'sheet' column.
+    excel_filenames: list of filenames or dict key -> filename; the key is stored in the
+                     'sheet' column and used as date (YYYYMMDD) of observation sheets.
+    """
+    dated = isinstance(excel_filenames, dict) and SCHEMAS[kind][1]
+    if not isinstance(excel_filenames, dict):
+        excel_filenames = {os.path.splitext(fn)[0]: fn for fn in excel_filenames}
+    frames = []
+    for key, excel_filename in excel_filenames.items():
+        date = key if dated else None
+        frames.append(load_sheet(excel_filename, kind, date=date).assign(sheet=key))
+    return pd.concat(frames, ignore_index=True)
@@ -17,14 +17,23 @@ import pandas as pd
 import sys
 import matplotlib.pyplot as plt
 
+try:
+    from . import instrument
+except ImportError:
+    # run as script
+    import instrument
+
+@instrument.traced()
 def main(B=None, phi=None, excel_file1=None, excel_file2=None, titlestr='theodolite example double cut'):
     dt = 10
 
     # read data from excel file 1
-    df1 = pd.read_excel(os.path.join('data', 'excel', excel_file1),
-                       usecols=[3, 4], sheet_name='Data')
-    df2 = pd.read_excel(os.path.join('data', 'excel', excel_file2),
-                       usecols=[3, 4], sheet_name='Data')
+    with instrument.span('read', file=excel_file1):
+        df1 = pd.read_excel(os.path.join('data', 'excel', excel_file1),
+                           usecols=[3, 4], sheet_name='Data')
+    with instrument.span('read', file=excel_file2):
+        df2 = pd.read_excel(os.path.join('data', 'excel', excel_file2),
+                           usecols=[3, 4], sheet_name='Data')
 
     # get important data
     elevation1 = np.array(df1['Unnamed: 3'].values[4:], dtype=float)
@@ -119,7 +128,8 @@ def main(B=None, phi=None, excel_file1=None, excel_file2=None, titlestr='theodol
 
     # save figure
     print('Saving figure ...')
-    plt.savefig(os.path.join(fig_dir, "".join([excel_file1.split('.')[0], '_double_cut.png'])))
+    with instrument.span('savefig'):
+        plt.savefig(os.path.join(fig_dir, "".join([excel_file1.split('.')[0], '_double_cut.png'])))
     return None
 
 
@@ -17,13 +17,21 @@ import pandas as pd
 import sys
 import matplotlib.pyplot as plt
 
+try:
+    from . import instrument
+except ImportError:
+    # run as script
+    import instrument
+
+@instrument.traced()
 def main(excel_file=None, titlestr='theodolite example single cut'):
     dt = 10
     vert_velo = 2.4 # assumption based on the volume/filling of the baloon
 
     # read data from excel file
-    df = pd.read_excel(os.path.join('data', 'excel', excel_file),
-                       usecols=[3, 4], sheet_name='Data')
+    with instrument.span('read', file=excel_file):
+        df = pd.read_excel(os.path.join('data', 'excel', excel_file),
+                           usecols=[3, 4], sheet_name='Data')
 
     # get important data
     elevation = np.array(df['Unnamed: 3'].values[4:], dtype=float)
@@ -95,7 +103,8 @@ def main(excel_file=None, titlestr='theodolite example single cut'):
 
     # save figure
     print('Saving figure ...')
-    plt.savefig(os.path.join(fig_dir, "".join([excel_file.split('.')[0], '_single_cut.png'])))
+    with instrument.span('savefig'):
+        plt.savefig(os.path.join(fig_dir, "".join([excel_file.split('.')[0], '_single_cut.png'])))
     return None
 
 
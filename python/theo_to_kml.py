@@ -30,6 +30,16 @@ import os
 import pandas as pd
 import sys
 
+try:
+    from . import instrument
+except ImportError:
+    # run as script
+    import instrument
+
+# hours after the launch in which the measurements of a stored ascent are looked up
+STORE_WINDOW = 1
+
+@instrument.traced('kml write', category='stage')
 def write_kml_file(name, data):
     """
     Create a directory for google earth kml files and write a file containing
@@ -102,23 +112,43 @@ def write_kml_file(name, data):
         f.write('</kml>\n')
     return None
 
-def main(stat_height=None, stat_lon=None, stat_lat=None, excel_file=None):
+@instrument.traced()
+def main(stat_height=None, stat_lon=None, stat_lat=None, excel_file=None, station=None, launch=None):
     """
     Calculate horizontal translation from a theodolite measurement given as excel_file file,
     convert to lat/lon vals.
+    station, launch: read the ascent of station launched at launch (YYYYMMDDHHMM) from the
+                     campaign store instead of excel_file (see store.py)
     """
     print('Executing theo_to_kml.py ...')
-    # read excel file into dataframe
-    df = pd.read_excel(os.path.join('data', 'excel', excel_file),
-                       skiprows=4, sheet_name='Data')
-
-    # get important data
-    v_dir = np.array(df['WD(deg) for graph'].values, dtype=float) # mathematical degree
-    v_spd = np.array(df['WS(m/s) for graph'].values, dtype=float)
-    height = np.array(df['Height(m) for graph'].values, dtype=float)
-
-    # get name
-    namestr = excel_file.split('.')[0]
+    if excel_file is None:
+        # ascent from the campaign store (see store.ingest_theodolite), only when run as package
+        from . import store
+        launch_time = datetime.strptime(str(launch), '%Y%m%d%H%M')
+        df = store.query('theodolite', stations=[station], start=launch_time, end=launch_time + pd.Timedelta(hours=STORE_WINDOW))
+        # the ascent ends where the seconds since launch start again
+        restart = np.flatnonzero(np.diff(df['elapsed'].values) < 0)
+        if len(restart):
+            df = df.iloc[:restart[0] + 1]
+        if not len(df):
+            raise ValueError('No theodolite ascent of %s at %s in the campaign store!!!' % (station, launch))
+        v_dir = np.nan_to_num(df['wind_dir'].values.astype(float)) # mathematical degree
+        v_spd = np.nan_to_num(df['wind_spd'].values.astype(float))
+        height = df['height'].values.astype(float)
+        namestr = "_".join([str(station), str(launch)])
+    else:
+        # read excel file into dataframe
+        with instrument.span('read', file=excel_file):
+            df = pd.read_excel(os.path.join('data', 'excel', excel_file),
+                               skiprows=4, sheet_name='Data')
+
+        # get important data
+        v_dir = np.array(df['WD(deg) for graph'].values, dtype=float) # mathematical degree
+        v_spd = np.array(df['WS(m/s) for graph'].values, dtype=float)
+        height = np.array(df['Height(m) for graph'].values, dtype=float)
+
+        # get name
+        namestr = excel_file.split('.')[0]
 
     # estimate time between each data point
     vert_velo = 2.4 # estimate of vertical velocity (needed because there is no such data available)
@@ -173,5 +203,5 @@ if __name__ == '__main__':
     h = sys.argv[1]
     lon = sys.argv[2]
     lat = sys.argv[3]
-    csv_file = sys.argv[4]
-    main(stat_height=h, stat_lon=lon, stat_lat=lat, csv_file=csv_file)
+    excel_file = sys.argv[4]
+    main(stat_height=float(h), stat_lon=lon, stat_lat=lat, excel_file=excel_file)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 10:41:05 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 10:41:05 +0200
+"""
+Vectorised thermodynamic quantities derived from station temperature,
+relative humidity and pressure. All functions work on scalars, numpy arrays
+and pandas series, so whole station networks are computed at once.
+
+Units: temperatures in deg Celsius (potential temperature in K),
+pressures in hPa, relative humidity in %, specific humidity in g/kg.
+"""
+import numpy as np
+
+from . import instrument
+from .pressure_reduction_msl import reduce_pressure
+
+# latitude of the field exercise area (Turnau)
+LATITUDE = 47.55
+
+# derived columns added to hobo frames by add_derived_columns
+DERIVED_COLUMNS = ('vap_pres', 'dew_point', 'spec_hum', 'virt_temp', 'pot_temp', 'pres_msl')
+
+def saturation_vapour_pressure(T):
+    """ Magnus formula (same constants as in pressure_reduction_msl). """
+    return 6.11*np.exp(17.08*T/(234.175 + T))
+
+def vapour_pressure(T, RH):
+    return RH/100.*saturation_vapour_pressure(T)
+
+def dew_point(e):
+    """ Inverse of the Magnus formula. """
+    x = np.log(e/6.11)
+    return 234.175*x/(17.08 - x)
+
+def specific_humidity(p, e):
+    return 0.622*e/(p - 0.378*e)*1000
+
+def virtual_temperature(T, q):
+    return (1 + 0.609*q/1000) * (T+273.15) - 273.15
+
+def potential_temperature(T, p):
+    return (T+273.15) * (1000./p)**0.286
+
+@instrument.traced('compute', category='stage')
+def add_derived_columns(frame, station_height=None, lat=LATITUDE):
+    """
+    Adds the DERIVED_COLUMNS to a hobo frame (columns 'temp', 'rel_hum' and 'pres',
+    see hobo_io.hobo_frame) in place and returns it. Columns which already exist are
+    not computed again, so frames loaded from the cache are returned unchanged.
+
+    station_height: height in m used for the reduction to mean sea level, either a number
+                    or a dict station name -> height for network frames with a 'station' column.
+                    If omitted, no 'pres_msl' column is added.
+    """
+    if all(col in frame.columns for col in DERIVED_COLUMNS):
+        return frame
+    if not {'temp', 'rel_hum'}.issubset(frame.columns):
+        return frame
+
+    T = frame['temp'].values
+    e = vapour_pressure(T, frame['rel_hum'].values)
+    Td = dew_point(e)
+    frame['vap_pres'] = e
+    frame['dew_point'] = Td
+
+    if 'pres' in frame.columns:
+        p = frame['pres'].values
+        q = specific_humidity(p, e)
+        frame['spec_hum'] = q
+        frame['virt_temp'] = virtual_temperature(T, q)
+        frame['pot_temp'] = potential_temperature(T, p)
+
+        if isinstance(station_height, dict) and 'station' in frame.columns:
+            station_height = frame['station'].map(station_height).values.astype(float)
+        if station_height is not None:
+            frame['pres_msl'] = reduce_pressure(p, T, Td, station_height, lat)
+    return frame
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 14:31:26 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 14:31:26 +0200
+"""
+Verification of synoptic forecasts (sheets like syn_forecast_validation_example.xlsx,
+with the columns VARIABLE_forecast and VARIABLE_validation).
+All sheets are stacked into arrays of shape (number of sheets, number of times),
+so the scores of all forecasters are computed at once.
+
+Scores:
+    bias, mae, rmse     mean error, mean absolute error, root mean square error
+                        (circular differences for the wind direction)
+    brier               brier score of the rain probability (observed event: rain amount > RAIN_THRESHOLD)
+    hit_rate            rain events which were forecast (rain amount forecast > RAIN_THRESHOLD)
+    false_alarm_rate    rain forecast for times without rain, relative to all times without rain
+"""
+import numpy as np
+import os
+import pandas as pd
+import warnings
+
+from . import syn_sheets
+
+# continuous variables
+CONTINUOUS = ('T', 'Td', 'wind_speed', 'cloudiness', 'cloud_base', 'rain_amount')
+# circular variables (deg)
+CIRCULAR = ('wind_direction',)
+
+# rain amount in mm/h above which it counts as rain event
+RAIN_THRESHOLD = 0.
+
+# scores for which higher values are better, all others are errors
+HIGHER_IS_BETTER = ('hit_rate',)
+
+def load_forecasts(excel_filenames):
+    """
+    Reads forecast sheets from data/excel into arrays (nan padded to the longest sheet).
+    excel_filenames: dict forecaster -> filename, or list of filenames (forecaster = filename without extension)
+    Returns the list of forecasters and a dict column name -> array (n_sheets, n_times).
+    """
+    if not isinstance(excel_filenames, dict):
+        excel_filenames = {os.path.splitext(fn)[0]: fn for fn in excel_filenames}
+    sheets = [syn_sheets.load_sheet(fn, 'syn_forecast') for fn in excel_filenames.values()]
+
+    n_times = max(len(df) for df in sheets)
+    columns = ["_".join([var, kind]) for var in CONTINUOUS + CIRCULAR + ('rain_probability',) for kind in ('forecast', 'validation')]
+    data = {col: np.full((len(sheets), n_times), np.nan) for col in columns}
+    for i, df in enumerate(sheets):
+        for col in columns:
+            data[col][i, :len(df)] = df[col].values
+    return list(excel_filenames.keys()), data
+
+def circular_difference(fcst, obs):
+    """ Difference of two directions in deg, in the range [-180, 180). """
+    return (fcst - obs + 180) % 360 - 180
+
+def error_scores(diff):
+    """ bias, mae and rmse along the time axis (nan values are ignored). """
+    return {'bias': np.nanmean(diff, axis=1),
+            'mae': np.nanmean(np.abs(diff), axis=1),
+            'rmse': np.sqrt(np.nanmean(diff**2, axis=1))}
+
+def rain_scores(data, threshold=RAIN_THRESHOLD):
+    """ brier score, hit rate and false alarm rate of the rain forecast. """
+    observed = data['rain_amount_validation']
+    valid = np.isfinite(observed)
+    event = valid & (observed > threshold)
+    no_event = valid & ~(observed > threshold)
+
+    prob = data['rain_probability_forecast']/100.
+    brier_valid = valid & np.isfinite(prob)
+    brier = np.nansum(np.where(brier_valid, (prob - event)**2, np.nan), axis=1)/np.sum(brier_valid, axis=1)
+
+    forecast = data['rain_amount_forecast'] > threshold
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.sum(event & forecast, axis=1)/np.sum(event, axis=1)
+        false_alarm_rate = np.sum(no_event & forecast, axis=1)/np.sum(no_event, axis=1)
+    return {'brier': brier, 'hit_rate': hit_rate, 'false_alarm_rate': false_alarm_rate}
+
+def verify(excel_filenames):
+    """
+    Scores all forecast sheets and returns a table with one row per forecaster
+    and the columns VARIABLE_SCORE, ranked by the mean rank over all scores (column 'rank').
+    """
+    forecasters, data = load_forecasts(excel_filenames)
+    scores = {}
+    with warnings.catch_warnings():
+        # variables without any values in a sheet result in nan (mean of empty slice)
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for var in CONTINUOUS:
+            diff = data["_".join([var, 'forecast'])] - data["_".join([var, 'validation'])]
+            for name, score in error_scores(diff).items():
+                scores["_".join([var, name])] = score
+        for var in CIRCULAR:
+            diff = circular_difference(data["_".join([var, 'forecast'])], data["_".join([var, 'validation'])])
+            for name, score in error_scores(diff).items():
+                scores["_".join([var, name])] = score
+        for name, score in rain_scores(data).items():
+            scores["_".join(['rain', name])] = score
+    table = pd.DataFrame(scores, index=pd.Index(forecasters, name='forecaster'))
+
+    # rank: absolute bias and errors ascending, hit rate descending
+    ranks = pd.DataFrame(index=table.index)
+    for col in table.columns:
+        if col.endswith(HIGHER_IS_BETTER):
+            ranks[col] = table[col].rank(ascending=False)
+        else:
+            ranks[col] = table[col].abs().rank(ascending=True)
+    table['rank'] = ranks.mean(axis=1).rank(method='min')
+    return table.sort_values('rank')
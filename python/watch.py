@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 18:12:30 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 18:12:30 +0200
+"""
+Watch mode for the job runner: the data directories are polled for new or modified files,
+and once a file did not change for the debounce time, the tasks of the job file reading it
+(files named in the kwargs or matching the inputs patterns) and all tasks depending on them
+are run in the background, while watching continues. A change of the job file reruns all
+tasks which are not up to date.
+"""
+import fnmatch
+import os
+import queue
+import threading
+import time
+
+from . import manifest
+from . import runner
+
+WATCH_DIRS = (os.path.join('data', 'excel'),)
+POLL_INTERVAL = 1. # s
+DEBOUNCE = 2. # s, time a file has to be unchanged before it is processed
+
+def snapshot(paths):
+    """ Returns dict path -> (modification time, size) of the files in paths (directories recursively). """
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+        for root, _, filenames in os.walk(path):
+            files.extend(os.path.join(root, filename) for filename in filenames)
+    states = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # removed in the meantime
+            continue
+        states[path] = (stat.st_mtime, stat.st_size)
+    return states
+
+def input_patterns(task):
+    """ Files (glob patterns) a task reads: data/excel files named in its kwargs and its inputs. """
+    return [os.path.normpath(os.path.join('data', 'excel', value)) for value in manifest.argument_strings(task['kwargs'])] \
+        + [os.path.normpath(pattern) for pattern in task['inputs']]
+
+def affected_tasks(tasks, paths):
+    """ Names of the tasks reading one of the paths and of all tasks depending on them. """
+    paths = [os.path.normpath(path) for path in paths]
+    affected = set(name for name, task in tasks.items()
+                   if any(fnmatch.fnmatch(path, pattern) for path in paths for pattern in input_patterns(task)))
+    # add downstream tasks until nothing changes
+    n_affected = 0
+    while len(affected) != n_affected:
+        n_affected = len(affected)
+        affected.update(name for name, task in tasks.items() if affected.intersection(task['depends']))
+    return affected
+
+def subgraph(tasks, names):
+    """ The tasks in names, dependencies on other tasks are dropped (they are considered done). """
+    return {name: dict(task, depends=[dep for dep in task['depends'] if dep in names])
+            for name, task in tasks.items() if name in names}
+
+def watch(job_file, dirs=WATCH_DIRS, interval=POLL_INTERVAL, debounce=DEBOUNCE, n_workers=None):
+    """ Watches dirs and the job file until interrupted (ctrl+c), see above. """
+    tasks = runner.load_tasks(job_file)
+    batches = queue.Queue()
+
+    def process():
+        # runs the queued batches one after another, merging batches queued meanwhile
+        while True:
+            names = batches.get()
+            while not batches.empty():
+                names = names | batches.get()
+            if names:
+                print('Running %s ...' % (", ".join(sorted(names))))
+                runner.run_graph(subgraph(tasks, names), n_workers=n_workers)
+    threading.Thread(target=process, daemon=True).start()
+
+    print('Watching %s for changes (ctrl+c to stop) ...' % (", ".join(list(dirs) + [job_file])))
+    files = snapshot(list(dirs) + [job_file])
+    changed = {}
+    try:
+        while True:
+            time.sleep(interval)
+            now = time.time()
+            current = snapshot(list(dirs) + [job_file])
+            for path, state in current.items():
+                if files.get(path) != state:
+                    changed[path] = now
+            files = current
+
+            # files which did not change for the debounce time
+            ready = [path for path, change_time in changed.items() if now - change_time >= debounce]
+            if not ready:
+                continue
+            for path in ready:
+                del changed[path]
+            if job_file in ready:
+                ready.remove(job_file)
+                print('%s changed, reloading tasks' % (job_file))
+                try:
+                    tasks = runner.load_tasks(job_file)
+                    batches.put(set(tasks))
+                except Exception as e:
+                    # keep the previous tasks until the job file is fixed
+                    print('Could not read %s: %s' % (job_file, e))
+            # data files changed together with the job file are still processed (with the new tasks)
+            if not ready:
+                continue
+            names = affected_tasks(tasks, ready)
+            print('%s changed, affected tasks: %s' % (", ".join(ready), ", ".join(sorted(names)) or 'none'))
+            batches.put(names)
+    except KeyboardInterrupt:
+        print('Stopped watching')
+    return None
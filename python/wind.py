@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Python Template
+# @Author: SebiMac
+# @Date:   2026-10-19 11:20:44 +0200
+# @Last modified by:   SebiMac
+# @Last modified time: 2026-10-19 11:20:44 +0200
+"""
+Wind statistics for hobo frames (see hobo_io.hobo_frame / load_hobo_network).
+Wind directions can not be averaged directly (the mean of 350° and 10° is not 180°),
+hence means are calculated from the u and v components of the wind vector.
+All routines work on the whole (network) frame at once, stations are
+distinguished via the 'station' column if present.
+
+Directions in meteorological degrees (where the wind comes from), speeds in m/s.
+"""
+import numpy as np
+import pandas as pd
+
+# default speed classes for wind roses in m/s
+SPEED_BINS = (0, 0.5, 2, 4, 6, 8, np.inf)
+
+def wind_components(spd, direction):
+    """ Returns u (towards east) and v (towards north) of the wind vector. """
+    dir_rad = np.asarray(direction)*np.pi/180
+    return -spd*np.sin(dir_rad), -spd*np.cos(dir_rad)
+
+def wind_direction(u, v):
+    """ Returns the meteorological wind direction of the components u, v. """
+    return (270 - np.arctan2(v, u)*180/np.pi) % 360
+
+def wind_statistics(frame, window='1h'):
+    """
+    Resamples wind data to the time window (pandas offset string, e.g. '10min', '1h', '1D')
+    and returns a frame with the columns:
+        vec_dir     vector mean wind direction
+        vec_spd     vector mean wind speed
+        mean_spd    scalar mean wind speed
+        max_gust    maximum gust speed (if 'wind_gusts' is available)
+        gust_factor max_gust/mean_spd
+        steadiness  vec_spd/mean_spd (1: constant direction, 0: no prevailing direction)
+        count       number of samples
+    The index is time or (station, time) for network frames.
+    """
+    u, v = wind_components(frame['wind_spd'].values, frame['wind_dir'].values)
+    data = pd.DataFrame({'u': u, 'v': v, 'wind_spd': frame['wind_spd'].values}, index=frame.index)
+    if 'wind_gusts' in frame.columns:
+        data['wind_gusts'] = frame['wind_gusts'].values
+
+    keys = [pd.Grouper(freq=window)]
+    if 'station' in frame.columns:
+        data['station'] = frame['station'].values
+        keys = ['station'] + keys
+    grouped = data.groupby(keys)
+    means = grouped.mean()
+
+    stats = pd.DataFrame(index=means.index)
+    stats['vec_dir'] = wind_direction(means['u'].values, means['v'].values)
+    stats['vec_spd'] = np.hypot(means['u'].values, means['v'].values)
+    stats['mean_spd'] = means['wind_spd'].values
+    if 'wind_gusts' in data.columns:
+        stats['max_gust'] = grouped['wind_gusts'].max().values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats['gust_factor'] = stats['max_gust'].values/stats['mean_spd'].values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats['steadiness'] = stats['vec_spd'].values/stats['mean_spd'].values
+    stats['count'] = grouped['wind_spd'].count().values
+    return stats
+
+def wind_rose(frame, n_sectors=16, speed_bins=SPEED_BINS, timebegin=None, timeend=None):
+    """
+    Frequency table (in %) of wind direction sectors and speed classes, for each
+    station separately if the frame has a 'station' column. The rows are
+    (station,) sector centre in degrees, the columns the speed classes.
+    timebegin, timeend: optional limits of the evaluated time window
+    """
+    # mask instead of .loc slicing: the index of network frames is not sorted (stations one after another)
+    if timebegin is not None:
+        frame = frame[frame.index >= pd.Timestamp(timebegin)]
+    if timeend is not None:
+        frame = frame[frame.index <= pd.Timestamp(timeend)]
+    spd = frame['wind_spd'].values
+    direction = frame['wind_dir'].values
+    valid = np.isfinite(spd) & np.isfinite(direction)
+
+    if 'station' in frame.columns:
+        station_codes, stations = pd.factorize(frame['station'].values)
+    else:
+        station_codes, stations = np.zeros(len(frame), dtype=int), ['']
+    station_codes = station_codes[valid]
+
+    # sector 0 is centred around north
+    sector_width = 360./n_sectors
+    sector = (np.floor((direction[valid] + sector_width/2)/sector_width) % n_sectors).astype(int)
+    n_classes = len(speed_bins) - 1
+    speed_class = np.clip(np.digitize(spd[valid], speed_bins) - 1, 0, n_classes-1)
+
+    # count all combinations at once
+    flat = (station_codes*n_sectors + sector)*n_classes + speed_class
+    counts = np.bincount(flat, minlength=len(stations)*n_sectors*n_classes)
+    counts = counts.reshape(len(stations), n_sectors*n_classes).astype(float)
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        freq = (counts/totals*100).reshape(len(stations)*n_sectors, n_classes)
+
+    columns = ["-".join(['{:g}'.format(speed_bins[i]), '{:g}'.format(speed_bins[i+1])]) for i in range(n_classes)]
+    sectors = np.arange(n_sectors)*sector_width
+    if 'station' in frame.columns:
+        index = pd.MultiIndex.from_product([list(stations), sectors], names=['station', 'sector'])
+    else:
+        index = pd.Index(sectors, name='sector')
+    return pd.DataFrame(freq, index=index, columns=columns)